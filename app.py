@@ -2,9 +2,10 @@
 Flask 웹 애플리케이션
 시니어층 유튜브 트렌드 추적 시스템
 """
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
 from datetime import datetime, timezone, timedelta
 import json
+import threading
 
 # KST (한국 표준시) = UTC+9
 KST = timezone(timedelta(hours=9))
@@ -13,11 +14,57 @@ import database
 import youtube_api
 import data_collector
 import view_score_calculator
+import keyword_dictionary
+import weight_trainer
+import labeling_queue
+import rollups
+import video_trends
+import profiling
+import metrics
+import response_cache
+import payload
+import whitelist_digest
+import channel_import
+import channel_schedule
+import video_search
 
 app = Flask(__name__)
+profiling.init_app(app)  # PROFILING_ENABLED=1일 때만 요청 계측 (Server-Timing, 느린 SQL 로그)
+metrics.init_app(app)  # 요청 수/지연 메트릭 (/metrics)
+payload.init_app(app)  # 응답 압축 (gzip/br)
 
-# 데이터베이스 초기화
-database.init_database()
+# POST /api/channels/check 한 번에 확인할 최대 채널 수
+CHANNEL_CHECK_MAX_BATCH = 500
+CHANNEL_IMPORT_MAX_ITEMS = 1000  # /api/channels/import 요청당 최대 항목 수
+SEARCH_CANDIDATES = 500  # /api/search: 관련도 상위 후보 수 (이 안에서 점수 결합 후 재정렬)
+SEARCH_MAX_LIMIT = 200
+
+# 초기화 (스키마/마이그레이션, 라벨링 큐 백필)는 import 시가 아니라 create_app()에서 프로세스당 1회
+_initialized = False
+_init_lock = threading.Lock()
+
+
+def initialize() -> None:
+    """DB 스키마 생성/마이그레이션 + 라벨링 큐 백필 (프로세스당 1회, 여러 번 불러도 됨)"""
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        database.init_database()
+        labeling_queue.backfill_if_empty()
+        _initialized = True
+
+
+def create_app(init_db: bool = True) -> Flask:
+    """
+    WSGI 앱 반환 (wsgi.py, 테스트에서 사용)
+
+    Args:
+        init_db: False면 초기화를 건너뜀 (gunicorn 마스터가 워커 fork 전에 이미 한 경우)
+    """
+    if init_db:
+        initialize()
+    return app
 
 
 # ============================================================
@@ -112,6 +159,7 @@ def collect_data():
 
 
 @app.route('/api/videos', methods=['POST'])
+@response_cache.cached('data_version', 'channels_version', today=True)
 def get_videos():
     """
     ViewScore 기반 비디오 조회 (실시간 재계산)
@@ -120,7 +168,7 @@ def get_videos():
     {
         "snapshot_date": "2025-11-06",
         "data_source": "channel",
-        "sort_by": "view_score",
+        "sort_by": "view_score",  // view_count, delta_views_14d, views_per_day, velocity, acceleration, ewma_views_per_day
         "order": "desc",
         "limit": 100,
         "category_ids": ["10", "15"],
@@ -129,8 +177,19 @@ def get_videos():
             "subscriber": 1.0,
             "recency": 1.0,
             "engagement": 1.0
-        }
+        },
+        "fields": ["video_id", "title", "view_score"],
+        "format": "rows",
+        "dedupe": true,
+        "tags": ["트로트", "가요"]
     }
+
+    weights를 생략하면 라벨로 학습한 활성 가중치 버전(없으면 기본값)을 사용
+    fields: 반환할 키만 선택 (리스트 또는 "a,b,c", 생략하면 전체)
+    format: "rows" (행 객체 배열, 기본) 또는 "columnar" ({컬럼: [값, ...]})
+    dedupe: true(기본)면 영상당 1행 (여러 카테고리·채널 소스로 잡힌 행을 합치고 sources에 목록),
+        false면 소스별 스냅샷 행 그대로
+    tags: 이 중 하나라도 붙은 영상만 (대소문자 무시)
     """
     try:
         data = request.get_json()
@@ -140,21 +199,48 @@ def get_videos():
         order = data.get('order', 'desc')
         limit = int(data.get('limit', 100))
         category_ids = data.get('category_ids', None)
-        weights = data.get('weights', view_score_calculator.DEFAULT_WEIGHTS)
+        weights = data.get('weights')
+        weights_version = None
+        fields = payload.parse_fields(data.get('fields'))
+        response_format = data.get('format', 'rows')
+        dedupe = bool(data.get('dedupe', True))
+        tags = data.get('tags')
+        if isinstance(tags, str):
+            tags = [tag for tag in tags.split(',') if tag.strip()]
+
+        if response_format not in payload.FORMATS:
+            return jsonify({
+                'success': False,
+                'error': f'format은 {payload.FORMATS} 중 하나여야 합니다.'
+            }), 400
+
+        if not weights:
+            active = weight_trainer.get_active_version('view')
+            if active:
+                weights = active['weights']
+                weights_version = active['version']
+            else:
+                weights = view_score_calculator.DEFAULT_WEIGHTS
 
         if not snapshot_date:
             snapshot_date = datetime.now(KST).strftime('%Y-%m-%d')
 
-        # 스냅샷 + 채널 정보 조회 (카테고리 필터 포함)
-        snapshots = database.get_snapshots_by_date_and_source(snapshot_date, data_source, category_ids)
+        with profiling.phase('fetch'):
+            # 스냅샷 + 채널 정보 조회 (카테고리 필터 포함)
+            snapshots = database.get_snapshots_by_date_and_source(
+                snapshot_date, data_source, category_ids, dedupe=dedupe, tags=tags
+            )
+
+            # 채널 정보 일괄 조회 (구독자 수는 스냅샷 날짜 기준 as-of 값)
+            channel_ids = list(set([s['channel_id'] for s in snapshots]))
+            channels_dict = database.get_channels_as_of(channel_ids, snapshot_date)
+
+        # 최신성 기준 시각은 요청 전체에 하나 (스냅샷 날짜 기준 → 수집 때 저장한 점수와 같은 값)
+        reference_time = view_score_calculator.snapshot_reference_time(snapshot_date)
 
-        # 채널 정보 일괄 조회
-        channel_ids = list(set([s['channel_id'] for s in snapshots]))
-        channels_dict = {}
-        for cid in channel_ids:
-            ch = database.get_channel_by_id(cid)
-            if ch:
-                channels_dict[cid] = ch
+        # Δviews·추세는 수집 때 저장한 값(video_trends), 없는 행(재구성 전 DB)만 영상마다 쿼리 1번이므로
+        # 응답/정렬에 필요할 때만 계산
+        need_delta = fields is None or 'delta_views_14d' in fields or sort_by == 'delta_views_14d'
 
         # ViewScore 재계산
         results = []
@@ -162,12 +248,14 @@ def get_videos():
             channel_data = channels_dict.get(snapshot['channel_id'], {})
 
             try:
-                score_result = view_score_calculator.calculate_view_score(
-                    video_data=snapshot,
-                    snapshot_data=snapshot,
-                    channel_data=channel_data,
-                    weights=weights
-                )
+                with profiling.phase('scoring'):
+                    score_result = view_score_calculator.calculate_view_score(
+                        video_data=snapshot,
+                        snapshot_data=snapshot,
+                        channel_data=channel_data,
+                        weights=weights,
+                        reference_time=reference_time
+                    )
 
                 # 스냅샷 데이터에 추가
                 snapshot['view_score'] = score_result['score']
@@ -179,9 +267,11 @@ def get_videos():
                 }
                 snapshot['metadata'] = score_result['metadata']
 
-                # Δviews 계산 추가
-                delta_views = database.get_delta_views(snapshot['video_id'], days=14)
-                snapshot['delta_views_14d'] = delta_views if delta_views else 0
+                # Δviews (저장된 값이 없을 때만 계산)
+                if snapshot['delta_views_14d'] is None and need_delta:
+                    with profiling.phase('delta'):
+                        delta_views = database.get_delta_views(snapshot['video_id'], days=14, as_of_date=snapshot_date)
+                    snapshot['delta_views_14d'] = delta_views if delta_views else 0
 
                 results.append(snapshot)
             except Exception as e:
@@ -192,7 +282,8 @@ def get_videos():
         allowed_sort_columns = {
             'view_count': 'view_count',
             'view_score': 'view_score',
-            'delta_views_14d': 'delta_views_14d'
+            'delta_views_14d': 'delta_views_14d',
+            **{field: field for field in video_trends.TREND_FIELDS}
         }
 
         sort_key = allowed_sort_columns.get(sort_by, 'view_score')
@@ -200,11 +291,77 @@ def get_videos():
 
         results.sort(key=lambda x: (x.get(sort_key) or 0), reverse=reverse_order)
 
+        with profiling.phase('serialize'):
+            return jsonify({
+                'success': True,
+                'data': payload.format_rows(results[:limit], fields, response_format),
+                'format': response_format,
+                'count': len(results),
+                'snapshot_date': snapshot_date,
+                'weights_used': weights,
+                'weights_version': weights_version
+            })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+
+
+@app.route('/api/search', methods=['GET'])
+@response_cache.cached('data_version')
+def search_videos():
+    """
+    영상 전문 검색 (제목, 설명, 태그, 채널명)
+
+    Query Parameters:
+        - q: 검색어 (필수, 단어끼리는 AND, 한글은 부분 문자열 일치)
+        - start_date, end_date: 스냅샷 날짜 범위 (YYYY-MM-DD), 범위 안에 수집된 영상만
+        - data_source: 'channel', 'category', 'all' (기본값: all)
+        - sort: score(기본, 관련도+ViewScore+SeniorScore 가중 평균), relevance, view_score,
+          senior_score, view_count, published_at
+        - text_weight, view_weight, senior_weight: score 가중치 (기본값: 1.0)
+        - limit: 최대 결과 수 (기본값: 50, 최대 200)
+        - fields: 반환할 키 (쉼표 구분)
+
+    Returns:
+        JSON: [{video_id, title, ..., snapshot_date, view_count, view_score, senior_score, relevance, score}, ...]
+        스냅샷 값은 범위 안 마지막 날짜 기준
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        match_query = video_search.build_match_query(query)
+        if not match_query:
+            return jsonify({
+                'success': False,
+                'error': '검색어(q)가 필요합니다.'
+            }), 400
+
+        limit = min(int(request.args.get('limit', 50)), SEARCH_MAX_LIMIT)
+        weights = {
+            name: float(request.args.get(f'{name}_weight', default))
+            for name, default in video_search.DEFAULT_SEARCH_WEIGHTS.items()
+        }
+
+        with profiling.phase('fetch'):
+            rows = database.search_videos(
+                match_query,
+                start_date=request.args.get('start_date'),
+                end_date=request.args.get('end_date'),
+                data_source=request.args.get('data_source', 'all'),
+                limit=max(limit, SEARCH_CANDIDATES)
+            )
+
+        results = video_search.rank_results(rows, weights, request.args.get('sort', 'score'))
+
         return jsonify({
             'success': True,
-            'data': results[:limit],
+            'data': payload.project(results[:limit], payload.parse_fields(request.args.get('fields'))),
             'count': len(results),
-            'snapshot_date': snapshot_date,
+            'query': query,
             'weights_used': weights
         })
 
@@ -215,8 +372,6 @@ def get_videos():
         }), 500
 
 
-
-
 @app.route('/api/video/<video_id>', methods=['GET'])
 def get_video_details(video_id):
     """
@@ -264,9 +419,8 @@ def get_video_details(video_id):
         if video.get('metadata'):
             video['metadata'] = json.loads(video['metadata'])
 
-        # tags JSON 파싱
-        if video.get('tags'):
-            video['tags'] = json.loads(video['tags'])
+        # 태그 (video_tags 역색인, 원래 순서)
+        video['tags'] = database.get_video_tags(video_id)
 
         # Δviews 계산
         delta_views = database.get_delta_views(video_id, days=14)
@@ -318,6 +472,7 @@ def save_label():
             INSERT INTO labels (video_id, is_senior_content, labeled_by, notes)
             VALUES (?, ?, ?, ?)
         """, (video_id, int(is_senior_content), labeled_by, notes))
+        labeling_queue.dequeue(video_id, conn)
 
         conn.commit()
         conn.close()
@@ -339,45 +494,37 @@ def get_unlabeled_videos():
     """
     라벨링 안 된 비디오 가져오기 (주간 50개)
 
+    labeling_queue에서 인덱스 순서대로 limit개만 읽음
+
     Query Parameters:
         - limit: 최대 반환 수 (기본값: 50)
+        - strategy: 샘플링 전략 (기본값: score)
+            · score: ViewScore 높은 순
+            · uncertainty: 모델이 가장 헷갈리는 순 (결정 경계에 가까운 순)
+            · diversity: 불확실한 순, 채널당 1개씩 우선
+            · recency: 최근 수집된 순
 
     Returns:
-        JSON: 비디오 리스트 (SeniorScore 높은 순)
+        JSON: 비디오 리스트
     """
     try:
         limit = int(request.args.get('limit', 50))
+        strategy = request.args.get('strategy', 'score')
 
-        conn = database.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT DISTINCT
-                v.video_id, v.title, v.channel_title, v.thumbnail_url,
-                vs.score as view_score, vs.metadata
-            FROM videos v
-            JOIN snapshots s ON v.video_id = s.video_id
-            JOIN view_scores vs ON s.id = vs.snapshot_id
-            LEFT JOIN labels l ON v.video_id = l.video_id
-            WHERE l.id IS NULL
-            ORDER BY vs.score DESC
-            LIMIT ?
-        """, (limit,))
-
-        rows = cursor.fetchall()
-        conn.close()
+        if strategy not in labeling_queue.STRATEGIES:
+            return jsonify({
+                'success': False,
+                'error': f'알 수 없는 샘플링 전략입니다: {strategy}'
+            }), 400
 
-        videos = []
-        for row in rows:
-            video = dict(row)
-            if video.get('metadata'):
-                video['metadata'] = json.loads(video['metadata'])
-            videos.append(video)
+        videos = labeling_queue.sample(limit=limit, strategy=strategy)
 
         return jsonify({
             'success': True,
             'data': videos,
-            'count': len(videos)
+            'count': len(videos),
+            'remaining': labeling_queue.count(),
+            'strategy': strategy
         })
 
     except Exception as e:
@@ -388,9 +535,10 @@ def get_unlabeled_videos():
 
 
 @app.route('/api/stats', methods=['GET'])
+@response_cache.cached('data_version')
 def get_stats():
     """
-    전체 통계 조회
+    전체 통계 조회 (stats_counters에서 O(1) 조회)
 
     Returns:
         JSON: {
@@ -401,31 +549,204 @@ def get_stats():
         }
     """
     try:
-        conn = database.get_connection()
-        cursor = conn.cursor()
+        return jsonify({
+            'success': True,
+            'data': rollups.get_stats()
+        })
 
-        cursor.execute("SELECT COUNT(*) as count FROM videos")
-        total_videos = cursor.fetchone()['count']
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
 
-        cursor.execute("SELECT COUNT(*) as count FROM snapshots")
-        total_snapshots = cursor.fetchone()['count']
 
-        cursor.execute("SELECT COUNT(*) as count FROM labels")
-        total_labels = cursor.fetchone()['count']
+@app.route('/api/trends/<dimension>', methods=['GET'])
+def get_trends(dimension):
+    """
+    일별 롤업 기반 트렌드 (카테고리별 / 채널별)
 
-        cursor.execute("SELECT MAX(snapshot_date) as latest FROM snapshots")
-        latest_snapshot_date = cursor.fetchone()['latest']
+    URL:
+        /api/trends/categories 또는 /api/trends/channels
 
-        conn.close()
+    Query Parameters:
+        - source: 'category', 'channel', 'all' (기본값: all)
+        - start_date, end_date: 조회 기간 (YYYY-MM-DD)
+        - days: start_date 생략 시 최근 N일 (기본값: 30)
+        - keys: 카테고리 ID / 채널 ID (쉼표 구분)
+
+    Returns:
+        JSON: [{rollup_date, source, dim_key, video_count, total_views, delta_views, score_p50, ...}, ...]
+    """
+    try:
+        dimension_map = {'categories': 'category', 'channels': 'channel'}
+        if dimension not in dimension_map:
+            return jsonify({
+                'success': False,
+                'error': 'categories 또는 channels만 지원합니다.'
+            }), 404
+
+        end_date = request.args.get('end_date') or datetime.now(KST).strftime('%Y-%m-%d')
+        start_date = request.args.get('start_date')
+        if not start_date:
+            days = int(request.args.get('days', 30))
+            start_date = (datetime.strptime(end_date, '%Y-%m-%d') - timedelta(days=days)).strftime('%Y-%m-%d')
+
+        keys = request.args.get('keys')
+
+        trends = rollups.get_trends(
+            dimension_map[dimension],
+            source=request.args.get('source', 'all'),
+            start_date=start_date,
+            end_date=end_date,
+            keys=keys.split(',') if keys else None
+        )
 
         return jsonify({
             'success': True,
-            'data': {
-                'total_videos': total_videos,
-                'total_snapshots': total_snapshots,
-                'total_labels': total_labels,
-                'latest_snapshot_date': latest_snapshot_date
-            }
+            'data': trends,
+            'count': len(trends),
+            'start_date': start_date,
+            'end_date': end_date
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def _tag_query_params():
+    """태그 API 공통 쿼리 파라미터 → (start_date, end_date, data_source, min_senior_score)"""
+    end_date = request.args.get('end_date') or datetime.now(KST).strftime('%Y-%m-%d')
+    start_date = request.args.get('start_date')
+    if not start_date:
+        days = int(request.args.get('days', 30))
+        start_date = (datetime.strptime(end_date, '%Y-%m-%d') - timedelta(days=days)).strftime('%Y-%m-%d')
+    min_senior_score = request.args.get('min_senior_score')
+    return (
+        start_date,
+        end_date,
+        request.args.get('data_source', 'all'),
+        float(min_senior_score) if min_senior_score else None
+    )
+
+
+@app.route('/api/tags', methods=['GET'])
+@response_cache.cached('data_version', today=True)
+def get_tags():
+    """
+    기간 안 영상 수가 많은 태그
+
+    Query Parameters:
+        - start_date, end_date: 스냅샷 날짜 범위 (YYYY-MM-DD), start_date 생략 시 최근 days일 (기본값: 30)
+        - data_source: 'channel', 'category', 'all' (기본값: all)
+        - min_senior_score: SeniorScore 이상인 영상만 (예: 5.0 → 시니어 대상)
+        - limit: 최대 태그 수 (기본값: 50)
+
+    Returns:
+        JSON: [{tag, video_count}, ...]
+    """
+    try:
+        start_date, end_date, data_source, min_senior_score = _tag_query_params()
+        tags = database.get_tag_counts(
+            start_date, end_date, data_source=data_source,
+            min_senior_score=min_senior_score, limit=int(request.args.get('limit', 50))
+        )
+
+        return jsonify({
+            'success': True,
+            'data': tags,
+            'count': len(tags),
+            'start_date': start_date,
+            'end_date': end_date
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/tags/trends', methods=['GET'])
+@response_cache.cached('data_version', today=True)
+def get_tag_trends():
+    """
+    태그별 일별 영상 수 / 조회수 합계
+
+    Query Parameters:
+        - tags: 태그 (쉼표 구분, 필수)
+        - start_date, end_date, days, data_source, min_senior_score: /api/tags와 같음
+
+    Returns:
+        JSON: [{snapshot_date, tag, video_count, total_views}, ...]
+    """
+    try:
+        tags = [tag for tag in request.args.get('tags', '').split(',') if tag.strip()]
+        if not tags:
+            return jsonify({
+                'success': False,
+                'error': 'tags가 필요합니다.'
+            }), 400
+
+        start_date, end_date, data_source, min_senior_score = _tag_query_params()
+        trends = database.get_tag_trends(
+            tags, start_date, end_date, data_source=data_source, min_senior_score=min_senior_score
+        )
+
+        return jsonify({
+            'success': True,
+            'data': trends,
+            'count': len(trends),
+            'start_date': start_date,
+            'end_date': end_date
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/tags/rising', methods=['GET'])
+@response_cache.cached('data_version', today=True)
+def get_rising_tags():
+    """
+    떠오르는 태그 (최근 days일 영상 수 vs 그 전 days일)
+
+    Query Parameters:
+        - end_date: 기준 날짜 (기본값: 오늘)
+        - days: 비교 기간 (기본값: 7)
+        - data_source, min_senior_score: /api/tags와 같음
+        - min_videos: 최근 기간 최소 영상 수 (기본값: 3)
+        - limit: 최대 태그 수 (기본값: 50)
+
+    Returns:
+        JSON: [{tag, recent_count, previous_count, growth}, ...]  // growth = (최근+1)/(이전+1)
+    """
+    try:
+        end_date = request.args.get('end_date') or datetime.now(KST).strftime('%Y-%m-%d')
+        days = int(request.args.get('days', 7))
+        min_senior_score = request.args.get('min_senior_score')
+
+        tags = database.get_rising_tags(
+            end_date,
+            days=days,
+            data_source=request.args.get('data_source', 'all'),
+            min_senior_score=float(min_senior_score) if min_senior_score else None,
+            min_videos=int(request.args.get('min_videos', 3)),
+            limit=int(request.args.get('limit', 50))
+        )
+
+        return jsonify({
+            'success': True,
+            'data': tags,
+            'count': len(tags),
+            'end_date': end_date,
+            'days': days
         })
 
     except Exception as e:
@@ -440,6 +761,7 @@ def get_stats():
 # ============================================================
 
 @app.route('/api/channels', methods=['GET'])
+@response_cache.cached('channels_version')
 def get_channels():
     """
     등록된 모든 채널 조회
@@ -482,7 +804,7 @@ def add_channel():
 
     Request Body:
         {
-            "url": "https://www.youtube.com/@channel_name",
+            "url": "https://www.youtube.com/@channel_name" (또는 /channel/UCxxxx, @handle),
             OR
             "channel_id": "UCxxxxx"
         }
@@ -495,15 +817,22 @@ def add_channel():
         url = data.get('url')
         channel_id = data.get('channel_id')
 
-        # URL에서 채널 ID 추출
+        # URL에서 채널 ID 추출 (/@handle, /c/, /user/는 API로 조회)
         if url:
-            channel_id = youtube_api.get_channel_id_from_url(url)
-            if not channel_id:
+            reference = youtube_api.parse_channel_reference(url)
+            if not reference:
                 return jsonify({
                     'success': False,
                     'error': '채널 ID를 추출할 수 없습니다. URL을 확인해주세요.'
                 }), 400
 
+            channel_id = youtube_api.resolve_channel_reference(reference)
+            if not channel_id:
+                return jsonify({
+                    'success': False,
+                    'error': '채널을 찾을 수 없습니다.'
+                }), 404
+
         if not channel_id:
             return jsonify({
                 'success': False,
@@ -526,23 +855,26 @@ def add_channel():
         cursor = conn.cursor()
 
         cursor.execute("""
-            INSERT INTO channels (channel_id, channel_title, subscriber_count, senior_weight, is_whitelist)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT INTO channels (channel_id, channel_title, subscriber_count, senior_weight, is_whitelist, handle)
+            VALUES (?, ?, ?, ?, ?, ?)
             ON CONFLICT(channel_id) DO UPDATE SET
                 channel_title = excluded.channel_title,
                 subscriber_count = excluded.subscriber_count,
                 is_whitelist = 1,
+                handle = COALESCE(excluded.handle, channels.handle),
                 updated_at = CURRENT_TIMESTAMP
         """, (
             channel_info['channel_id'],
             channel_info['channel_title'],
             channel_info['subscriber_count'],
             1.0,
-            1  # 화이트리스트
+            1,  # 화이트리스트
+            database.normalize_handle(channel_info.get('handle'))
         ))
 
         conn.commit()
         conn.close()
+        whitelist_digest.refresh()
 
         return jsonify({
             'success': True,
@@ -557,7 +889,63 @@ def add_channel():
         }), 500
 
 
+@app.route('/api/channels/import', methods=['POST'])
+def import_channels():
+    """
+    채널 일괄 등록 (URL / 채널 ID / @핸들 혼합)
+
+    Request Body:
+        {
+            "channels": ["https://www.youtube.com/@handle", "UCxxxx", "@handle2", ...],
+            OR
+            "text": "한 줄에 하나 (#으로 시작하면 주석)",
+            "dry_run": false
+        }
+
+    Returns:
+        JSON: {
+            "data": {
+                "summary": {"added": 3, "updated": 1, "not_found": 1, ...},
+                "items": [{"input", "status", "channel_id", "channel_title"}, ...]
+            }
+        }
+    status: added(새로 등록) / updated(이미 등록) / duplicate / not_found / invalid / resolved(dry_run)
+    """
+    try:
+        data = request.get_json() or {}
+        inputs = data.get('channels')
+        if inputs is None:
+            inputs = channel_import.parse_lines(str(data.get('text', '')).splitlines())
+
+        if not isinstance(inputs, list) or not inputs:
+            return jsonify({
+                'success': False,
+                'error': 'channels(리스트) 또는 text를 제공해주세요.'
+            }), 400
+
+        if len(inputs) > CHANNEL_IMPORT_MAX_ITEMS:
+            return jsonify({
+                'success': False,
+                'error': f'한 번에 최대 {CHANNEL_IMPORT_MAX_ITEMS}개까지 등록할 수 있습니다.'
+            }), 400
+
+        report = channel_import.import_channels([str(item) for item in inputs], dry_run=bool(data.get('dry_run')))
+        whitelist_digest.refresh()
+
+        return jsonify({
+            'success': True,
+            'data': report
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @app.route('/api/channels/names', methods=['GET'])
+@response_cache.cached('whitelist_version')
 def get_channel_names():
     """
     등록된 모든 채널명 리스트 조회 (확장프로그램 - 검색 결과 페이지용)
@@ -639,6 +1027,198 @@ def check_channel(channel_id):
         }), 500
 
 
+@app.route('/api/channels/check', methods=['POST'])
+def check_channels_batch():
+    """
+    여러 채널의 등록 여부를 한 번에 확인 (확장프로그램용, 쿼리 1번)
+
+    Request Body:
+        {
+            "channel_ids": ["UCxxxx", "UCyyyy"],
+            "handles": ["@foo", "bar"]
+        }
+
+    Returns:
+        JSON: {
+            "data": {
+                "channels": {"UCxxxx": {"exists": true, "channel_title": "채널명"}, "UCyyyy": {"exists": false}},
+                "handles": {"@foo": {"exists": true, "channel_id": "UCxxxx", "channel_title": "채널명"}}
+            },
+            "version": 화이트리스트 버전
+        }
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        raw_channel_ids = (data.get('channel_ids') or []) if isinstance(data, dict) else None
+        raw_handles = (data.get('handles') or []) if isinstance(data, dict) else None
+
+        for field, value in [('channel_ids', raw_channel_ids), ('handles', raw_handles)]:
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                return jsonify({
+                    'success': False,
+                    'error': f'{field}는 문자열 리스트여야 합니다.'
+                }), 400
+
+        channel_ids = list(dict.fromkeys(c.strip() for c in raw_channel_ids if c.strip()))
+        handles = list(dict.fromkeys(
+            h for h in (database.normalize_handle(h) for h in raw_handles) if h
+        ))
+
+        if len(channel_ids) + len(handles) > CHANNEL_CHECK_MAX_BATCH:
+            return jsonify({
+                'success': False,
+                'error': f'한 번에 최대 {CHANNEL_CHECK_MAX_BATCH}개까지 확인할 수 있습니다.'
+            }), 400
+
+        rows = database.check_whitelisted_channels(channel_ids, handles)
+        by_id = {row['channel_id']: row for row in rows}
+        by_handle = {row['handle']: row for row in rows if row['handle']}
+
+        result_channels = {}
+        for channel_id in channel_ids:
+            row = by_id.get(channel_id)
+            result_channels[channel_id] = (
+                {'exists': True, 'channel_title': row['channel_title']} if row else {'exists': False}
+            )
+
+        result_handles = {}
+        for handle in handles:
+            row = by_handle.get(handle)
+            result_handles[handle] = (
+                {'exists': True, 'channel_id': row['channel_id'], 'channel_title': row['channel_title']}
+                if row else {'exists': False}
+            )
+
+        return jsonify({
+            'success': True,
+            'data': {'channels': result_channels, 'handles': result_handles},
+            'version': database.get_data_versions(['whitelist_version'])[0]
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/channels/whitelist', methods=['GET'])
+@response_cache.cached('whitelist_version', 'whitelist_reset_version')
+def get_whitelist():
+    """
+    화이트리스트 스냅샷/델타 (확장프로그램 로컬 캐시 동기화)
+
+    Query Parameters:
+        since: 클라이언트가 가진 버전 (생략 또는 0이면 전체 목록)
+
+    Returns:
+        JSON: {
+            "data": {
+                "version": 현재 버전,
+                "full": true면 channels가 전체 목록 (로컬 캐시 교체),
+                "channels": [{"channel_id", "channel_title", "handle"}, ...],  // 등록 또는 변경
+                "removed": ["UCxxxx", ...]  // 등록 해제
+            }
+        }
+    ETag/If-None-Match 지원 (바뀐 게 없으면 304)
+    """
+    try:
+        since = int(request.args.get('since', 0))
+        return jsonify({
+            'success': True,
+            'data': database.get_whitelist_changes(since)
+        })
+
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'since는 정수여야 합니다.'
+        }), 400
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/channels/digest', methods=['GET'])
+@response_cache.cached('whitelist_version', 'whitelist_reset_version')
+def get_whitelist_digest():
+    """
+    화이트리스트 블룸 필터 다이제스트 (확장프로그램 로컬 멤버십 확인)
+
+    Returns:
+        JSON: {
+            "data": {
+                "version": 화이트리스트 버전,
+                "count": 등록 채널 수,
+                "m": 비트 수, "k": 해시 수, "hash": "fnv1a32", "fp_rate": 목표 오탐률,
+                "bits": 비트열 (base64)
+            }
+        }
+    채널 ID와 @핸들이 들어 있음. 없음 판정은 정확, 있음 판정은 POST /api/channels/check로 확인
+    ETag/If-None-Match 지원 (바뀐 게 없으면 304)
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'data': whitelist_digest.get_digest()
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/channels/<channel_id>/history', methods=['GET'])
+def get_channel_history(channel_id):
+    """
+    채널 구독자 수 시계열 (channel_snapshots)
+
+    Query Parameters:
+        start_date, end_date: YYYY-MM-DD (생략하면 전체)
+
+    Returns:
+        JSON: {
+            "data": [{"snapshot_date", "subscriber_count", "view_count", "video_count", "subscriber_delta"}, ...],
+            "growth": {"subscribers": 기간 증가량, "rate": 증가율, "days": 기간}
+        }
+    """
+    try:
+        history = database.get_channel_history(
+            channel_id,
+            start_date=request.args.get('start_date'),
+            end_date=request.args.get('end_date')
+        )
+
+        growth = None
+        counted = [row for row in history if row['subscriber_count'] is not None]
+        if len(counted) >= 2:
+            first, last = counted[0], counted[-1]
+            growth = {
+                'subscribers': last['subscriber_count'] - first['subscriber_count'],
+                'rate': round((last['subscriber_count'] - first['subscriber_count']) / first['subscriber_count'], 4)
+                if first['subscriber_count'] else None,
+                'days': (datetime.strptime(last['snapshot_date'], '%Y-%m-%d')
+                         - datetime.strptime(first['snapshot_date'], '%Y-%m-%d')).days
+            }
+
+        return jsonify({
+            'success': True,
+            'data': history,
+            'growth': growth
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @app.route('/api/channels/<channel_id>', methods=['DELETE'])
 def delete_channel(channel_id):
     """
@@ -659,6 +1239,7 @@ def delete_channel(channel_id):
 
         conn.commit()
         conn.close()
+        whitelist_digest.refresh()
 
         return jsonify({
             'success': True,
@@ -672,6 +1253,34 @@ def delete_channel(channel_id):
         }), 500
 
 
+@app.route('/api/channels/schedule', methods=['GET'])
+def get_channel_schedule():
+    """
+    채널별 적응형 수집 주기 (우선순위 순)
+
+    Returns:
+        JSON: {
+            "data": [{"channel_id", "channel_title", "upload_rate"(영상/일), "view_velocity"(일 증가율),
+                      "interval_hours", "next_collect_at"(UTC), "overdue", "due"}, ...],
+            "due_count": 지금 수집할 채널 수
+        }
+    """
+    try:
+        schedule = channel_schedule.get_schedule(database.get_whitelist_channel_ids())
+
+        return jsonify({
+            'success': True,
+            'data': schedule,
+            'due_count': sum(1 for item in schedule if item['due'])
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @app.route('/api/channels/collect', methods=['POST'])
 def collect_from_channels():
     """
@@ -681,7 +1290,9 @@ def collect_from_channels():
         {
             "max_results": 50,        // 채널당 수집 수
             "days": 7,                // 최근 N일
-            "skip_today_collected": false  // 오늘 수집한 채널 건너뛰기
+            "skip_today_collected": false,  // 오늘 수집한 채널 건너뛰기
+            "adaptive": false,        // 채널별 수집 주기상 예정 시각이 지난 채널만 (밀린 순)
+            "max_channels": null      // adaptive일 때 최대 채널 수 (쿼터 예산, 채널당 3)
         }
 
     Returns:
@@ -692,20 +1303,11 @@ def collect_from_channels():
         max_results = data.get('max_results', 50)
         days = data.get('days', 7)
         skip_today_collected = data.get('skip_today_collected', False)
+        adaptive = bool(data.get('adaptive', False))
+        max_channels = data.get('max_channels')
 
         # 등록된 채널 조회
-        conn = database.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT channel_id FROM channels
-            WHERE is_whitelist = 1
-        """)
-
-        rows = cursor.fetchall()
-        conn.close()
-
-        channel_ids = [row['channel_id'] for row in rows]
+        channel_ids = database.get_whitelist_channel_ids()
 
         if not channel_ids:
             return jsonify({
@@ -718,9 +1320,213 @@ def collect_from_channels():
             channel_ids=channel_ids,
             max_results_per_channel=max_results,
             days=days,
-            skip_today_collected=skip_today_collected
+            skip_today_collected=skip_today_collected,
+            adaptive=adaptive,
+            max_channels=int(max_channels) if max_channels else None
+        )
+
+        return jsonify({
+            'success': True,
+            'data': stats
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+# ============================================================
+# 가중치 학습 API
+# ============================================================
+
+@app.route('/api/weights', methods=['GET'])
+def get_weights():
+    """
+    활성 가중치 및 발행 이력 조회
+
+    Query Parameters:
+        - model: 'view' 또는 'senior' (생략 시 전체 이력)
+
+    Returns:
+        JSON: {
+            "active": {"view": {...}, "senior": {...}},
+            "versions": [...]
+        }
+    """
+    try:
+        model = request.args.get('model')
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'active': {
+                    'view': weight_trainer.get_active_weights('view'),
+                    'senior': weight_trainer.get_active_weights('senior')
+                },
+                'versions': weight_trainer.list_versions(model)
+            }
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/weights/train', methods=['POST'])
+def train_weights():
+    """
+    라벨로 가중치 학습 후 새 버전 발행
+
+    Request Body:
+        {
+            "model": "view",      // 'view', 'senior'
+            "activate": true,     // 발행 즉시 활성화
+            "note": "11월 2주차 라벨"
+        }
+    """
+    try:
+        data = request.get_json() or {}
+        model = data.get('model', 'view')
+
+        if model not in weight_trainer.MODEL_FEATURES:
+            return jsonify({
+                'success': False,
+                'error': f'알 수 없는 모델입니다: {model}'
+            }), 400
+
+        try:
+            result = weight_trainer.train(
+                model,
+                activate=data.get('activate', True),
+                note=data.get('note', '')
+            )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+
+        return jsonify({
+            'success': True,
+            'data': result
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/weights/<int:version>/activate', methods=['POST'])
+def activate_weights(version):
+    """특정 가중치 버전 활성화 (롤백용)"""
+    try:
+        if not weight_trainer.activate_version(version):
+            return jsonify({
+                'success': False,
+                'error': '가중치 버전을 찾을 수 없습니다.'
+            }), 404
+
+        return jsonify({
+            'success': True,
+            'message': f'가중치 v{version}이 활성화되었습니다.'
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+# ============================================================
+# 키워드 사전 관리 API
+# ============================================================
+
+@app.route('/api/dictionaries', methods=['GET'])
+def get_dictionaries():
+    """
+    SeniorScore 키워드 사전 전체 조회
+
+    Returns:
+        JSON: {
+            "version": 3,
+            "dictionaries": {"senior_keywords": {"건강": 3.0, ...}, ...}
+        }
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'data': keyword_dictionary.get_dictionaries()
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/dictionaries/<dict_name>', methods=['POST'])
+def update_dictionary(dict_name):
+    """
+    키워드 사전 수정 (저장 즉시 핫 리로드, 새 사전 버전 발행)
+
+    Request Body:
+        {
+            "upsert": {"무릎": 3.0, "보청기": 2.0},
+            "remove": ["요가"],
+            "note": "건강 키워드 조정"
+        }
+
+    Returns:
+        JSON: {"version": 새 버전, "changed_terms": [...]}
+    """
+    try:
+        data = request.get_json() or {}
+
+        if dict_name not in keyword_dictionary.DICTIONARY_NAMES:
+            return jsonify({
+                'success': False,
+                'error': f'알 수 없는 사전입니다: {dict_name}'
+            }), 404
+
+        result = keyword_dictionary.update_dictionary(
+            dict_name,
+            upsert=data.get('upsert', {}),
+            remove=data.get('remove', []),
+            note=data.get('note', '')
         )
 
+        return jsonify({
+            'success': True,
+            'message': '사전이 저장되었습니다.',
+            'data': result
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/dictionaries/rescore', methods=['POST'])
+def rescore_dictionaries():
+    """
+    사전 버전이 오래된 SeniorScore 재계산 (바뀐 용어가 걸린 영상만)
+
+    Returns:
+        JSON: {"rescored": 재계산 수, "bumped": 버전만 갱신한 수}
+    """
+    try:
+        stats = keyword_dictionary.rescore_stale_scores()
+
         return jsonify({
             'success': True,
             'data': stats
@@ -733,5 +1539,60 @@ def collect_from_channels():
         }), 500
 
 
+# ============================================================
+# 디버그 API (PROFILING_ENABLED=1일 때만)
+# ============================================================
+
+@app.route('/api/debug/profile', methods=['GET'])
+def get_debug_profiles():
+    """
+    샘플링된 요청의 cProfile 결과 (최신순)
+
+    PROFILE_SAMPLE_RATE 확률로 샘플링되거나, 요청에 ?_profile=1을 붙이면 프로파일된다.
+
+    Query Parameters:
+        limit: 최대 반환 수 (기본 10)
+    """
+    if not profiling.ENABLED:
+        return jsonify({
+            'success': False,
+            'error': '프로파일링이 꺼져 있습니다 (PROFILING_ENABLED=1)'
+        }), 404
+
+    try:
+        limit = int(request.args.get('limit', 10))
+        return jsonify({
+            'success': True,
+            'data': profiling.get_profiles()[:limit],
+            'slow_query_ms': profiling.SLOW_QUERY_MS,
+            'sample_rate': profiling.PROFILE_SAMPLE_RATE
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Prometheus 메트릭 (텍스트 노출 형식)
+
+    수집기(저장 영상 수, 실행 시간), YouTube API(호출/에러/지연),
+    HTTP 요청(엔드포인트별 수/지연), DB 크기와 테이블 행 수
+    """
+    try:
+        metrics.update_db_gauges()
+        metrics.update_collection_metrics()  # 별도 프로세스(cron) 수집 포함, DB에 누적된 값
+    except Exception as e:
+        print(f"⚠️  DB 메트릭 갱신 실패: {e}")
+
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 if __name__ == '__main__':
+    # 개발 서버 (운영은 wsgi.py + gunicorn.conf.py)
+    create_app()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,424 @@
+"""
+엔드투엔드 벤치마크
+
+합성 데이터로 수집·점수 계산·조회 경로의 성능을 측정하고, 결과를 JSON으로 남긴다.
+저장된 기준선(baseline)보다 허용 범위 이상 느려지면 종료 코드 1로 실패한다.
+
+측정 항목:
+- ingest: 합성 API(youtube_transport.SyntheticBackend)로 collect_trending_videos /
+  collect_from_channels 실행 → 초당 저장 영상 수
+- scoring: calculate_view_score / calculate_senior_score 초당 처리 수
+- api_videos: 규모별 합성 DB에서 POST /api/videos 지연 (데이터 소스 × 정렬, 카테고리 필터)
+- delta_views: 규모별 합성 DB에서 calculate_delta_views_for_date 소요 시간
+
+규모 (스냅샷 수): 1k, 100k, 1m  (30일 × 영상 수, 절반은 카테고리 / 절반은 채널 기반)
+
+사용법:
+    python benchmark.py                                # 1k 규모, 기준선 있으면 비교
+    python benchmark.py --scales 1k,100k --output bench.json
+    python benchmark.py --save-baseline                # 현재 결과를 기준선으로 저장
+    python benchmark.py --scales 1m --workdir /tmp/bench --reuse   # 생성한 DB 재사용
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import platform
+import tempfile
+import contextlib
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Callable
+
+import numpy as np
+
+import database
+import youtube_api
+import youtube_transport
+import data_collector
+import view_score_calculator
+import senior_classifier
+import response_cache
+
+
+# 규모 이름 → 스냅샷 수
+SCALES = {
+    '1k': 1_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+# 합성 DB 기간 (일)
+SYNTHETIC_DAYS = 30
+
+# 합성 DB 마지막 날짜 (결과가 실행 날짜에 따라 달라지지 않도록 고정)
+SYNTHETIC_END_DATE = '2025-01-30'
+
+# 규모별 /api/videos 반복 횟수
+API_REPEATS = {'1k': 20, '100k': 3, '1m': 1}
+
+API_SORTS = ['view_score', 'view_count', 'delta_views_14d']
+API_SOURCES = ['category', 'channel', 'all']
+
+BASELINE_FILE = 'benchmark_baseline.json'
+OUTPUT_FILE = 'benchmark_results.json'
+
+# 기준선 대비 허용 악화 비율
+DEFAULT_TOLERANCE = 0.25
+
+
+@contextlib.contextmanager
+def _quiet():
+    """수집기 진행 로그 숨기기 (출력 자체가 측정을 왜곡하지 않도록)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _use_database(path: str) -> None:
+    database.DATABASE_PATH = path
+    with _quiet():
+        database.init_database()
+
+
+def _metric(value: float, unit: str, better: str) -> Dict[str, Any]:
+    return {'value': round(value, 4), 'unit': unit, 'better': better}
+
+
+# ============================================================
+# 수집 (ingest)
+# ============================================================
+
+def bench_ingest(workdir: str, n_channels: int = 200, categories: int = 8) -> Dict[str, Dict[str, Any]]:
+    """빈 DB에 합성 API로 수집 (카테고리 인기 영상 + 채널 최근 영상)"""
+    backend = youtube_transport.SyntheticBackend(n_channels=n_channels, videos_per_channel=20, seed=7)
+    youtube_transport.set_backend(backend)
+    _use_database(f'{workdir}/ingest.db')
+
+    category_ids = [cid for cid, _ in youtube_transport.SYNTHETIC_CATEGORIES[:categories]]
+    channel_ids = [backend.channel_id(c) for c in range(n_channels)]
+
+    results = {}
+    try:
+        with _quiet():
+            backend.build_trending_index()
+            elapsed = _timed(lambda: results.setdefault(
+                'trending', data_collector.collect_trending_videos(category_ids, snapshot_date='2025-01-01')))
+        trending_videos = results['trending']['new_videos']
+
+        with _quiet():
+            elapsed_channels = _timed(lambda: results.setdefault(
+                'channels', data_collector.collect_from_channels(channel_ids, snapshot_date='2025-01-01')))
+        channel_videos = results['channels']['new_videos']
+    finally:
+        youtube_transport.set_backend(None)
+
+    return {
+        'ingest.collect_trending.videos_per_sec': _metric(trending_videos / elapsed, 'videos/s', 'higher'),
+        'ingest.collect_from_channels.videos_per_sec': _metric(channel_videos / elapsed_channels, 'videos/s', 'higher'),
+    }
+
+
+# ============================================================
+# 점수 계산 (scoring)
+# ============================================================
+
+def _synthetic_videos(n: int, seed: int = 11) -> List[Dict[str, Any]]:
+    """youtube_api 파싱 결과와 같은 형태의 합성 영상 dict"""
+    backend = youtube_transport.SyntheticBackend(n_channels=max(1, n // 20 + 1), videos_per_channel=20, seed=seed)
+    youtube_transport.set_backend(backend)
+    try:
+        ids = [backend.video_id(i // 20, i % 20) for i in range(n)]
+        videos = youtube_api.get_video_details(ids)
+    finally:
+        youtube_transport.set_backend(None)
+
+    for rank, video in enumerate(videos, start=1):
+        video['rank_position'] = rank
+    return videos
+
+
+def bench_scoring(n: int = 5000) -> Dict[str, Dict[str, Any]]:
+    """ViewScore / SeniorScore 계산기 처리량 (DB 없이 순수 계산)"""
+    videos = _synthetic_videos(n)
+    channel = {'subscriber_count': 50_000}
+
+    # /api/videos와 같은 조건: DB에서 읽은 published_at_epoch + 요청당 기준 시각 하나
+    for video in videos:
+        video['published_at_epoch'] = view_score_calculator.parse_published_at(video['published_at'])
+    reference_time = int(time.time())
+
+    elapsed_view = _timed(lambda: [
+        view_score_calculator.calculate_view_score(video, video, channel, reference_time=reference_time)
+        for video in videos
+    ])
+
+    # 키워드 사전 매처 로드(DB 조회)는 측정에서 제외
+    senior_classifier.calculate_senior_score(videos[0])
+    elapsed_senior = _timed(lambda: [
+        senior_classifier.calculate_senior_score(video) for video in videos
+    ])
+
+    return {
+        'scoring.view_score.ops_per_sec': _metric(len(videos) / elapsed_view, 'ops/s', 'higher'),
+        'scoring.senior_score.ops_per_sec': _metric(len(videos) / elapsed_senior, 'ops/s', 'higher'),
+    }
+
+
+# ============================================================
+# 규모별 합성 DB
+# ============================================================
+
+def generate_database(path: str, n_snapshots: int, seed: int = 3) -> Dict[str, Any]:
+    """
+    합성 DB 생성 (영상마다 SYNTHETIC_DAYS일 연속 스냅샷)
+
+    수집기를 거치지 않고 한 연결·한 트랜잭션으로 적재한다.
+    점수는 실제 계산기로 계산 (SeniorScore는 영상당 1번 계산해서 날짜별로 재사용).
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    _use_database(path)
+
+    rng = random.Random(seed)
+    n_videos = max(2, -(-n_snapshots // SYNTHETIC_DAYS))
+    videos = _synthetic_videos(n_videos, seed=seed)
+
+    end = datetime.strptime(SYNTHETIC_END_DATE, '%Y-%m-%d')
+    dates = [(end - timedelta(days=SYNTHETIC_DAYS - 1 - d)).strftime('%Y-%m-%d') for d in range(SYNTHETIC_DAYS)]
+
+    # SeniorScore는 쓰기 트랜잭션을 열기 전에 계산 (키워드 사전 버전 확인이 별도 연결로 DB를 읽음)
+    senior_scores = [senior_classifier.calculate_senior_score(video) for video in videos]
+
+    conn = database.get_connection()
+    conn.execute("PRAGMA synchronous = OFF")
+    cursor = conn.cursor()
+
+    channel_subscribers = {}
+    for video in videos:
+        channel_subscribers.setdefault(video['channel_id'], int(10 ** rng.uniform(2, 6.5)))
+    cursor.executemany("""
+        INSERT OR IGNORE INTO channels (channel_id, channel_title, subscriber_count)
+        VALUES (?, ?, ?)
+    """, [(cid, cid, subs) for cid, subs in channel_subscribers.items()])
+
+    for video in videos:
+        database.insert_video(video, conn=conn)
+
+    written = 0
+    for index, video in enumerate(videos):
+        if written >= n_snapshots:
+            break
+
+        source_key = f"channel:{video['channel_id']}" if index % 2 else video['category_id']
+        channel = {'subscriber_count': channel_subscribers[video['channel_id']]}
+        senior = senior_scores[index]
+        growth = rng.uniform(0.01, 0.1)
+
+        for day, snapshot_date in enumerate(dates):
+            if written >= n_snapshots:
+                break
+
+            snapshot_data = {
+                'video_id': video['video_id'],
+                'category_id': source_key,
+                'snapshot_date': snapshot_date,
+                'view_count': int(video['view_count'] * (1 + growth * day)),
+                'like_count': video['like_count'],
+                'comment_count': video['comment_count'],
+                'rank_position': video['rank_position']
+            }
+            snapshot_id = database.insert_snapshot(snapshot_data, conn=conn)
+
+            view_score = view_score_calculator.calculate_view_score(video, snapshot_data, channel)
+            view_score['snapshot_id'] = snapshot_id
+            database.insert_view_score(view_score, conn=conn)
+
+            senior['snapshot_id'] = snapshot_id
+            database.insert_senior_score(senior, conn=conn)
+            written += 1
+
+    conn.commit()
+    conn.close()
+
+    return {'videos': len(videos), 'snapshots': written, 'latest_date': dates[-1]}
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    p50, p95 = np.percentile(samples, [50, 95])
+    return {'p50': float(p50) * 1000, 'p95': float(p95) * 1000}
+
+
+def bench_queries(scale: str, db_path: str, reuse: bool = False) -> Dict[str, Dict[str, Any]]:
+    """규모별 /api/videos 지연과 Δviews 계산 시간"""
+    if reuse and os.path.exists(db_path):
+        _use_database(db_path)
+        info = {'latest_date': SYNTHETIC_END_DATE}
+    else:
+        start = time.perf_counter()
+        with _quiet():
+            info = generate_database(db_path, SCALES[scale])
+        elapsed = time.perf_counter() - start
+        print(f"  🧱 {scale}: 합성 DB 생성 {info['snapshots']}행 ({elapsed:.1f}s)")
+
+    with _quiet():
+        import app as flask_app
+    client = flask_app.create_app().test_client()
+    repeats = API_REPEATS.get(scale, 1)
+    results = {}
+
+    cases = [(source, sort_by, None) for source in API_SOURCES for sort_by in API_SORTS]
+    cases.append(('category', 'view_score', ['10', '22']))
+
+    for source, sort_by, category_ids in cases:
+        body = {'snapshot_date': info['latest_date'], 'data_source': source, 'sort_by': sort_by, 'limit': 100}
+        if category_ids:
+            body['category_ids'] = category_ids
+
+        samples = []
+        for _ in range(repeats):
+            response_cache.clear()  # 매번 실제 계산 시간을 잼
+            start = time.perf_counter()
+            response = client.post('/api/videos', json=body)
+            samples.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise RuntimeError(f"/api/videos 실패 ({source}, {sort_by}): {response.get_json()}")
+
+        name = f"api_videos.{scale}.{source}.{sort_by}" + ('.category_filter' if category_ids else '')
+        stats = _percentiles(samples)
+        results[f'{name}.p50_ms'] = _metric(stats['p50'], 'ms', 'lower')
+        results[f'{name}.p95_ms'] = _metric(stats['p95'], 'ms', 'lower')
+
+        # 같은 요청 반복 (응답 캐시 적중)
+        elapsed = _timed(lambda: client.post('/api/videos', json=body))
+        results[f'{name}.cached_ms'] = _metric(elapsed * 1000, 'ms', 'lower')
+
+    elapsed = _timed(lambda: data_collector.calculate_delta_views_for_date(info['latest_date'], data_source='all'))
+    results[f'delta_views.{scale}.ms'] = _metric(elapsed * 1000, 'ms', 'lower')
+
+    return results
+
+
+# ============================================================
+# 기준선 비교
+# ============================================================
+
+def compare_to_baseline(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float = DEFAULT_TOLERANCE
+) -> List[Dict[str, Any]]:
+    """
+    기준선보다 tolerance 이상 나빠진 항목 목록
+
+    같은 이름의 항목만 비교한다 (이번에 돌리지 않은 규모는 무시).
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base or not base['value']:
+            continue
+
+        ratio = current['value'] / base['value']
+        if current['better'] == 'lower':
+            regressed = ratio > 1 + tolerance
+        else:
+            regressed = ratio < 1 - tolerance
+
+        if regressed:
+            regressions.append({
+                'name': name,
+                'baseline': base['value'],
+                'current': current['value'],
+                'unit': current['unit'],
+                'change': round((ratio - 1) * 100, 1)
+            })
+    return regressions
+
+
+def run(scales: List[str], workdir: str, reuse: bool = False) -> Dict[str, Any]:
+    """벤치마크 전체 실행 (작업 폴더에서 실행, 저장소 data/와 DB는 건드리지 않음)"""
+    original_cwd = os.getcwd()
+    original_db = database.DATABASE_PATH
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        print("⏱️  수집 벤치마크...")
+        results.update(bench_ingest(workdir))
+        print("⏱️  점수 계산 벤치마크...")
+        results.update(bench_scoring())
+        for scale in scales:
+            print(f"⏱️  조회 벤치마크 ({scale})...")
+            results.update(bench_queries(scale, f'{workdir}/bench_{scale}.db', reuse=reuse))
+    finally:
+        os.chdir(original_cwd)
+        database.DATABASE_PATH = original_db
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'scales': scales,
+        },
+        'results': results
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='엔드투엔드 벤치마크')
+    parser.add_argument('--scales', default='1k', help=f"쉼표로 구분 ({', '.join(SCALES)})")
+    parser.add_argument('--workdir', default=None, help='합성 DB/수집 파일 폴더 (기본: 임시 폴더)')
+    parser.add_argument('--reuse', action='store_true', help='작업 폴더에 있는 합성 DB 재사용')
+    parser.add_argument('--output', default=OUTPUT_FILE, help='결과 JSON 경로')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='기준선 JSON 경로')
+    parser.add_argument('--save-baseline', action='store_true', help='결과를 기준선으로 저장')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='허용 악화 비율 (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    scale_names = [s.strip() for s in args.scales.split(',') if s.strip()]
+    unknown = [s for s in scale_names if s not in SCALES]
+    if unknown:
+        parser.error(f"알 수 없는 규모: {', '.join(unknown)}")
+
+    report = run(scale_names, os.path.abspath(args.workdir or tempfile.mkdtemp(prefix='bench_')), reuse=args.reuse)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n📄 결과 저장: {args.output}")
+
+    for name, metric in sorted(report['results'].items()):
+        print(f"  {name:<60} {metric['value']:>12.2f} {metric['unit']}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n📌 기준선 저장: {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print("\nℹ️  기준선이 없어 비교를 건너뜁니다 (--save-baseline으로 생성)")
+        sys.exit(0)
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline_results = json.load(f)['results']
+
+    regressions = compare_to_baseline(report['results'], baseline_results, args.tolerance)
+    if regressions:
+        print(f"\n❌ 성능 저하 {len(regressions)}건 (허용 {args.tolerance:.0%}):")
+        for item in regressions:
+            print(f"  {item['name']}: {item['baseline']} → {item['current']} {item['unit']} ({item['change']:+.1f}%)")
+        sys.exit(1)
+
+    print(f"\n✅ 기준선 대비 성능 저하 없음 (허용 {args.tolerance:.0%})")
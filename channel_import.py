@@ -0,0 +1,138 @@
+"""
+채널 일괄 등록 (화이트리스트)
+
+URL / 채널 ID / @핸들이 섞인 목록을 받아 한 번에 등록한다.
+1. 파싱: youtube_api.parse_channel_reference (API 호출 없음)
+2. 핸들 → 채널 ID: DB에 이미 있는 핸들은 그대로, 나머지만 channels.list(forHandle)로 조회
+   (youtube_api 프로세스 캐시, 조회 1건당 쿼터 1)
+3. 채널 정보: 같은 채널은 한 번만, channels.list를 50개씩 묶어서 조회
+4. 저장: 트랜잭션 하나로 upsert (database.upsert_whitelist_channels)
+5. 항목별 결과: added / updated / duplicate / not_found / invalid
+
+사용법:
+    python channel_import.py channels.txt              # 한 줄에 하나, #으로 시작하면 주석
+    cat channels.txt | python channel_import.py -
+    python channel_import.py channels.txt --dry-run    # 저장하지 않고 결과만
+"""
+import sys
+import argparse
+from typing import Dict, Any, List, Iterable
+
+import database
+import youtube_api
+
+
+def parse_lines(lines: Iterable[str]) -> List[str]:
+    """텍스트 줄 → 입력 항목 (빈 줄, # 주석 제외, 쉼표/공백 구분 허용)"""
+    items = []
+    for line in lines:
+        if line.lstrip().startswith('#'):
+            continue
+        items.extend(line.replace(',', ' ').split())
+    return items
+
+
+def import_channels(inputs: List[str], dry_run: bool = False) -> Dict[str, Any]:
+    """
+    채널 일괄 등록
+
+    Args:
+        inputs: URL / 채널 ID / @핸들 리스트
+        dry_run: True면 저장하지 않음 (등록될 항목은 'added'/'updated' 대신 'resolved')
+
+    Returns:
+        {
+            'summary': {상태: 개수},
+            'items': [{'input', 'status', 'channel_id', 'channel_title'}, ...]  // 입력 순서
+        }
+    """
+    items: List[Dict[str, Any]] = []
+    references: Dict[str, Dict[str, str]] = {}
+
+    # 1. 파싱
+    for text in inputs:
+        item = {'input': text, 'status': None, 'channel_id': None, 'channel_title': None}
+        items.append(item)
+        reference = youtube_api.parse_channel_reference(text)
+        if reference is None:
+            item['status'] = 'invalid'
+        else:
+            references[text] = reference
+
+    # 2. 핸들 → 채널 ID (DB 먼저, 없는 것만 API)
+    handles = sorted({ref['value'] for ref in references.values() if ref['type'] == 'handle'})
+    known_handles = database.get_channel_ids_by_handles(handles)
+
+    for item in items:
+        reference = references.get(item['input'])
+        if reference is None:
+            continue
+        if reference['type'] == 'handle' and reference['value'] in known_handles:
+            item['channel_id'] = known_handles[reference['value']]
+        else:
+            item['channel_id'] = youtube_api.resolve_channel_reference(reference)
+        if item['channel_id'] is None:
+            item['status'] = 'not_found'
+
+    # 같은 채널이 여러 번 나오면 첫 번째만 등록
+    channel_ids: List[str] = []
+    seen = set()
+    for item in items:
+        if item['status'] is not None:
+            continue
+        if item['channel_id'] in seen:
+            item['status'] = 'duplicate'
+        else:
+            seen.add(item['channel_id'])
+            channel_ids.append(item['channel_id'])
+
+    # 3. 채널 정보 (50개씩)
+    channel_infos = youtube_api.get_channel_info(channel_ids)
+    info_by_id = {info['channel_id']: info for info in channel_infos}
+
+    # 4. 저장 (트랜잭션 하나)
+    statuses = {} if dry_run else database.upsert_whitelist_channels(channel_infos)
+
+    for item in items:
+        if item['channel_id'] is None:
+            continue
+        info = info_by_id.get(item['channel_id'])
+        if info is None:
+            if item['status'] is None:
+                item['status'] = 'not_found'
+            continue
+        item['channel_title'] = info['channel_title']
+        if item['status'] is None:
+            item['status'] = 'resolved' if dry_run else statuses[item['channel_id']]
+
+    summary: Dict[str, int] = {}
+    for item in items:
+        summary[item['status']] = summary.get(item['status'], 0) + 1
+
+    return {'summary': summary, 'items': items}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='채널 일괄 등록 (URL / 채널 ID / @핸들)')
+    parser.add_argument('file', help='채널 목록 파일 (한 줄에 하나, -이면 표준 입력)')
+    parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 결과만 출력')
+    args = parser.parse_args()
+
+    if args.file == '-':
+        inputs = parse_lines(sys.stdin)
+    else:
+        with open(args.file, encoding='utf-8') as f:
+            inputs = parse_lines(f)
+
+    database.init_database()
+    print(f"📥 채널 {len(inputs)}개 등록 시작{' (dry run)' if args.dry_run else ''}")
+
+    report = import_channels(inputs, dry_run=args.dry_run)
+
+    for item in report['items']:
+        icon = '✅' if item['status'] in ('added', 'updated', 'resolved') else '⚠️'
+        title = f" {item['channel_title']}" if item['channel_title'] else ''
+        channel_id = f" ({item['channel_id']})" if item['channel_id'] else ''
+        print(f"  {icon} {item['status']:<9} {item['input']}{title}{channel_id}")
+
+    print(f"\n📊 결과: {', '.join(f'{status} {count}' for status, count in report['summary'].items())}")
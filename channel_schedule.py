@@ -0,0 +1,289 @@
+"""
+채널별 적응형 수집 주기
+
+화이트리스트 채널마다 업로드 빈도와 조회수 증가 속도를 스냅샷 기록으로 추정하고,
+다음 수집 시각(next_collect_at)을 정한다. 채널 수집 1회 = 쿼터 3
+(channels.list + playlistItems.list + videos.list)이므로, 주 1회 올리는 채널을 매일
+수집하는 대신 새 영상이 나올 만한 시점에 수집한다.
+
+- 업로드 빈도 (upload_rate, 영상/일): 최근 LOOKBACK_DAYS일 동안 게시된 영상 수 / 관측 기간
+  관측 기간은 첫 수집 날짜 + 수집 기간(days)부터 (새로 등록한 채널을 과소 추정하지 않도록),
+  기록이 적은 채널은 사전값(PRIOR_UPLOADS개 / PRIOR_DAYS일)과 섞어서 추정
+- 조회수 증가 속도 (view_velocity, 일 상대 증가율): 최근 스냅샷이 2개 이상인 영상들의
+  Σ(일 평균 Δviews) / Σ(처음 조회수). 아직 조회수가 빠르게 느는 채널은 더 자주 수집
+- 수집 간격 = 24시간 × TARGET_UPLOADS_PER_VISIT / upload_rate ÷ (1 + view_velocity / VELOCITY_REFERENCE)
+  [MIN_INTERVAL_HOURS, MAX_INTERVAL_HOURS] 범위, 그리고 수집 기간(days)보다 길지 않게 (업로드 누락 방지)
+- 우선순위: 밀린 정도 (지난 시간 / 간격), 한 번도 수집 안 한 채널이 가장 먼저
+- 다음 수집 시각은 수집 실행 시작 시각 기준, 예정 시각 전이라도 여유(DUE_SLACK_RATIO × 간격,
+  최소 DUE_SLACK_HOURS시간) 안이면 수집 대상 (매일 같은 시각 cron이 전날 채널별 종료 시각보다
+  몇 분 일찍 돌아 하루씩 밀리지 않도록)
+
+사용법:
+    python channel_schedule.py             # 채널별 추정치와 다음 수집 시각
+    python channel_schedule.py --refresh   # 기록으로 전체 채널 다시 추정 (최초 도입 시)
+"""
+import os
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional
+
+import database
+
+
+LOOKBACK_DAYS = 28
+PRIOR_UPLOADS = 1.0  # 기록이 없으면 주 1회 업로드로 가정
+PRIOR_DAYS = 7.0
+TARGET_UPLOADS_PER_VISIT = 1.0
+VELOCITY_REFERENCE = 0.5  # 최근 영상 조회수가 하루 50%씩 늘면 간격 절반
+MIN_INTERVAL_HOURS = float(os.getenv('CHANNEL_MIN_INTERVAL_HOURS', '24'))
+MAX_INTERVAL_HOURS = float(os.getenv('CHANNEL_MAX_INTERVAL_HOURS', str(7 * 24)))
+DUE_SLACK_RATIO = float(os.getenv('CHANNEL_DUE_SLACK_RATIO', '0.1'))  # 예정 시각 전 여유 (간격 대비)
+DUE_SLACK_HOURS = float(os.getenv('CHANNEL_DUE_SLACK_HOURS', '0'))  # 예정 시각 전 최소 여유 (시간)
+
+KST = timezone(timedelta(hours=9))
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'  # CURRENT_TIMESTAMP와 같은 형식 (UTC)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def estimate_activity(channel_id: str, now: Optional[datetime] = None, collection_days: int = 7) -> Dict[str, float]:
+    """
+    스냅샷 기록으로 채널 활동 추정
+
+    Args:
+        channel_id: 채널 ID
+        now: 기준 시각 (UTC)
+        collection_days: 수집 기간 (수집 1회가 며칠 전 업로드까지 보는지)
+
+    Returns:
+        {'upload_rate': 영상/일, 'view_velocity': 일 상대 증가율, 'recent_uploads': 최근 업로드 수}
+    """
+    now = now or _utcnow()
+    since = now - timedelta(days=LOOKBACK_DAYS)
+    since_date = since.astimezone(KST).strftime('%Y-%m-%d')
+
+    conn = database.get_connection()
+    cursor = conn.cursor()
+
+    # published_at은 ISO 8601 (UTC, 'Z')라 문자열 비교 가능
+    cursor.execute("""
+        SELECT COUNT(*) AS uploads FROM videos
+        WHERE channel_id = ? AND published_at >= ?
+    """, (channel_id, since.strftime('%Y-%m-%dT%H:%M:%SZ')))
+    uploads = cursor.fetchone()['uploads']
+
+    cursor.execute("""
+        SELECT
+            MIN(s.view_count) AS first_views,
+            MAX(s.view_count) AS last_views,
+            julianday(MAX(s.snapshot_date)) - julianday(MIN(s.snapshot_date)) AS days
+        FROM snapshots s
+        JOIN videos v ON v.video_id = s.video_id
+        WHERE v.channel_id = ? AND s.snapshot_date >= ?
+        GROUP BY s.video_id
+        HAVING COUNT(DISTINCT s.snapshot_date) >= 2
+    """, (channel_id, since_date))
+    rows = cursor.fetchall()
+
+    cursor.execute("""
+        SELECT MIN(s.snapshot_date) AS first_date
+        FROM snapshots s
+        JOIN videos v ON v.video_id = s.video_id
+        WHERE v.channel_id = ?
+    """, (channel_id,))
+    first_date = cursor.fetchone()['first_date']
+    conn.close()
+
+    # 관측 기간: 첫 수집 때 그 전 collection_days일치 업로드를 봤으므로
+    observed_days = LOOKBACK_DAYS
+    if first_date:
+        first_seen = datetime.strptime(first_date, '%Y-%m-%d').replace(tzinfo=KST)
+        observed_days = min(LOOKBACK_DAYS, max((now - first_seen).total_seconds() / 86400, 0) + collection_days)
+
+    daily_gain = sum((row['last_views'] - row['first_views']) / row['days'] for row in rows if row['days'])
+    base_views = sum(max(row['first_views'] or 0, 1) for row in rows if row['days'])
+
+    return {
+        'upload_rate': (uploads + PRIOR_UPLOADS) / (observed_days + PRIOR_DAYS),
+        'view_velocity': daily_gain / base_views if base_views else 0.0,
+        'recent_uploads': uploads
+    }
+
+
+def compute_interval_hours(
+    upload_rate: float,
+    view_velocity: float,
+    max_interval_hours: Optional[float] = None
+) -> float:
+    """추정치 → 수집 간격 (시간)"""
+    hours = 24.0 * TARGET_UPLOADS_PER_VISIT / max(upload_rate, 1e-6)
+    hours /= 1.0 + max(view_velocity, 0.0) / VELOCITY_REFERENCE
+
+    upper = MAX_INTERVAL_HOURS if max_interval_hours is None else min(MAX_INTERVAL_HOURS, max_interval_hours)
+    return round(min(max(hours, MIN_INTERVAL_HOURS), max(upper, MIN_INTERVAL_HOURS)), 2)
+
+
+def update_schedule(
+    channel_id: str,
+    now: Optional[datetime] = None,
+    collection_days: int = 7,
+    collected_at: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    채널 수집 직후 호출: 추정치를 갱신하고 다음 수집 시각을 정함
+
+    Args:
+        channel_id: 채널 ID
+        now: 기준 시각 (UTC), None이면 현재
+        collection_days: 수집 기간 (간격 상한 = collection_days × 24시간, 업로드 누락 방지)
+        collected_at: 마지막 수집 시각 (None이면 now), 다음 수집 시각 = collected_at + 간격
+            수집 실행 중에는 실행 시작 시각을 넘김 (채널별 처리 종료 시각이 아니라)
+    """
+    now = now or _utcnow()
+    activity = estimate_activity(channel_id, now, collection_days)
+    interval_hours = compute_interval_hours(activity['upload_rate'], activity['view_velocity'], collection_days * 24)
+    next_collect_at = ((collected_at or now) + timedelta(hours=interval_hours)).strftime(TIMESTAMP_FORMAT)
+
+    conn = database.get_connection()
+    conn.execute("""
+        UPDATE channels
+        SET upload_rate = ?, view_velocity = ?, collect_interval_hours = ?, next_collect_at = ?
+        WHERE channel_id = ?
+    """, (
+        round(activity['upload_rate'], 4),
+        round(activity['view_velocity'], 4),
+        interval_hours,
+        next_collect_at,
+        channel_id
+    ))
+    conn.commit()
+    conn.close()
+
+    return {**activity, 'interval_hours': interval_hours, 'next_collect_at': next_collect_at}
+
+
+def get_schedule(channel_ids: List[str], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    채널별 수집 예정 (우선순위 순)
+
+    Returns:
+        [{'channel_id', 'channel_title', 'upload_rate', 'view_velocity', 'interval_hours',
+          'next_collect_at', 'overdue', 'due'}, ...]
+        overdue = (지금 - 예정 시각) / 간격, 예정이 없는 채널은 None (가장 먼저)
+        due = overdue >= -여유 / 간격 (여유 = max(DUE_SLACK_RATIO × 간격, DUE_SLACK_HOURS))
+    """
+    now = now or _utcnow()
+    wanted = set(channel_ids)
+
+    conn = database.get_connection()
+    rows = conn.execute("""
+        SELECT channel_id, channel_title, upload_rate, view_velocity, collect_interval_hours, next_collect_at
+        FROM channels
+        WHERE is_whitelist = 1
+    """).fetchall()
+    conn.close()
+
+    known = set()
+    schedule = []
+    for row in rows:
+        if row['channel_id'] not in wanted:
+            continue
+        known.add(row['channel_id'])
+
+        if row['next_collect_at'] is None or not row['collect_interval_hours']:
+            overdue = None
+            due = True
+        else:
+            interval_hours = row['collect_interval_hours']
+            next_at = datetime.strptime(row['next_collect_at'], TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+            overdue = (now - next_at).total_seconds() / 3600 / interval_hours
+            slack_hours = max(interval_hours * DUE_SLACK_RATIO, DUE_SLACK_HOURS)
+            due = overdue >= -slack_hours / interval_hours
+
+        schedule.append({
+            'channel_id': row['channel_id'],
+            'channel_title': row['channel_title'],
+            'upload_rate': row['upload_rate'],
+            'view_velocity': row['view_velocity'],
+            'interval_hours': row['collect_interval_hours'],
+            'next_collect_at': row['next_collect_at'],
+            'overdue': round(overdue, 3) if overdue is not None else None,
+            'due': due
+        })
+
+    # channels에 없는 채널 (화이트리스트 밖에서 직접 넘긴 ID)은 항상 대상
+    for channel_id in channel_ids:
+        if channel_id not in known:
+            schedule.append({
+                'channel_id': channel_id, 'channel_title': None, 'upload_rate': None, 'view_velocity': None,
+                'interval_hours': None, 'next_collect_at': None, 'overdue': None, 'due': True
+            })
+            known.add(channel_id)
+
+    schedule.sort(key=lambda item: (
+        item['overdue'] is not None,
+        -(item['overdue'] or 0),
+        -(item['upload_rate'] or 0)
+    ))
+    return schedule
+
+
+def select_due_channels(
+    channel_ids: List[str],
+    now: Optional[datetime] = None,
+    max_channels: Optional[int] = None
+) -> List[str]:
+    """수집할 채널 (예정 시각이 지난 것만, 많이 밀린 순, 최대 max_channels개)"""
+    due = [item['channel_id'] for item in get_schedule(channel_ids, now) if item['due']]
+    return due[:max_channels] if max_channels else due
+
+
+def refresh_all(now: Optional[datetime] = None, collection_days: int = 7) -> int:
+    """
+    전체 화이트리스트 채널 추정치 갱신 (기존 DB에 처음 도입할 때)
+
+    다음 수집 시각은 마지막 수집 날짜 + 간격 (수집 기록이 없으면 바로 수집 대상)
+    """
+    now = now or _utcnow()
+    conn = database.get_connection()
+    rows = conn.execute("""
+        SELECT channel_id, last_collected_date FROM channels WHERE is_whitelist = 1
+    """).fetchall()
+    conn.close()
+
+    for row in rows:
+        if row['last_collected_date']:
+            # 수집 날짜(KST) 자정 기준
+            collected_at = datetime.strptime(row['last_collected_date'], '%Y-%m-%d').replace(tzinfo=KST)
+        else:
+            collected_at = now - timedelta(days=LOOKBACK_DAYS)  # 바로 수집 대상
+        update_schedule(row['channel_id'], now, collection_days, collected_at.astimezone(timezone.utc))
+
+    return len(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='채널별 적응형 수집 주기')
+    parser.add_argument('--refresh', action='store_true', help='기록으로 전체 채널 다시 추정')
+    parser.add_argument('--days', type=int, default=7, help='수집 기간 (간격 상한 = days × 24시간)')
+    args = parser.parse_args()
+
+    database.init_database()
+
+    if args.refresh:
+        count = refresh_all(collection_days=args.days)
+        print(f"✅ 채널 {count}개 수집 주기 갱신")
+
+    schedule = get_schedule(database.get_whitelist_channel_ids())
+    due_count = sum(1 for item in schedule if item['due'])
+    print(f"\n📅 수집 대상 {due_count}/{len(schedule)}개 채널 (쿼터 약 {due_count * 3})")
+
+    for item in schedule:
+        icon = '🔴' if item['due'] else '⚪'
+        rate = f"{item['upload_rate']:.2f}/일" if item['upload_rate'] is not None else '-'
+        velocity = f"{item['view_velocity']:.1%}" if item['view_velocity'] is not None else '-'
+        interval = f"{item['interval_hours']:.0f}h" if item['interval_hours'] else '-'
+        print(f"  {icon} {item['channel_id']} {item['channel_title'] or ''} "
+              f"업로드 {rate}, 조회수 증가 {velocity}/일, 간격 {interval}, 다음 {item['next_collect_at'] or '즉시'}")
@@ -5,6 +5,16 @@
 // Flask 서버 URL (설정 가능)
 const API_BASE_URL = 'http://localhost:5000';
 
+// 화이트리스트 블룸 필터 다이제스트 (chrome.storage.local)
+// 등록 여부는 로컬에서 먼저 확인하고, "있을 수도 있음"인 것만 서버에 확인
+// 다이제스트는 이 간격마다 한 번만 새로 받음 (바뀐 게 없으면 304)
+const DIGEST_SYNC_INTERVAL_MS = 5 * 60 * 1000;
+const DIGEST_STORAGE_KEY = 'whitelistDigest';
+
+let whitelistDigest = null;  // { version, m, k, bits(base64), syncedAt }
+let digestBits = null;       // bits 디코딩 (Uint8Array)
+let digestSyncPromise = null;
+
 // 메시지 리스너
 chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
     if (request.action === 'addChannel') {
@@ -21,6 +31,13 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
         return true; // 비동기 응답
     }
 
+    if (request.action === 'checkChannels') {
+        checkChannelsBatch(request.channelIds || [], request.handles || [])
+            .then(result => sendResponse(result))
+            .catch(error => sendResponse({ success: false, error: error.message }));
+        return true; // 비동기 응답
+    }
+
     if (request.action === 'deleteChannel') {
         deleteChannelFromServer(request.channelId)
             .then(result => sendResponse(result))
@@ -36,6 +53,102 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
     }
 });
 
+/**
+ * 저장된 다이제스트 로드 (서비스 워커가 재시작되면 storage에서 다시 읽음)
+ */
+async function loadDigest() {
+    if (whitelistDigest) return whitelistDigest;
+
+    const stored = await chrome.storage.local.get(DIGEST_STORAGE_KEY);
+    setDigest(stored[DIGEST_STORAGE_KEY] || null);
+    return whitelistDigest;
+}
+
+function setDigest(digest) {
+    whitelistDigest = digest;
+    digestBits = digest ? Uint8Array.from(atob(digest.bits), c => c.charCodeAt(0)) : null;
+}
+
+/**
+ * 서버 다이제스트 동기화
+ *
+ * force가 아니면 DIGEST_SYNC_INTERVAL_MS 안에는 서버에 요청하지 않음.
+ * 동시에 여러 페이지가 불러도 요청은 하나만 보냄.
+ */
+async function syncDigest(force = false) {
+    const digest = await loadDigest();
+    if (!force && digest && Date.now() - digest.syncedAt < DIGEST_SYNC_INTERVAL_MS) {
+        return digest;
+    }
+    if (digestSyncPromise) {
+        return digestSyncPromise;
+    }
+
+    digestSyncPromise = (async () => {
+        try {
+            // 바뀐 게 없으면 서버가 304를 주고 브라우저 HTTP 캐시가 이전 응답을 돌려줌 (ETag)
+            const response = await fetch(`${API_BASE_URL}/api/channels/digest`);
+            const result = await response.json();
+
+            if (result.success) {
+                const fresh = { ...result.data, syncedAt: Date.now() };
+                setDigest(fresh);
+                await chrome.storage.local.set({ [DIGEST_STORAGE_KEY]: fresh });
+            }
+        } catch (error) {
+            // 서버가 꺼져 있으면 기존 다이제스트 그대로 사용
+            console.error('화이트리스트 다이제스트 동기화 실패:', error);
+        } finally {
+            digestSyncPromise = null;
+        }
+        return whitelistDigest;
+    })();
+
+    return digestSyncPromise;
+}
+
+/**
+ * FNV-1a 32비트 (UTF-8 바이트, whitelist_digest.py와 같은 계산)
+ */
+function fnv1a32(bytes, basis) {
+    let h = basis;
+    for (const byte of bytes) {
+        h = Math.imul(h ^ byte, 16777619) >>> 0;
+    }
+    return h;
+}
+
+/**
+ * 다이제스트에 키(채널 ID 또는 @핸들)가 있을 수 있는지 (false면 확실히 미등록)
+ */
+function digestMightContain(key) {
+    const bytes = new TextEncoder().encode(key);
+    const h1 = fnv1a32(bytes, 2166136261);
+    const h2 = (fnv1a32(bytes, 0x5BD1E995) | 1) >>> 0;
+
+    for (let i = 0; i < whitelistDigest.k; i++) {
+        const index = (h1 + i * h2) % whitelistDigest.m;
+        if (!(digestBits[index >> 3] & (1 << (index & 7)))) {
+            return false;
+        }
+    }
+    return true;
+}
+
+function normalizeHandle(handle) {
+    return (handle.startsWith('@') ? handle : '@' + handle).toLowerCase();
+}
+
+/**
+ * 등록/삭제 직후 다이제스트 다시 받기 (확인 결과가 바로 반영되도록)
+ */
+function invalidateDigest() {
+    if (whitelistDigest) {
+        whitelistDigest.syncedAt = 0;
+    }
+    syncDigest(true);
+}
+
 /**
  * Flask API로 채널 추가 요청
  */
@@ -54,6 +167,7 @@ async function addChannelToServer(channelId) {
         const result = await response.json();
 
         if (result.success) {
+            invalidateDigest();
             return {
                 success: true,
                 channelTitle: result.data.channel_title,
@@ -75,15 +189,62 @@ async function addChannelToServer(channelId) {
 }
 
 /**
- * Flask API로 채널 존재 여부 확인
+ * 채널 등록 여부 확인 (다이제스트에 없으면 서버 요청 없이 미등록)
  */
 async function checkChannelExists(channelId) {
+    const result = await checkChannelsBatch([channelId], []);
+    if (!result.success) {
+        return result;
+    }
+
+    const channel = result.channels[channelId] || { exists: false };
+    return {
+        success: true,
+        exists: channel.exists,
+        channelTitle: channel.exists ? channel.channel_title : null
+    };
+}
+
+/**
+ * 여러 채널(ID 또는 @핸들) 등록 여부 확인
+ *
+ * 다이제스트로 로컬에서 걸러내고, 있을 수도 있는 것만 POST /api/channels/check 한 번으로 확인.
+ * 다이제스트를 아직 못 받았으면 전부 서버에 확인
+ */
+async function checkChannelsBatch(channelIds, handles) {
+    const digest = await syncDigest();
+
+    const channels = {};
+    const handleResults = {};
+    const candidateIds = [];
+    const candidateHandles = [];
+
+    for (const channelId of channelIds) {
+        if (!digest || digestMightContain(channelId)) {
+            candidateIds.push(channelId);
+        } else {
+            channels[channelId] = { exists: false };
+        }
+    }
+    for (const handle of handles) {
+        if (!digest || digestMightContain(normalizeHandle(handle))) {
+            candidateHandles.push(handle);
+        } else {
+            handleResults[handle] = { exists: false };
+        }
+    }
+
+    if (candidateIds.length === 0 && candidateHandles.length === 0) {
+        return { success: true, channels, handles: handleResults };
+    }
+
     try {
-        const response = await fetch(`${API_BASE_URL}/api/channels/check/${channelId}`, {
-            method: 'GET',
+        const response = await fetch(`${API_BASE_URL}/api/channels/check`, {
+            method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
-            }
+            },
+            body: JSON.stringify({ channel_ids: candidateIds, handles: candidateHandles })
         });
 
         const result = await response.json();
@@ -91,8 +252,8 @@ async function checkChannelExists(channelId) {
         if (result.success) {
             return {
                 success: true,
-                exists: result.exists,
-                channelTitle: result.channel_title || null
+                channels: { ...channels, ...result.data.channels },
+                handles: { ...handleResults, ...result.data.handles }
             };
         } else {
             return {
@@ -101,11 +262,11 @@ async function checkChannelExists(channelId) {
             };
         }
     } catch (error) {
-        console.error('채널 확인 실패:', error);
-        // 에러 시 exists: false로 처리 (서버 꺼져있어도 버튼은 표시)
+        console.error('채널 일괄 확인 실패:', error);
+        // 있을 수도 있는 후보를 미등록으로 보고하지 않도록 실패로 반환
         return {
-            success: true,
-            exists: false
+            success: false,
+            error: `서버 연결 실패: ${error.message}`
         };
     }
 }
@@ -125,6 +286,7 @@ async function deleteChannelFromServer(channelId) {
         const result = await response.json();
 
         if (result.success) {
+            invalidateDigest();
             return {
                 success: true,
                 message: result.message
@@ -146,6 +308,8 @@ async function deleteChannelFromServer(channelId) {
 
 /**
  * Flask API로 등록된 채널명 리스트 가져오기
+ *
+ * 채널 링크가 없는 관련 영상 카드에서만 사용 (그 외에는 checkChannels)
  */
 async function getChannelNames() {
     try {
@@ -107,7 +107,7 @@ function isSearchPage() {
            window.location.search.includes('search_query=');
 }
 
-// 등록된 채널명 캐시 (소문자로 정규화)
+// 등록된 채널명 캐시 (소문자로 정규화, 채널 링크가 없는 관련 영상 카드용)
 let registeredChannelNames = new Set();
 let channelNamesLoaded = false;
 
@@ -202,76 +202,111 @@ function parseUploadTime(timeText) {
     return 999; // 파싱 실패
 }
 
+// 채널 링크(/@handle 또는 /channel/UC...)에서 확인 키 추출
+function parseChannelLink(href) {
+    if (!href) return null;
+
+    const idMatch = href.match(/\/channel\/(UC[\w-]+)/);
+    if (idMatch) return { channelId: idMatch[1] };
+
+    const handleMatch = href.match(/\/(@[^/?#]+)/);
+    if (handleMatch) return { handle: decodeURIComponent(handleMatch[1]) };
+
+    return null;
+}
+
+// 검색 결과 항목에 체크 마크 추가
+function addSearchResultMark(video) {
+    // #channel-info 안에서 확인 (보이는 영역)
+    const channelInfo = video.querySelector('#channel-info');
+    if (!channelInfo) return false;
+
+    // 이미 마크가 있으면 스킵
+    if (channelInfo.querySelector('.senior-channel-mark')) return false;
+
+    // #channel-info 안의 ytd-channel-name 찾기
+    const visibleChannelName = channelInfo.querySelector('ytd-channel-name');
+    if (!visibleChannelName) return false;
+
+    // 체크 마크 추가
+    const mark = document.createElement('span');
+    mark.className = 'senior-channel-mark';
+    mark.innerHTML = '✅';
+    mark.title = '시니어 채널로 등록됨';
+
+    // ytd-channel-name 바로 다음에 추가 (#channel-info 안)
+    channelInfo.insertBefore(mark, visibleChannelName.nextSibling);
+    return true;
+}
+
 // 검색 결과의 비디오 항목에 마크 추가
 // DOM 구조: YOUTUBE_DOM_STRUCTURE.md > "1. 검색 결과 페이지" 참조
+// 채널명 대신 채널 링크(ID/@핸들)로 확인: 새 항목을 모아 checkChannels 한 번
+// (백그라운드가 다이제스트로 로컬에서 거르고, 있을 수도 있는 것만 서버에 확인)
 function markSearchResults() {
     const videoRenderers = document.querySelectorAll('ytd-video-renderer');
     console.log('[시니어 채널] 검색 결과 비디오 수:', videoRenderers.length);
 
-    let markedCount = 0;
+    const pending = [];
+    const channelIds = new Set();
+    const handles = new Set();
 
     videoRenderers.forEach((video, index) => {
         // 이미 처리된 항목은 스킵
         if (video.dataset.seniorChecked === 'true') return;
         video.dataset.seniorChecked = 'true';
 
-        // ytd-channel-name 요소 찾기
-        const channelNameContainer = video.querySelector('ytd-channel-name');
-        if (!channelNameContainer) {
-            console.warn('[시니어 채널] ytd-channel-name을 찾을 수 없음:', index);
+        // ytd-channel-name 안의 채널 링크 찾기
+        const channelLink = video.querySelector('ytd-channel-name a');
+        const key = parseChannelLink(channelLink && channelLink.getAttribute('href'));
+        if (!key) {
+            console.warn('[시니어 채널] 채널 링크를 찾을 수 없음:', index);
             return;
         }
 
-        // 채널명 텍스트 추출
-        const channelNameElement = channelNameContainer.querySelector('#text');
-        if (!channelNameElement) {
-            console.warn('[시니어 채널] #text를 찾을 수 없음:', index);
-            return;
-        }
-
-        const channelName = channelNameElement.textContent.trim().toLowerCase();
-
         // 첫 3개만 로그 (디버깅)
         if (index < 3) {
-            console.log(`[시니어 채널] 비디오 ${index}: "${channelName}"`);
+            console.log(`[시니어 채널] 비디오 ${index}:`, key);
         }
 
-        // 등록된 채널인지 확인
-        if (registeredChannelNames.has(channelName)) {
-            // #channel-info 안에서 확인 (보이는 영역)
-            const channelInfo = video.querySelector('#channel-info');
-            if (!channelInfo) return;
-
-            // 이미 마크가 있으면 스킵
-            if (channelInfo.querySelector('.senior-channel-mark')) return;
-
-            // #channel-info 안의 ytd-channel-name 찾기
-            const visibleChannelName = channelInfo.querySelector('ytd-channel-name');
-            if (!visibleChannelName) return;
-
-            // 체크 마크 추가
-            const mark = document.createElement('span');
-            mark.className = 'senior-channel-mark';
-            mark.innerHTML = '✅';
-            mark.title = '시니어 채널로 등록됨';
-
-            // ytd-channel-name 바로 다음에 추가 (#channel-info 안)
-            channelInfo.insertBefore(mark, visibleChannelName.nextSibling);
-            markedCount++;
-            console.log('[시니어 채널] 마크 추가:', channelName);
-        }
+        pending.push({ video, key });
+        if (key.channelId) channelIds.add(key.channelId);
+        if (key.handle) handles.add(key.handle);
     });
 
-    console.log(`[시니어 채널] 총 ${markedCount}개 채널에 마크 추가됨`);
+    if (pending.length === 0) return;
+
+    chrome.runtime.sendMessage(
+        { action: 'checkChannels', channelIds: [...channelIds], handles: [...handles] },
+        (response) => {
+            if (!response || !response.success) {
+                // 서버 확인 실패: 다음 갱신 때 다시 확인하도록 처리 표시 해제
+                for (const { video } of pending) {
+                    delete video.dataset.seniorChecked;
+                }
+                return;
+            }
+
+            let markedCount = 0;
+            for (const { video, key } of pending) {
+                const result = key.channelId
+                    ? response.channels[key.channelId]
+                    : response.handles[key.handle];
+
+                if (result && result.exists && addSearchResultMark(video)) {
+                    markedCount++;
+                }
+            }
+
+            console.log(`[시니어 채널] 총 ${markedCount}개 채널에 마크 추가됨`);
+        }
+    );
 }
 
 // 검색 결과 페이지 초기화
 async function initSearchPage() {
     console.log('[시니어 채널] 검색 결과 페이지 초기화');
 
-    // 채널명 로드
-    await loadRegisteredChannels();
-
     // 현재 결과에 마크 추가
     markSearchResults();
 
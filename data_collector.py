@@ -1,10 +1,10 @@
 """
 데이터 수집 및 스냅샷 저장 로직
 """
-import os
 import json
+import time
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 
 # KST (한국 표준시) = UTC+9
 KST = timezone(timedelta(hours=9))
@@ -12,6 +12,14 @@ KST = timezone(timedelta(hours=9))
 import youtube_api
 import database
 import view_score_calculator
+import senior_classifier
+import weight_trainer
+import labeling_queue
+import rollups
+import video_trends
+import snapshot_archive
+import metrics
+import channel_schedule
 
 
 def collect_trending_videos(
@@ -42,98 +50,141 @@ def collect_trending_videos(
         'categories': {}
     }
 
-    # 스냅샷 저장 디렉토리 생성
-    snapshot_dir = f'data/{snapshot_date}'
-    os.makedirs(snapshot_dir, exist_ok=True)
+    # 스냅샷 아카이브 (저장할 때마다 바로 압축 기록)
+    with snapshot_archive.SnapshotArchiveWriter(snapshot_date, 'category') as archive:
+        started = time.perf_counter()
 
-    all_videos = []
+        # SeniorScore 가중치 (학습된 활성 버전, 없으면 기본값)
+        senior_weights = weight_trainer.get_active_weights('senior')
+        # 최신성 기준 시각: 스냅샷 날짜 (/api/videos 재계산과 같은 값)
+        reference_time = view_score_calculator.snapshot_reference_time(snapshot_date)
+        decision_model = labeling_queue.get_decision_model()
 
-    for category_id in category_ids:
-        print(f"\n📊 카테고리 {category_id} 수집 중...")
+        # 이번 실행에서 조회한 채널 정보 (카테고리끼리 겹치는 채널은 한 번만)
+        channel_infos: Dict[str, Dict[str, Any]] = {}
 
-        # 인기 영상 가져오기
-        videos = youtube_api.get_trending_videos(
-            category_id=category_id,
-            max_results=max_results
-        )
-
-        if not videos:
-            print(f"⚠️  카테고리 {category_id}: 결과 없음")
-            stats['categories'][category_id] = {'collected': 0, 'new': 0, 'duplicates': 0}
-            continue
-
-        category_stats = {'collected': len(videos), 'new': 0, 'duplicates': 0}
-
-        for video in videos:
-            video_id = video['video_id']
-
-            # 중복 체크: 같은 날짜, 같은 카테고리에 이미 수집되었는지
-            if database.check_snapshot_exists(video_id, snapshot_date, category_id):
-                print(f"  ⏭️  중복 스킵: {video['title'][:50]}")
-                category_stats['duplicates'] += 1
-                stats['duplicate_skipped'] += 1
-                continue
+        for category_id in category_ids:
+            print(f"\n📊 카테고리 {category_id} 수집 중...")
 
-            # 1. 비디오 정보 저장 (videos 테이블)
-            database.insert_video(video)
-
-            # 2. 스냅샷 저장 (snapshots 테이블)
-            snapshot_data = {
-                'video_id': video_id,
-                'category_id': category_id,
-                'snapshot_date': snapshot_date,
-                'view_count': video['view_count'],
-                'like_count': video['like_count'],
-                'comment_count': video['comment_count'],
-                'rank_position': video['rank_position']
-            }
-            snapshot_id = database.insert_snapshot(snapshot_data)
-
-            if snapshot_id is None:
-                # 중복 (이미 존재)
-                category_stats['duplicates'] += 1
-                stats['duplicate_skipped'] += 1
-                continue
-
-            # 3. 채널 정보 가져오기 및 저장 (ViewScore 계산에 필요)
-            channel_info_list = youtube_api.get_channel_info([video['channel_id']])
-            channel_info = channel_info_list[0] if channel_info_list else None
-            if channel_info:
-                database.upsert_channel(channel_info)
-
-            # 4. ViewScore 계산 (NEW)
-            view_score_result = view_score_calculator.calculate_view_score(
-                video_data=video,
-                snapshot_data=snapshot_data,
-                channel_data=channel_info
+            # 인기 영상 가져오기
+            videos = youtube_api.get_trending_videos(
+                category_id=category_id,
+                max_results=max_results
             )
-            view_score_result['snapshot_id'] = snapshot_id
-
-            # 5. ViewScore 저장
-            database.insert_view_score(view_score_result)
 
-            # 수집 결과에 추가
-            video['view_score'] = view_score_result
-            all_videos.append(video)
-
-            category_stats['new'] += 1
-            stats['new_videos'] += 1
+            if not videos:
+                print(f"⚠️  카테고리 {category_id}: 결과 없음")
+                stats['categories'][category_id] = {'collected': 0, 'new': 0, 'duplicates': 0}
+                continue
 
-            print(f"  ✓ {video['title'][:50]} (ViewScore: {view_score_result['score']:.1f})")
+            category_stats = {'collected': len(videos), 'new': 0, 'duplicates': 0}
+
+            # 채널 정보: 이번 실행에서 아직 안 받은 채널만 50개씩 묶어서 조회
+            # channels(현재 값) + channel_snapshots(날짜별 구독자 수)에 한 번에 저장
+            new_channel_ids = list(dict.fromkeys(
+                video['channel_id'] for video in videos if video['channel_id'] not in channel_infos
+            ))
+            fetched = youtube_api.get_channel_info(new_channel_ids)
+            database.upsert_channels_with_snapshots(snapshot_date, fetched)
+            channel_infos.update({info['channel_id']: info for info in fetched})
+
+            for video in videos:
+                video_id = video['video_id']
+
+                # 중복 체크: 같은 날짜, 같은 카테고리에 이미 수집되었는지
+                if database.check_snapshot_exists(video_id, snapshot_date, category_id):
+                    print(f"  ⏭️  중복 스킵: {video['title'][:50]}")
+                    category_stats['duplicates'] += 1
+                    stats['duplicate_skipped'] += 1
+                    continue
+
+                # 1. 비디오 정보 저장 (videos 테이블)
+                database.insert_video(video)
+
+                # 2. 스냅샷 저장 (snapshots 테이블)
+                snapshot_data = {
+                    'video_id': video_id,
+                    'category_id': category_id,
+                    'snapshot_date': snapshot_date,
+                    'view_count': video['view_count'],
+                    'like_count': video['like_count'],
+                    'comment_count': video['comment_count'],
+                    'rank_position': video['rank_position']
+                }
+                snapshot_id = database.insert_snapshot(snapshot_data)
+
+                if snapshot_id is None:
+                    # 중복 (이미 존재)
+                    category_stats['duplicates'] += 1
+                    stats['duplicate_skipped'] += 1
+                    continue
+
+                # 3. 채널 정보 (ViewScore 계산에 필요, 위에서 일괄 조회)
+                channel_info = channel_infos.get(video['channel_id'])
+
+                # 4. ViewScore 계산 (NEW)
+                view_score_result = view_score_calculator.calculate_view_score(
+                    video_data=video,
+                    snapshot_data=snapshot_data,
+                    channel_data=channel_info,
+                    reference_time=reference_time
+                )
+                view_score_result['snapshot_id'] = snapshot_id
+
+                # 5. ViewScore 저장
+                view_score_id = database.insert_view_score(view_score_result)
+
+                # 6. SeniorScore 계산 및 저장 (키워드 사전 버전 기록)
+                senior_score_result = senior_classifier.calculate_senior_score(video, weights=senior_weights)
+                senior_score_result['snapshot_id'] = snapshot_id
+                senior_score_id = database.insert_senior_score(senior_score_result)
+
+                # 7. 라벨링 큐 갱신 (라벨 안 된 영상만)
+                labeling_queue.enqueue(
+                    video, snapshot_date,
+                    view_score_id, view_score_result['score'],
+                    senior_score_id, senior_score_result,
+                    decision_model=decision_model
+                )
+
+                # 수집 결과에 추가
+                video['view_score'] = view_score_result
+                video['senior_score'] = senior_score_result
+                archive.write(video, category_id)
+
+                category_stats['new'] += 1
+                stats['new_videos'] += 1
+
+                print(f"  ✓ {video['title'][:50]} (ViewScore: {view_score_result['score']:.1f})")
+
+            stats['categories'][category_id] = category_stats
+            stats['total_videos'] += category_stats['collected']
+
+    # 일별 롤업 갱신 (해당 날짜만)
+    rollups.refresh_daily_rollups(snapshot_date)
+    video_trends.refresh_trends(snapshot_date)
+
+    _record_collection_metrics('category', started, stats)
+
+    print(f"\n✅ 수집 완료: {archive.path}")
+    print(f"   총 {stats['total_videos']}개, 신규 {stats['new_videos']}개, 중복 스킵 {stats['duplicate_skipped']}개")
 
-        stats['categories'][category_id] = category_stats
-        stats['total_videos'] += category_stats['collected']
+    return stats
 
-    # JSONL 파일로 저장 (날짜별 스냅샷)
-    snapshot_file = f'{snapshot_dir}/videos.jsonl'
-    with open(snapshot_file, 'a', encoding='utf-8') as f:
-        for video in all_videos:
-            f.write(json.dumps(video, ensure_ascii=False) + '\n')
 
-    print(f"\n✅ 수집 완료: {snapshot_file}")
-    print(f"   총 {stats['total_videos']}개, 신규 {stats['new_videos']}개, 중복 스킵 {stats['duplicate_skipped']}개")
+def _record_collection_metrics(source: str, started: float, stats: Dict[str, Any]) -> None:
+    """
+    수집 실행 시간/횟수/완료 시각, 저장/중복 영상 수 메트릭 기록
 
-    return stats
+    수집은 보통 웹 워커와 별도 프로세스(cron)에서 돌므로 프로세스 메모리가 아니라
+    DB(stats_counters)에 누적하고, /metrics가 스크레이프 시점에 읽는다.
+    """
+    metrics.record_collection(
+        source,
+        duration=time.perf_counter() - started,
+        ingested=stats['new_videos'],
+        duplicates=stats['duplicate_skipped']
+    )
 
 
 def calculate_delta_views_for_date(snapshot_date: str, days: int = 14, data_source: str = 'all') -> List[Dict[str, Any]]:
@@ -148,12 +199,12 @@ def calculate_delta_views_for_date(snapshot_date: str, days: int = 14, data_sour
     Returns:
         Δviews가 포함된 비디오 리스트
     """
-    snapshots = database.get_snapshots_by_date_and_source(snapshot_date, data_source)
+    snapshots = database.get_snapshots_by_date_and_source(snapshot_date, data_source, dedupe=True)
 
     results = []
     for snapshot in snapshots:
         video_id = snapshot['video_id']
-        delta_views = database.get_delta_views(video_id, days)
+        delta_views = database.get_delta_views(video_id, days, as_of_date=snapshot_date)
 
         snapshot['delta_views_14d'] = delta_views if delta_views is not None else 0
         results.append(snapshot)
@@ -163,27 +214,18 @@ def calculate_delta_views_for_date(snapshot_date: str, days: int = 14, data_sour
 
 
 
-def load_snapshot_from_file(snapshot_date: str) -> List[Dict[str, Any]]:
+def load_snapshot_from_file(snapshot_date: str, source: str = 'category') -> Iterator[Dict[str, Any]]:
     """
-    파일에서 스냅샷 불러오기 (API 호출 없이)
+    파일에서 스냅샷 불러오기 (API 호출 없이, 제너레이터)
 
     Args:
         snapshot_date: 날짜 (YYYY-MM-DD)
+        source: 'category', 'channel', 'all'
 
     Returns:
-        비디오 리스트
+        비디오 dict 제너레이터 (아카이브 또는 이전 형식 JSONL)
     """
-    snapshot_file = f'data/{snapshot_date}/videos.jsonl'
-
-    if not os.path.exists(snapshot_file):
-        return []
-
-    videos = []
-    with open(snapshot_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            videos.append(json.loads(line))
-
-    return videos
+    return snapshot_archive.iter_snapshots(snapshot_date, source)
 
 
 def collect_from_channels(
@@ -191,7 +233,9 @@ def collect_from_channels(
     snapshot_date: str = None,
     max_results_per_channel: int = 50,
     days: int = 7,
-    skip_today_collected: bool = False
+    skip_today_collected: bool = False,
+    adaptive: bool = False,
+    max_channels: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     등록된 채널들의 최근 영상 수집
@@ -202,6 +246,8 @@ def collect_from_channels(
         max_results_per_channel: 채널당 최대 수집 수
         days: 최근 N일 이내 영상
         skip_today_collected: 오늘 이미 수집한 채널 건너뛰기 (쿼터 절약)
+        adaptive: 채널별 수집 주기(channel_schedule.py)상 예정 시각이 지난 채널만, 많이 밀린 순으로
+        max_channels: adaptive일 때 이번에 수집할 최대 채널 수 (쿼터 예산, 채널당 3)
 
     Returns:
         수집 결과 통계
@@ -216,128 +262,193 @@ def collect_from_channels(
         'new_videos': 0,
         'duplicate_skipped': 0,
         'channels_skipped': 0,
+        'channels_not_due': 0,
         'channels': {}
     }
 
-    # 스냅샷 저장 디렉토리 생성
-    snapshot_dir = f'data/{snapshot_date}'
-    os.makedirs(snapshot_dir, exist_ok=True)
+    # 다음 수집 시각의 기준: 채널별 처리 종료 시각이 아니라 이번 실행 시작 시각
+    run_started_at = datetime.now(timezone.utc)
 
-    all_videos = []
-
-    for channel_id in channel_ids:
-        # 오늘 이미 수집한 채널인지 확인 (쿼터 절약)
-        if skip_today_collected and database.check_channel_collected_today(channel_id):
-            print(f"\n⏭️  채널 {channel_id} 스킵 (오늘 이미 수집 완료)")
-            stats['channels_skipped'] += 1
-            stats['channels'][channel_id] = {'collected': 0, 'new': 0, 'duplicates': 0, 'skipped': True}
-            continue
-
-        print(f"\n📺 채널 {channel_id} 수집 중...")
-
-        # 채널의 최근 영상 가져오기
-        videos = youtube_api.get_channel_recent_videos(
-            channel_id=channel_id,
-            max_results=max_results_per_channel,
-            days=days
+    # 적응형 주기: 예정 시각이 지난 채널만 우선순위 순으로
+    if adaptive:
+        due_channel_ids = channel_schedule.select_due_channels(
+            channel_ids, now=run_started_at, max_channels=max_channels
         )
-
-        if not videos:
-            print(f"⚠️  채널 {channel_id}: 결과 없음")
-            stats['channels'][channel_id] = {'collected': 0, 'new': 0, 'duplicates': 0}
-            continue
-
-        channel_stats = {'collected': len(videos), 'new': 0, 'duplicates': 0}
-
-        for video in videos:
-            video_id = video['video_id']
-
-            # 중복 체크: 같은 날짜에 이미 수집되었는지
-            # 채널 기반 수집은 category_id를 'channel'로 표시
-            if database.check_snapshot_exists(video_id, snapshot_date, f'channel:{channel_id}'):
-                print(f"  ⏭️  중복 스킵: {video['title'][:50]}")
-                channel_stats['duplicates'] += 1
-                stats['duplicate_skipped'] += 1
+        stats['channels_not_due'] = len(channel_ids) - len(due_channel_ids)
+        channel_ids = due_channel_ids
+        print(f"📅 수집 예정 채널 {len(channel_ids)}개 (예정 전 {stats['channels_not_due']}개 건너뜀)")
+
+    # 채널 정보 (구독자 수): 50개씩 묶어서 조회 → channels + channel_snapshots 일괄 저장
+    fetched = youtube_api.get_channel_info(channel_ids)
+    database.upsert_channels_with_snapshots(snapshot_date, fetched)
+    channel_infos = {info['channel_id']: info for info in fetched}
+
+    # 스냅샷 아카이브 (저장할 때마다 바로 압축 기록)
+    with snapshot_archive.SnapshotArchiveWriter(snapshot_date, 'channel') as archive:
+        started = time.perf_counter()
+
+        # SeniorScore 가중치 (학습된 활성 버전, 없으면 기본값)
+        senior_weights = weight_trainer.get_active_weights('senior')
+        # 최신성 기준 시각: 스냅샷 날짜 (/api/videos 재계산과 같은 값)
+        reference_time = view_score_calculator.snapshot_reference_time(snapshot_date)
+        decision_model = labeling_queue.get_decision_model()
+
+        for channel_id in channel_ids:
+            # 오늘 이미 수집한 채널인지 확인 (쿼터 절약)
+            if skip_today_collected and database.check_channel_collected_today(channel_id):
+                print(f"\n⏭️  채널 {channel_id} 스킵 (오늘 이미 수집 완료)")
+                stats['channels_skipped'] += 1
+                stats['channels'][channel_id] = {'collected': 0, 'new': 0, 'duplicates': 0, 'skipped': True}
                 continue
 
-            # 1. 비디오 정보 저장 (videos 테이블)
-            database.insert_video(video)
-
-            # 2. 스냅샷 저장 (snapshots 테이블)
-            snapshot_data = {
-                'video_id': video_id,
-                'category_id': f'channel:{channel_id}',  # 채널 기반임을 표시
-                'snapshot_date': snapshot_date,
-                'view_count': video['view_count'],
-                'like_count': video['like_count'],
-                'comment_count': video['comment_count'],
-                'rank_position': video['rank_position']
-            }
-            snapshot_id = database.insert_snapshot(snapshot_data)
-
-            if snapshot_id is None:
-                # 중복 (이미 존재)
-                channel_stats['duplicates'] += 1
-                stats['duplicate_skipped'] += 1
-                continue
+            print(f"\n📺 채널 {channel_id} 수집 중...")
 
-            # 3. 채널 정보 조회 (ViewScore 계산에 필요)
-            # 이미 channels 테이블에 있을 가능성이 높으므로 DB에서 먼저 조회
-            channel_info = database.get_channel_by_id(channel_id)
-            if not channel_info:
-                # DB에 없으면 API 호출
-                channel_info_list = youtube_api.get_channel_info([channel_id])
-                channel_info = channel_info_list[0] if channel_info_list else None
-                if channel_info:
-                    database.upsert_channel(channel_info)
-
-            # 4. ViewScore 계산 (NEW)
-            view_score_result = view_score_calculator.calculate_view_score(
-                video_data=video,
-                snapshot_data=snapshot_data,
-                channel_data=channel_info
+            # 채널의 최근 영상 가져오기
+            videos = youtube_api.get_channel_recent_videos(
+                channel_id=channel_id,
+                max_results=max_results_per_channel,
+                days=days
             )
-            view_score_result['snapshot_id'] = snapshot_id
-
-            # 5. ViewScore 저장
-            database.insert_view_score(view_score_result)
-
-            # 수집 결과에 추가
-            video['view_score'] = view_score_result
-            all_videos.append(video)
 
-            channel_stats['new'] += 1
-            stats['new_videos'] += 1
+            if not videos:
+                print(f"⚠️  채널 {channel_id}: 결과 없음")
+                stats['channels'][channel_id] = {'collected': 0, 'new': 0, 'duplicates': 0}
+                channel_schedule.update_schedule(channel_id, collection_days=days, collected_at=run_started_at)
+                continue
 
-            print(f"  ✓ {video['title'][:50]} (ViewScore: {view_score_result['score']:.1f})")
+            channel_stats = {'collected': len(videos), 'new': 0, 'duplicates': 0}
+
+            for video in videos:
+                video_id = video['video_id']
+
+                # 중복 체크: 같은 날짜에 이미 수집되었는지
+                # 채널 기반 수집은 category_id를 'channel'로 표시
+                if database.check_snapshot_exists(video_id, snapshot_date, f'channel:{channel_id}'):
+                    print(f"  ⏭️  중복 스킵: {video['title'][:50]}")
+                    channel_stats['duplicates'] += 1
+                    stats['duplicate_skipped'] += 1
+                    continue
+
+                # 1. 비디오 정보 저장 (videos 테이블)
+                database.insert_video(video)
+
+                # 2. 스냅샷 저장 (snapshots 테이블)
+                snapshot_data = {
+                    'video_id': video_id,
+                    'category_id': f'channel:{channel_id}',  # 채널 기반임을 표시
+                    'snapshot_date': snapshot_date,
+                    'view_count': video['view_count'],
+                    'like_count': video['like_count'],
+                    'comment_count': video['comment_count'],
+                    'rank_position': video['rank_position']
+                }
+                snapshot_id = database.insert_snapshot(snapshot_data)
+
+                if snapshot_id is None:
+                    # 중복 (이미 존재)
+                    channel_stats['duplicates'] += 1
+                    stats['duplicate_skipped'] += 1
+                    continue
+
+                # 3. 채널 정보 (ViewScore 계산에 필요, 위에서 일괄 조회, 실패했으면 DB 값)
+                channel_info = channel_infos.get(channel_id) or database.get_channel_by_id(channel_id)
+
+                # 4. ViewScore 계산 (NEW)
+                view_score_result = view_score_calculator.calculate_view_score(
+                    video_data=video,
+                    snapshot_data=snapshot_data,
+                    channel_data=channel_info,
+                    reference_time=reference_time
+                )
+                view_score_result['snapshot_id'] = snapshot_id
+
+                # 5. ViewScore 저장
+                view_score_id = database.insert_view_score(view_score_result)
+
+                # 6. SeniorScore 계산 및 저장 (키워드 사전 버전 기록)
+                senior_score_result = senior_classifier.calculate_senior_score(video, weights=senior_weights)
+                senior_score_result['snapshot_id'] = snapshot_id
+                senior_score_id = database.insert_senior_score(senior_score_result)
+
+                # 7. 라벨링 큐 갱신 (라벨 안 된 영상만)
+                labeling_queue.enqueue(
+                    video, snapshot_date,
+                    view_score_id, view_score_result['score'],
+                    senior_score_id, senior_score_result,
+                    decision_model=decision_model
+                )
+
+                # 수집 결과에 추가
+                video['view_score'] = view_score_result
+                video['senior_score'] = senior_score_result
+                archive.write(video, f'channel:{channel_id}')
+
+                channel_stats['new'] += 1
+                stats['new_videos'] += 1
+
+                print(f"  ✓ {video['title'][:50]} (ViewScore: {view_score_result['score']:.1f})")
+
+            stats['channels'][channel_id] = channel_stats
+            stats['total_videos'] += channel_stats['collected']
+
+            # 채널 수집 날짜 업데이트 (오늘로 갱신)
+            database.update_channel_collected_date(channel_id)
+
+            # 업로드 빈도/조회수 증가 속도 다시 추정 → 다음 수집 시각
+            schedule = channel_schedule.update_schedule(channel_id, collection_days=days, collected_at=run_started_at)
+            channel_stats['next_collect_at'] = schedule['next_collect_at']
+
+    # 일별 롤업 갱신 (해당 날짜만)
+    rollups.refresh_daily_rollups(snapshot_date)
+    video_trends.refresh_trends(snapshot_date)
+
+    _record_collection_metrics('channel', started, stats)
+
+    print(f"\n✅ 수집 완료: {archive.path}")
+    print(f"   총 {stats['total_videos']}개, 신규 {stats['new_videos']}개, 중복 스킵 {stats['duplicate_skipped']}개")
 
-        stats['channels'][channel_id] = channel_stats
-        stats['total_videos'] += channel_stats['collected']
+    return stats
 
-        # 채널 수집 날짜 업데이트 (오늘로 갱신)
-        database.update_channel_collected_date(channel_id)
 
-    # JSONL 파일로 저장 (날짜별 스냅샷)
-    snapshot_file = f'{snapshot_dir}/videos_channels.jsonl'
-    with open(snapshot_file, 'a', encoding='utf-8') as f:
-        for video in all_videos:
-            f.write(json.dumps(video, ensure_ascii=False) + '\n')
+if __name__ == '__main__':
+    # 수집 작업 CLI (웹 워커와 별도 프로세스로 실행, cron 등)
+    import argparse
 
-    print(f"\n✅ 수집 완료: {snapshot_file}")
-    print(f"   총 {stats['total_videos']}개, 신규 {stats['new_videos']}개, 중복 스킵 {stats['duplicate_skipped']}개")
+    parser = argparse.ArgumentParser(description='인기 영상/채널 영상 수집')
+    subparsers = parser.add_subparsers(dest='command', required=True)
 
-    return stats
+    category_parser = subparsers.add_parser('categories', help='카테고리 인기 영상 수집')
+    category_parser.add_argument('category_ids', nargs='+', help='카테고리 ID (예: 10 22)')
+    category_parser.add_argument('--max-results', type=int, default=50, help='카테고리당 최대 수집 수')
 
+    channel_parser = subparsers.add_parser('channels', help='화이트리스트 채널 최근 영상 수집')
+    channel_parser.add_argument('--max-results', type=int, default=50, help='채널당 최대 수집 수')
+    channel_parser.add_argument('--days', type=int, default=7, help='최근 N일 이내 영상')
+    channel_parser.add_argument('--skip-today', action='store_true', help='오늘 이미 수집한 채널 건너뛰기')
+    channel_parser.add_argument('--adaptive', action='store_true', help='채널별 수집 주기상 예정 시각이 지난 채널만')
+    channel_parser.add_argument('--max-channels', type=int, default=None, help='--adaptive일 때 최대 채널 수 (쿼터 예산)')
 
-if __name__ == '__main__':
-    # 테스트: 카테고리 10 (Music) 수집
-    print("=== 데이터 수집 테스트 ===")
+    args = parser.parse_args()
     database.init_database()
 
-    stats = collect_trending_videos(
-        category_ids=['10'],
-        max_results=10
-    )
+    if args.command == 'categories':
+        stats = collect_trending_videos(
+            category_ids=args.category_ids,
+            max_results=args.max_results
+        )
+    else:
+        channel_ids = database.get_whitelist_channel_ids()
+        if not channel_ids:
+            print("⚠️  등록된 채널이 없습니다.")
+            raise SystemExit(1)
+        stats = collect_from_channels(
+            channel_ids=channel_ids,
+            max_results_per_channel=args.max_results,
+            days=args.days,
+            skip_today_collected=args.skip_today,
+            adaptive=args.adaptive,
+            max_channels=args.max_channels
+        )
 
     print("\n=== 수집 통계 ===")
     print(json.dumps(stats, indent=2, ensure_ascii=False))
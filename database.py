@@ -1,29 +1,72 @@
 """
 데이터베이스 스키마 및 초기화
 """
+import os
 import sqlite3
 import json
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+import profiling
+import video_search
 
 # KST (한국 표준시) = UTC+9
 KST = timezone(timedelta(hours=9))
 
 DATABASE_PATH = 'youtube_senior_trends.db'
 
+# 다른 연결(다른 워커/수집 프로세스)이 쓰기 잠금을 잡고 있을 때 기다리는 시간 (초)
+BUSY_TIMEOUT_SECONDS = float(os.getenv('SQLITE_BUSY_TIMEOUT', '30'))
+
+
+# 데이터 버전 → 버전을 올리는 테이블 (트리거로 유지)
+# data_version: 수집/재생/점수 재계산/라벨/가중치 변경, channels_version: 채널 추가/수정/삭제
+DATA_VERSION_TABLES = {
+    'data_version': ['videos', 'snapshots', 'view_scores', 'senior_scores', 'labels', 'weight_versions', 'channel_snapshots',
+                     'video_trends'],
+    'channels_version': ['channels'],
+}
+
+# ISO 8601 업로드 시각 → epoch 초 (SQLite 날짜 함수, view_score_calculator.parse_published_at과 같은 값)
+PUBLISHED_AT_EPOCH_SQL = "CAST(strftime('%s', {}) AS INTEGER)"
+
+# 태그 정규화 (tags.name, 저장·백필·검색 모두 SQL에서 같은 식으로)
+TAG_NAME_SQL = "lower(trim({}))"
+
 
 def get_connection():
-    """데이터베이스 연결 반환"""
-    conn = sqlite3.connect(DATABASE_PATH)
+    """
+    데이터베이스 연결 반환
+
+    여러 프로세스(웹 워커, 수집 CLI)가 같은 DB를 쓰므로
+    잠금 대기(busy timeout)를 두고, WAL 모드(init_database에서 설정)에서는 synchronous=NORMAL
+    """
+    conn = sqlite3.connect(
+        DATABASE_PATH,
+        timeout=BUSY_TIMEOUT_SECONDS,
+        **profiling.connect_kwargs()  # PROFILING_ENABLED=1이면 느린 SQL 로그
+    )
     conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 결과 반환
+    conn.execute("PRAGMA synchronous = NORMAL")  # WAL에서는 커밋마다 fsync하지 않아도 안전 (체크포인트 때 동기화)
     return conn
 
 
+def _add_column_if_missing(cursor, table: str, column: str, definition: str) -> None:
+    """기존 DB 호환: 컬럼이 없으면 ALTER TABLE로 추가"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    columns = [row['name'] for row in cursor.fetchall()]
+    if column not in columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
 def init_database():
     """데이터베이스 초기화 - 모든 테이블 생성"""
     conn = get_connection()
     cursor = conn.cursor()
 
+    # WAL: 읽기가 쓰기를 막지 않음 (워커 여러 개가 읽는 동안 수집이 씀), DB 파일에 저장되는 설정
+    cursor.execute("PRAGMA journal_mode = WAL")
+
     # 1. videos 테이블: 비디오 기본 정보
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS videos (
@@ -40,6 +83,12 @@ def init_database():
             created_at TEXT DEFAULT CURRENT_TIMESTAMP
         )
     """)
+    # 업로드 시각 epoch 초 (UTC), 저장할 때 한 번만 파싱 → 최신성 점수 계산 시 문자열 파싱 없음
+    _add_column_if_missing(cursor, 'videos', 'published_at_epoch', 'INTEGER')
+    cursor.execute(f"""
+        UPDATE videos SET published_at_epoch = {PUBLISHED_AT_EPOCH_SQL.format('published_at')}
+        WHERE published_at_epoch IS NULL AND published_at IS NOT NULL AND published_at != ''
+    """)
 
     # 2. snapshots 테이블: 일별 스냅샷 (같은 비디오가 여러 날짜에 수집)
     cursor.execute("""
@@ -57,6 +106,8 @@ def init_database():
             UNIQUE(video_id, snapshot_date, category_id)  -- 중복 방지
         )
     """)
+    # 보존 기간 이전 행은 주 단위로 압축됨 (snapshot_retention.py)
+    _add_column_if_missing(cursor, 'snapshots', 'resolution', "TEXT DEFAULT 'daily'")
 
 
     # 3.5. view_scores 테이블: ViewScore 계산 결과 (NEW)
@@ -88,6 +139,30 @@ def init_database():
         )
     """)
 
+    # 3.6. senior_scores 테이블: SeniorScore 계산 결과 (사전 버전 기록)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS senior_scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            video_id TEXT NOT NULL,
+            snapshot_id INTEGER,
+            score REAL NOT NULL,
+            keyword_score REAL DEFAULT 0,
+            genre_score REAL DEFAULT 0,
+            comment_score REAL DEFAULT 0,
+            channel_score REAL DEFAULT 0,
+            length_score REAL DEFAULT 0,
+            zgen_penalty REAL DEFAULT 0,
+            highlights TEXT,  -- JSON: 매칭된 키워드, 근거 등
+            dictionary_version INTEGER,  -- 계산에 사용한 키워드 사전 버전
+            calculated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (video_id) REFERENCES videos(video_id),
+            FOREIGN KEY (snapshot_id) REFERENCES snapshots(id)
+        )
+    """)
+    # 이전 스키마의 senior_scores에는 없던 컬럼
+    _add_column_if_missing(cursor, 'senior_scores', 'zgen_penalty', 'REAL DEFAULT 0')
+    _add_column_if_missing(cursor, 'senior_scores', 'dictionary_version', 'INTEGER')
+
     # 4. labels 테이블: 사람이 라벨링한 결과
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS labels (
@@ -114,30 +189,374 @@ def init_database():
             updated_at TEXT DEFAULT CURRENT_TIMESTAMP
         )
     """)
+    _add_column_if_missing(cursor, 'channels', 'handle', 'TEXT')  # '@handle' (소문자)
+    _add_column_if_missing(cursor, 'channels', 'whitelist_version', 'INTEGER DEFAULT 0')  # 화이트리스트 변경 버전 (델타 동기화)
+    # 적응형 수집 주기 (channel_schedule.py)
+    _add_column_if_missing(cursor, 'channels', 'upload_rate', 'REAL')  # 업로드 빈도 추정 (영상/일)
+    _add_column_if_missing(cursor, 'channels', 'view_velocity', 'REAL')  # 최근 영상 조회수 일 상대 증가율
+    _add_column_if_missing(cursor, 'channels', 'collect_interval_hours', 'REAL')  # 수집 간격
+    _add_column_if_missing(cursor, 'channels', 'next_collect_at', 'TEXT')  # 다음 수집 시각 (UTC)
+
+    # 6. keyword_dictionary 테이블: SeniorScore 키워드 사전 (핫 리로드)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS keyword_dictionary (
+            dict_name TEXT NOT NULL,  -- senior_keywords, trot_artists, ...
+            term TEXT NOT NULL,  -- 키워드 (채널 사전은 channel_id)
+            weight REAL NOT NULL DEFAULT 1.0,
+            version INTEGER NOT NULL,  -- 마지막으로 바뀐 사전 버전
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (dict_name, term)
+        )
+    """)
+
+    # 7. dictionary_versions 테이블: 사전 변경 이력 (버전별 바뀐 용어)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS dictionary_versions (
+            version INTEGER PRIMARY KEY AUTOINCREMENT,
+            dict_name TEXT NOT NULL,  -- '*'는 전체 (시드)
+            changed_terms TEXT,  -- JSON 배열
+            note TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # 8. weight_versions 테이블: 라벨로 학습한 가중치 버전 (weight_trainer)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS weight_versions (
+            version INTEGER PRIMARY KEY AUTOINCREMENT,
+            model TEXT NOT NULL,  -- 'view' (ViewScore) 또는 'senior' (SeniorScore)
+            weights TEXT NOT NULL,  -- JSON: {'view': 1.2, ...}
+            metrics TEXT,  -- JSON: 정확도, 정밀도, 계수 등
+            n_samples INTEGER,
+            n_positive INTEGER,
+            is_active INTEGER DEFAULT 0,
+            note TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # 9. labeling_queue 테이블: 라벨링 대기열 (수집 시 증분 갱신, 영상당 1행)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS labeling_queue (
+            video_id TEXT PRIMARY KEY,
+            channel_id TEXT,
+            snapshot_date TEXT,  -- 마지막으로 수집된 날짜
+            view_score_id INTEGER,
+            view_score REAL,
+            senior_score_id INTEGER,
+            senior_score REAL,
+            margin REAL,  -- 결정 경계까지의 거리 (작을수록 불확실)
+            enqueued_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (video_id) REFERENCES videos(video_id)
+        )
+    """)
+
+    # 10. stats_counters 테이블: 전체 통계 카운터 (트리거로 유지, /api/stats O(1))
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS stats_counters (
+            name TEXT PRIMARY KEY,  -- total_videos, total_snapshots, total_labels, latest_snapshot_date, data_version, channels_version, collector:* (metrics.py)
+            value INTEGER,
+            text_value TEXT
+        )
+    """)
+
+    # 11. daily_rollups 테이블: 날짜 × 데이터 소스 × (카테고리|채널) 일별 집계 (rollups.py)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS daily_rollups (
+            rollup_date TEXT NOT NULL,  -- YYYY-MM-DD
+            source TEXT NOT NULL,  -- 'category' (인기 영상) 또는 'channel' (채널 기반)
+            dimension TEXT NOT NULL,  -- 'category' 또는 'channel'
+            dim_key TEXT NOT NULL,  -- 카테고리 ID 또는 채널 ID
+            video_count INTEGER DEFAULT 0,
+            total_views INTEGER DEFAULT 0,
+            delta_views INTEGER DEFAULT 0,  -- 직전 스냅샷 대비 조회수 증가 합계
+            score_p50 REAL,  -- ViewScore 분위수
+            score_p90 REAL,
+            score_max REAL,
+            senior_p50 REAL,  -- SeniorScore 분위수
+            senior_p90 REAL,
+            PRIMARY KEY (rollup_date, source, dimension, dim_key)
+        )
+    """)
+
+    # 12. export_state 테이블: Parquet 증분 내보내기 위치 (parquet_export.py)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS export_state (
+            dataset TEXT PRIMARY KEY,  -- 'snapshots' (snapshots.id) 또는 'videos' (videos.rowid)
+            last_id INTEGER NOT NULL DEFAULT 0,  -- 마지막으로 내보낸 ID
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # 13. channel_snapshots 테이블: 채널 통계 시계열 (수집 날짜별 구독자 수)
+    # ViewScore는 스냅샷 날짜 기준 구독자 수를 쓰므로(as-of 조회) 과거 날짜 재계산이 재현 가능
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS channel_snapshots (
+            channel_id TEXT NOT NULL,
+            snapshot_date TEXT NOT NULL,  -- YYYY-MM-DD (KST)
+            subscriber_count INTEGER,
+            view_count INTEGER,
+            video_count INTEGER,
+            PRIMARY KEY (channel_id, snapshot_date)  -- as-of 조회 인덱스
+        ) WITHOUT ROWID
+    """)
+    # 도입 전 DB: 현재 channels 값을 마지막 수집 날짜의 스냅샷으로 1회 이관
+    cursor.execute("""
+        INSERT OR IGNORE INTO channel_snapshots (channel_id, snapshot_date, subscriber_count)
+        SELECT channel_id, COALESCE(last_collected_date, date(updated_at)), subscriber_count
+        FROM channels
+        WHERE subscriber_count IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM channel_snapshots)
+    """)
+
+    # 14. video_trends 테이블: 영상 × 스냅샷 날짜별 조회수 추세 (video_trends.py, 수집 직후 계산)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS video_trends (
+            video_id TEXT NOT NULL,
+            snapshot_date TEXT NOT NULL,  -- YYYY-MM-DD (기준 날짜)
+            views_per_day REAL,  -- 창(14일) 안 일 평균 조회수 증가
+            velocity REAL,  -- 마지막 구간 일 조회수 증가
+            acceleration REAL,  -- 구간 속도 변화 (조회수/일²)
+            ewma_views_per_day REAL,  -- 구간 속도 지수 가중 이동 평균
+            delta_views_14d INTEGER,  -- 달력 기준 14일 조회수 증가
+            window_days INTEGER,  -- 창 안 첫 관측 → 기준 날짜 일 수
+            observations INTEGER,  -- 창 안 관측 날짜 수
+            PRIMARY KEY (video_id, snapshot_date)
+        ) WITHOUT ROWID
+    """)
+
+    # 15. videos_fts: 제목/설명/태그/채널명 전문 검색 색인 (video_search.py, 한글은 2-gram으로 변환해 저장)
+    # contentless(rowid = videos.rowid), FTS5가 없는 SQLite 빌드면 검색만 비활성화
+    try:
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5(
+                {', '.join(video_search.FTS_COLUMNS)}, content='', tokenize='unicode61'
+            )
+        """)
+        _backfill_search_index(cursor)
+    except sqlite3.OperationalError as e:
+        print(f"⚠️  전문 검색 색인 비활성화 (FTS5 없음): {e}")
+
+    # 16. tags / video_tags: 태그 사전(정규화한 이름 → tag_id)과 영상-태그 연결 (videos.tags JSON의 역색인)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tags (
+            tag_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,  -- 정규화 (소문자, 앞뒤 공백 제거)
+            display_name TEXT NOT NULL  -- 처음 본 표기
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS video_tags (
+            video_id TEXT NOT NULL,
+            tag_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,  -- 원래 태그 순서
+            PRIMARY KEY (video_id, tag_id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_video_tags_tag ON video_tags(tag_id, video_id)")
+    _backfill_video_tags(cursor)
+
+    # 카운터 초기값 (없을 때만 1회 집계)
+    for counter_name, counter_sql in [
+        ('total_videos', "SELECT COUNT(*) FROM videos"),
+        ('total_snapshots', "SELECT COUNT(*) FROM snapshots"),
+        ('total_labels', "SELECT COUNT(*) FROM labels"),
+        ('total_labeling_queue', "SELECT COUNT(*) FROM labeling_queue"),
+    ]:
+        cursor.execute(f"""
+            INSERT INTO stats_counters (name, value)
+            SELECT ?, ({counter_sql})
+            WHERE NOT EXISTS (SELECT 1 FROM stats_counters WHERE name = ?)
+        """, (counter_name, counter_name))
+    cursor.execute("""
+        INSERT INTO stats_counters (name, text_value)
+        SELECT 'latest_snapshot_date', (SELECT MAX(snapshot_date) FROM snapshots)
+        WHERE NOT EXISTS (SELECT 1 FROM stats_counters WHERE name = 'latest_snapshot_date')
+    """)
+
+    # 카운터 트리거 (어느 경로로 쓰든 카운터가 맞게 유지됨)
+    for table, counter_name in [
+        ('videos', 'total_videos'), ('snapshots', 'total_snapshots'), ('labels', 'total_labels'),
+        ('labeling_queue', 'total_labeling_queue')
+    ]:
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_count_insert AFTER INSERT ON {table}
+            BEGIN
+                UPDATE stats_counters SET value = value + 1 WHERE name = '{counter_name}';
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_count_delete AFTER DELETE ON {table}
+            BEGIN
+                UPDATE stats_counters SET value = value - 1 WHERE name = '{counter_name}';
+            END
+        """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_snapshots_latest_date AFTER INSERT ON snapshots
+        BEGIN
+            UPDATE stats_counters SET text_value = NEW.snapshot_date
+            WHERE name = 'latest_snapshot_date'
+              AND (text_value IS NULL OR text_value < NEW.snapshot_date);
+        END
+    """)
+
+    # 데이터 버전 (응답 캐시 무효화용, response_cache.py)
+    # 해당 테이블에 쓰기가 커밋되면 버전이 바뀌어 캐시된 응답이 더 이상 맞지 않음
+    for version_name, tables in DATA_VERSION_TABLES.items():
+        cursor.execute("""
+            INSERT INTO stats_counters (name, value)
+            SELECT ?, 0
+            WHERE NOT EXISTS (SELECT 1 FROM stats_counters WHERE name = ?)
+        """, (version_name, version_name))
+        for table in tables:
+            for event in ['INSERT', 'UPDATE', 'DELETE']:
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_{version_name}_{event.lower()} AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE stats_counters SET value = value + 1 WHERE name = '{version_name}';
+                    END
+                """)
+
+    # 화이트리스트 버전 (확장프로그램 델타 동기화, get_whitelist_changes)
+    # 등록/해제, 등록된 채널의 이름·핸들 변경 시 버전을 올리고 그 행에 기록
+    # 행을 아예 지우면 델타로 알릴 수 없으므로 reset 버전을 올려 전체 동기화를 유도
+    for counter_name in ['whitelist_version', 'whitelist_reset_version']:
+        cursor.execute("""
+            INSERT INTO stats_counters (name, value)
+            SELECT ?, 0
+            WHERE NOT EXISTS (SELECT 1 FROM stats_counters WHERE name = ?)
+        """, (counter_name, counter_name))
+    bump_whitelist_version = """
+        UPDATE stats_counters SET value = value + 1 WHERE name = 'whitelist_version';
+        UPDATE channels SET whitelist_version = (SELECT value FROM stats_counters WHERE name = 'whitelist_version')
+        WHERE channel_id = NEW.channel_id;
+    """
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_channels_whitelist_insert AFTER INSERT ON channels
+        WHEN NEW.is_whitelist = 1
+        BEGIN
+            {bump_whitelist_version}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_channels_whitelist_update
+        AFTER UPDATE OF is_whitelist, channel_title, handle ON channels
+        WHEN OLD.is_whitelist IS NOT NEW.is_whitelist
+          OR (NEW.is_whitelist = 1 AND (OLD.channel_title IS NOT NEW.channel_title OR OLD.handle IS NOT NEW.handle))
+        BEGIN
+            {bump_whitelist_version}
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_channels_whitelist_delete AFTER DELETE ON channels
+        WHEN OLD.is_whitelist = 1
+        BEGIN
+            UPDATE stats_counters SET value = value + 1 WHERE name = 'whitelist_version';
+            UPDATE stats_counters SET value = (SELECT value FROM stats_counters WHERE name = 'whitelist_version')
+            WHERE name = 'whitelist_reset_version';
+        END
+    """)
 
     # 인덱스 생성
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_date ON snapshots(snapshot_date)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_video ON snapshots(video_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_video_date ON snapshots(video_id, snapshot_date)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_view_scores_video ON view_scores(video_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_view_scores_snapshot ON view_scores(snapshot_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_senior_scores_video ON senior_scores(video_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_senior_scores_dict_version ON senior_scores(dictionary_version)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_weight_versions_active ON weight_versions(model, is_active)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_labeling_queue_score ON labeling_queue(view_score DESC)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_labeling_queue_margin ON labeling_queue(margin)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_labeling_queue_recency ON labeling_queue(snapshot_date DESC, margin)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_senior_scores_snapshot ON senior_scores(snapshot_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_rollups_dimension ON daily_rollups(dimension, dim_key, rollup_date)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_labels_video ON labels(video_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_videos_channel ON videos(channel_id)")  # JOIN 성능 향상
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_channels_handle ON channels(handle)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_channels_whitelist_version ON channels(whitelist_version)")
 
     conn.commit()
     conn.close()
     print("[OK] Database initialized successfully")
 
 
-def insert_video(video_data: Dict[str, Any]) -> None:
-    """비디오 정보 삽입 (중복 시 무시)"""
-    conn = get_connection()
-    cursor = conn.cursor()
+SEARCH_BACKFILL_BATCH = 5000
+SEARCH_RANK_MAX_MATCHES = int(os.getenv('SEARCH_RANK_MAX_MATCHES', '5000'))
+
+
+def _backfill_search_index(cursor) -> int:
+    """색인되지 않은 영상(videos_fts의 마지막 rowid 이후)을 전문 검색 색인에 추가"""
+    last_rowid = cursor.execute("SELECT COALESCE(MAX(rowid), 0) FROM videos_fts").fetchone()[0]
+    total = 0
+    while True:
+        rows = cursor.execute("""
+            SELECT rowid, title, description, tags, channel_title FROM videos
+            WHERE rowid > ? ORDER BY rowid LIMIT ?
+        """, (last_rowid, SEARCH_BACKFILL_BATCH)).fetchall()
+        if not rows:
+            break
+        cursor.executemany(
+            f"INSERT INTO videos_fts (rowid, {', '.join(video_search.FTS_COLUMNS)}) VALUES (?, ?, ?, ?, ?)",
+            [(row['rowid'],) + video_search.index_values(dict(row)) for row in rows]
+        )
+        last_rowid = rows[-1]['rowid']
+        total += len(rows)
+    if total:
+        print(f"[OK] 전문 검색 색인: 영상 {total}개 추가")
+    return total
+
+
+def _insert_video_tags_sql(video_filter: str) -> Tuple[str, str]:
+    """videos.tags JSON → tags / video_tags INSERT 문 (json_each, video_filter로 대상 영상 지정)"""
+    tag_name = TAG_NAME_SQL.format('j.value')
+    intern = f"""
+        INSERT OR IGNORE INTO tags (name, display_name)
+        SELECT {tag_name}, trim(j.value)
+        FROM videos v, json_each(v.tags) j
+        WHERE {video_filter} AND json_valid(v.tags) AND j.type = 'text' AND trim(j.value) != ''
+        ORDER BY v.rowid, j.key
+    """
+    link = f"""
+        INSERT OR IGNORE INTO video_tags (video_id, tag_id, position)
+        SELECT v.video_id, t.tag_id, j.key
+        FROM videos v, json_each(v.tags) j
+        JOIN tags t ON t.name = {tag_name}
+        WHERE {video_filter} AND json_valid(v.tags) AND j.type = 'text'
+        ORDER BY v.rowid, j.key
+    """
+    return intern, link
 
+
+def _backfill_video_tags(cursor) -> None:
+    """video_tags에 아직 없는 영상(stats_counters.video_tags_rowid 이후)의 태그를 JSON에서 채움"""
     cursor.execute("""
+        INSERT INTO stats_counters (name, value)
+        SELECT 'video_tags_rowid', 0
+        WHERE NOT EXISTS (SELECT 1 FROM stats_counters WHERE name = 'video_tags_rowid')
+    """)
+    last_rowid = cursor.execute("SELECT value FROM stats_counters WHERE name = 'video_tags_rowid'").fetchone()[0]
+    max_rowid = cursor.execute("SELECT COALESCE(MAX(rowid), 0) FROM videos").fetchone()[0]
+    if max_rowid <= last_rowid:
+        return
+
+    for sql in _insert_video_tags_sql('v.rowid > ?'):
+        cursor.execute(sql, (last_rowid,))
+    cursor.execute("UPDATE stats_counters SET value = ? WHERE name = 'video_tags_rowid'", (max_rowid,))
+
+
+def insert_video(video_data: Dict[str, Any], conn=None) -> None:
+    """비디오 정보 삽입 (중복 시 무시), conn을 넘기면 커밋은 호출한 쪽에서"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(f"""
         INSERT OR IGNORE INTO videos
         (video_id, title, description, channel_id, channel_title,
-         category_id, published_at, thumbnail_url, duration, tags)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+         category_id, published_at, published_at_epoch, thumbnail_url, duration, tags)
+        VALUES (?, ?, ?, ?, ?, ?, ?, {PUBLISHED_AT_EPOCH_SQL.format('?')}, ?, ?, ?)
     """, (
         video_data['video_id'],
         video_data['title'],
@@ -146,18 +565,42 @@ def insert_video(video_data: Dict[str, Any]) -> None:
         video_data['channel_title'],
         video_data.get('category_id', ''),
         video_data.get('published_at', ''),
+        video_data.get('published_at', ''),
         video_data.get('thumbnail_url', ''),
         video_data.get('duration', ''),
         json.dumps(video_data.get('tags', []), ensure_ascii=False)
     ))
 
-    conn.commit()
-    conn.close()
+    # 새 영상이면 태그 연결과 전문 검색 색인도 같은 트랜잭션에서
+    if cursor.rowcount == 1:
+        video_rowid = cursor.lastrowid
+        if video_data.get('tags'):
+            for sql in _insert_video_tags_sql('v.rowid = ?'):
+                cursor.execute(sql, (video_rowid,))
+        # 백필 워터마크도 전진 (이전 영상까지 백필이 끝난 경우만, 다음 init_database가 다시 훑지 않도록)
+        cursor.execute("""
+            UPDATE stats_counters SET value = ?
+            WHERE name = 'video_tags_rowid'
+              AND value >= (SELECT COALESCE(MAX(rowid), 0) FROM videos WHERE rowid < ?)
+        """, (video_rowid, video_rowid))
+        try:
+            cursor.execute(
+                f"INSERT INTO videos_fts (rowid, {', '.join(video_search.FTS_COLUMNS)}) VALUES (?, ?, ?, ?, ?)",
+                (video_rowid,) + video_search.index_values(video_data)
+            )
+        except sqlite3.OperationalError:
+            pass  # FTS5 없음 (init_database에서 경고)
+
+    if own_conn:
+        conn.commit()
+        conn.close()
 
 
-def insert_snapshot(snapshot_data: Dict[str, Any]) -> Optional[int]:
-    """스냅샷 삽입 (중복 시 무시), 삽입된 ID 반환"""
-    conn = get_connection()
+def insert_snapshot(snapshot_data: Dict[str, Any], conn=None) -> Optional[int]:
+    """스냅샷 삽입 (중복 시 무시), 삽입된 ID 반환, conn을 넘기면 커밋은 호출한 쪽에서"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
     cursor = conn.cursor()
 
     try:
@@ -175,21 +618,25 @@ def insert_snapshot(snapshot_data: Dict[str, Any]) -> Optional[int]:
             snapshot_data.get('comment_count', 0),
             snapshot_data.get('rank_position', 0)
         ))
-        conn.commit()
         snapshot_id = cursor.lastrowid
-        conn.close()
+        if own_conn:
+            conn.commit()
+            conn.close()
         return snapshot_id
     except sqlite3.IntegrityError:
         # 중복 데이터 - 이미 해당 날짜에 수집됨
-        conn.close()
+        if own_conn:
+            conn.close()
         return None
 
 
 
 
-def insert_view_score(score_data: Dict[str, Any]) -> None:
-    """ViewScore 삽입"""
-    conn = get_connection()
+def insert_view_score(score_data: Dict[str, Any], conn=None) -> int:
+    """ViewScore 삽입, 삽입된 ID 반환, conn을 넘기면 커밋은 호출한 쪽에서"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -214,9 +661,67 @@ def insert_view_score(score_data: Dict[str, Any]) -> None:
         json.dumps(score_data.get('metadata', {}), ensure_ascii=False)
     ))
 
-    conn.commit()
+    score_id = cursor.lastrowid
+    if own_conn:
+        conn.commit()
+        conn.close()
+    return score_id
+
+
+def insert_senior_score(score_data: Dict[str, Any], conn=None) -> int:
+    """SeniorScore 삽입 (사전 버전 포함), 삽입된 ID 반환, conn을 넘기면 커밋은 호출한 쪽에서"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        INSERT INTO senior_scores
+        (video_id, snapshot_id, score,
+         keyword_score, genre_score, comment_score, channel_score, length_score,
+         zgen_penalty, highlights, dictionary_version)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        score_data['video_id'],
+        score_data.get('snapshot_id'),
+        score_data['score'],
+        score_data.get('keyword_score', 0),
+        score_data.get('genre_score', 0),
+        score_data.get('comment_score', 0),
+        score_data.get('channel_score', 0),
+        score_data.get('length_score', 0),
+        score_data.get('zgen_penalty', 0),
+        json.dumps(score_data.get('highlights', {}), ensure_ascii=False),
+        score_data.get('dictionary_version')
+    ))
+
+    score_id = cursor.lastrowid
+    if own_conn:
+        conn.commit()
+        conn.close()
+    return score_id
+
+
+def get_data_versions(names: List[str]) -> Tuple[int, ...]:
+    """
+    데이터 버전 조회 (응답 캐시 키)
+
+    Args:
+        names: 'data_version', 'channels_version' 중 필요한 것
+
+    Returns:
+        names 순서대로 버전 값
+    """
+    conn = get_connection()
+    placeholders = ','.join('?' * len(names))
+    rows = conn.execute(
+        f"SELECT name, value FROM stats_counters WHERE name IN ({placeholders})", tuple(names)
+    ).fetchall()
     conn.close()
 
+    values = {row['name']: row['value'] for row in rows}
+    return tuple(values.get(name, 0) for name in names)
+
 
 def get_snapshots_by_date(date: str) -> List[Dict[str, Any]]:
     """특정 날짜의 모든 스냅샷 조회"""
@@ -225,7 +730,7 @@ def get_snapshots_by_date(date: str) -> List[Dict[str, Any]]:
 
     cursor.execute("""
         SELECT s.*, v.title, v.channel_title, v.thumbnail_url,
-               v.channel_id, v.published_at
+               v.channel_id, v.published_at, v.published_at_epoch
         FROM snapshots s
         JOIN videos v ON s.video_id = v.video_id
         WHERE s.snapshot_date = ?
@@ -237,7 +742,13 @@ def get_snapshots_by_date(date: str) -> List[Dict[str, Any]]:
     return results
 
 
-def get_snapshots_by_date_and_source(date: str, data_source: str = 'all', category_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+def get_snapshots_by_date_and_source(
+    date: str,
+    data_source: str = 'all',
+    category_ids: Optional[List[str]] = None,
+    dedupe: bool = False,
+    tags: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
     """
     특정 날짜의 스냅샷 조회 (데이터 소스 필터링)
 
@@ -245,6 +756,9 @@ def get_snapshots_by_date_and_source(date: str, data_source: str = 'all', catego
         date: 조회 날짜 (YYYY-MM-DD)
         data_source: 'channel' (채널 기반), 'category' (카테고리 기반), 'all' (전체)
         category_ids: 필터링할 카테고리 ID 리스트 (None이면 전체)
+        dedupe: True면 영상당 1행 (같은 날 여러 인기 카테고리·채널 소스로 잡힌 행을 합침)
+            대표 행은 조회수가 가장 큰(같으면 순위가 높은) 스냅샷, sources에 걸린 소스 목록
+        tags: 이 중 하나라도 붙은 영상만 (대소문자·앞뒤 공백 무시, video_tags 역색인)
 
     Returns:
         필터링된 스냅샷 리스트
@@ -274,35 +788,92 @@ def get_snapshots_by_date_and_source(date: str, data_source: str = 'all', catego
             where_clause += f" AND s.category_id IN ({placeholders})"
         params.extend(category_ids)
 
-    cursor.execute(f"""
-        SELECT s.*, v.title, v.channel_title, v.thumbnail_url,
-               v.channel_id, v.published_at, v.category_id as video_category_id,
-               vs.score as view_score, vs.view_score as view_component,
-               vs.subscriber_score, vs.recency_score, vs.engagement_score
-        FROM snapshots s
-        JOIN videos v ON s.video_id = v.video_id
+    # 태그 필터링 (태그 이름 → tag_id → 영상, 색인 조회)
+    if tags:
+        where_clause += f"""
+            AND s.video_id IN (
+                SELECT vt.video_id FROM tags t
+                JOIN video_tags vt ON vt.tag_id = t.tag_id
+                WHERE t.name IN (SELECT {TAG_NAME_SQL.format('value')} FROM json_each(?))
+            )"""
+        params.append(json.dumps(tags, ensure_ascii=False))
+
+    columns = """
+        s.*, v.title, v.channel_title, v.thumbnail_url,
+        v.channel_id, v.published_at, v.published_at_epoch, v.category_id as video_category_id,
+        vs.score as view_score, vs.view_score as view_component,
+        vs.subscriber_score, vs.recency_score, vs.engagement_score,
+        vt.views_per_day, vt.velocity, vt.acceleration, vt.ewma_views_per_day,
+        vt.delta_views_14d
+    """
+    joins = """
         LEFT JOIN view_scores vs ON s.id = vs.snapshot_id
-        WHERE {where_clause}
-        ORDER BY s.rank_position
-    """, tuple(params))
+        LEFT JOIN video_trends vt ON vt.video_id = s.video_id AND vt.snapshot_date = s.snapshot_date
+    """
+
+    if dedupe:
+        # 필터에 맞는 행 중 영상별 대표 1행만 점수·추세와 조인
+        cursor.execute(f"""
+            WITH matched AS (
+                SELECT s.id,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY s.video_id ORDER BY s.view_count DESC, s.rank_position, s.id
+                       ) AS source_rank,
+                       json_group_array(s.category_id) OVER (PARTITION BY s.video_id) AS sources
+                FROM snapshots s
+                JOIN videos v ON s.video_id = v.video_id
+                WHERE {where_clause}
+            )
+            SELECT {columns}, m.sources
+            FROM matched m
+            JOIN snapshots s ON s.id = m.id
+            JOIN videos v ON s.video_id = v.video_id
+            {joins}
+            WHERE m.source_rank = 1
+            ORDER BY s.rank_position
+        """, tuple(params))
+    else:
+        cursor.execute(f"""
+            SELECT {columns}
+            FROM snapshots s
+            JOIN videos v ON s.video_id = v.video_id
+            {joins}
+            WHERE {where_clause}
+            ORDER BY s.rank_position
+        """, tuple(params))
 
     results = [dict(row) for row in cursor.fetchall()]
     conn.close()
+
+    if dedupe:
+        for row in results:
+            row['sources'] = sorted(json.loads(row['sources']))
     return results
 
 
-def get_delta_views(video_id: str, days: int = 14) -> Optional[int]:
-    """특정 비디오의 Δviews 계산 (최근 N일)"""
+def get_delta_views(video_id: str, days: int = 14, as_of_date: Optional[str] = None) -> Optional[int]:
+    """
+    특정 비디오의 Δviews 계산 (최근 N일, 행 수가 아니라 달력 기준)
+
+    as_of_date(없으면 마지막 스냅샷 날짜) - N일 이후 첫 스냅샷 대비 증가량.
+    수집 후 저장된 값은 video_trends 테이블에 있음 (video_trends.py)
+    """
     conn = get_connection()
     cursor = conn.cursor()
 
     cursor.execute("""
-        SELECT view_count, snapshot_date
-        FROM snapshots
-        WHERE video_id = ?
-        ORDER BY snapshot_date DESC
-        LIMIT ?
-    """, (video_id, days + 1))
+        WITH latest AS (
+            SELECT MAX(snapshot_date) AS snapshot_date FROM snapshots
+            WHERE video_id = ? AND (? IS NULL OR snapshot_date <= ?)
+        )
+        SELECT MAX(s.view_count) AS view_count, s.snapshot_date
+        FROM snapshots s, latest
+        WHERE s.video_id = ?
+          AND s.snapshot_date <= latest.snapshot_date
+          AND s.snapshot_date >= date(latest.snapshot_date, ?)
+        GROUP BY s.snapshot_date
+        ORDER BY s.snapshot_date DESC
+    """, (video_id, as_of_date, as_of_date, video_id, f'-{days} days'))
 
     rows = cursor.fetchall()
     conn.close()
@@ -315,6 +886,92 @@ def get_delta_views(video_id: str, days: int = 14) -> Optional[int]:
     return latest_views - oldest_views
 
 
+def search_videos(
+    match_query: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    data_source: str = 'all',
+    limit: int = 1000
+) -> List[Dict[str, Any]]:
+    """
+    전문 검색 후보 조회 (BM25 순, 영상당 1행)
+
+    Args:
+        match_query: FTS5 MATCH 식 (video_search.build_match_query)
+        start_date, end_date: 스냅샷 날짜 범위 (YYYY-MM-DD, 포함), 범위 안 스냅샷이 있는 영상만
+        data_source: 'channel', 'category', 'all' (스냅샷 소스)
+        limit: 최대 후보 수
+
+    Returns:
+        [{video_id, title, ..., snapshot_date, view_count, view_score, senior_score, bm25}, ...]
+        스냅샷 값은 범위 안 마지막 날짜(같은 날 여러 소스면 조회수가 가장 큰 행)
+    """
+    source_filter = {
+        'channel': "AND category_id LIKE 'channel:%'",
+        'category': "AND category_id NOT LIKE 'channel:%'"
+    }.get(data_source, '')
+
+    # 필터가 없으면 FTS5가 순위 상위 limit개만 뽑고(rank 최적화), 있으면 필터 후 limit
+    filtered = bool(start_date or end_date or source_filter)
+    rank_limit = '' if filtered else 'LIMIT ?'
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    # BM25는 일치하는 문서마다 계산하므로, 아주 흔한 검색어는 최근 색인된 SEARCH_RANK_MAX_MATCHES개
+    # 안에서만 순위를 매김 (rowid 범위 조건은 FTS5가 색인에서 바로 거름). end_date가 있으면 과거 영상이
+    # 대상이라 적용하지 않음
+    min_rowid = 0
+    if not end_date:
+        row = cursor.execute("""
+            SELECT rowid FROM videos_fts WHERE videos_fts MATCH ?
+            ORDER BY rowid DESC LIMIT 1 OFFSET ?
+        """, (match_query, SEARCH_RANK_MAX_MATCHES)).fetchone()
+        if row:
+            min_rowid = row['rowid']
+
+    params: List[Any] = [match_query, min_rowid, f"bm25({', '.join(str(w) for w in video_search.BM25_WEIGHTS)})"]
+    if not filtered:
+        params.append(limit)
+    params.extend([start_date, end_date, limit])
+
+    cursor.execute(f"""
+        WITH ranked AS (
+            SELECT rowid, rank AS bm25 FROM videos_fts
+            WHERE videos_fts MATCH ? AND rowid > ? AND rank MATCH ?
+            ORDER BY rank
+            {rank_limit}
+        ),
+        hits AS (
+            SELECT v.video_id, v.title, v.channel_id, v.channel_title, v.thumbnail_url,
+                   v.published_at, v.category_id AS video_category_id, r.bm25,
+                   (
+                       SELECT id FROM snapshots
+                       WHERE video_id = v.video_id
+                         AND snapshot_date >= COALESCE(?, '0000-00-00')
+                         AND snapshot_date <= COALESCE(?, '9999-99-99')
+                         {source_filter}
+                       ORDER BY snapshot_date DESC, view_count DESC
+                       LIMIT 1
+                   ) AS snapshot_id
+            FROM ranked r
+            JOIN videos v ON v.rowid = r.rowid
+        )
+        SELECT h.*, s.snapshot_date, s.view_count,
+               vs.score AS view_score, ss.score AS senior_score
+        FROM hits h
+        JOIN snapshots s ON s.id = h.snapshot_id
+        LEFT JOIN view_scores vs ON vs.snapshot_id = s.id
+        LEFT JOIN senior_scores ss ON ss.snapshot_id = s.id
+        ORDER BY h.bm25
+        LIMIT ?
+    """, tuple(params))
+
+    results = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return results
+
+
 def get_channel_info(channel_id: str) -> Optional[Dict[str, Any]]:
     """채널 정보 조회"""
     conn = get_connection()
@@ -333,23 +990,288 @@ def upsert_channel(channel_data: Dict[str, Any]) -> None:
     cursor = conn.cursor()
 
     cursor.execute("""
-        INSERT INTO channels (channel_id, channel_title, subscriber_count, senior_weight)
-        VALUES (?, ?, ?, ?)
+        INSERT INTO channels (channel_id, channel_title, subscriber_count, senior_weight, handle)
+        VALUES (?, ?, ?, ?, ?)
         ON CONFLICT(channel_id) DO UPDATE SET
             channel_title = excluded.channel_title,
             subscriber_count = excluded.subscriber_count,
+            handle = COALESCE(excluded.handle, channels.handle),
             updated_at = CURRENT_TIMESTAMP
     """, (
         channel_data['channel_id'],
         channel_data.get('channel_title', ''),
         channel_data.get('subscriber_count', 0),
-        channel_data.get('senior_weight', 1.0)
+        channel_data.get('senior_weight', 1.0),
+        normalize_handle(channel_data.get('handle'))
     ))
 
     conn.commit()
     conn.close()
 
 
+def insert_channel_snapshots(snapshot_date: str, channels: List[Dict[str, Any]], conn=None) -> int:
+    """
+    채널 통계 시계열 일괄 저장 (같은 날짜에 다시 받으면 최신 값으로)
+
+    Args:
+        snapshot_date: 수집 날짜 (YYYY-MM-DD)
+        channels: youtube_api.get_channel_info 결과
+        conn: 넘기면 커밋은 호출한 쪽에서
+    """
+    if not channels:
+        return 0
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+
+    conn.executemany("""
+        INSERT INTO channel_snapshots (channel_id, snapshot_date, subscriber_count, view_count, video_count)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(channel_id, snapshot_date) DO UPDATE SET
+            subscriber_count = excluded.subscriber_count,
+            view_count = excluded.view_count,
+            video_count = excluded.video_count
+    """, [
+        (
+            channel['channel_id'],
+            snapshot_date,
+            channel.get('subscriber_count'),
+            channel.get('view_count'),
+            channel.get('video_count')
+        )
+        for channel in channels
+    ])
+
+    if own_conn:
+        conn.commit()
+        conn.close()
+    return len(channels)
+
+
+def upsert_channels_with_snapshots(snapshot_date: str, channels: List[Dict[str, Any]]) -> None:
+    """수집 중 받은 채널 정보를 channels(현재 값)와 channel_snapshots(시계열)에 트랜잭션 하나로 저장"""
+    if not channels:
+        return
+
+    conn = get_connection()
+    conn.executemany("""
+        INSERT INTO channels (channel_id, channel_title, subscriber_count, senior_weight, handle)
+        VALUES (?, ?, ?, 1.0, ?)
+        ON CONFLICT(channel_id) DO UPDATE SET
+            channel_title = excluded.channel_title,
+            subscriber_count = excluded.subscriber_count,
+            handle = COALESCE(excluded.handle, channels.handle),
+            updated_at = CURRENT_TIMESTAMP
+    """, [
+        (
+            channel['channel_id'],
+            channel.get('channel_title', ''),
+            channel.get('subscriber_count', 0),
+            normalize_handle(channel.get('handle'))
+        )
+        for channel in channels
+    ])
+    insert_channel_snapshots(snapshot_date, channels, conn=conn)
+    conn.commit()
+    conn.close()
+
+
+def get_channels_as_of(channel_ids: List[str], as_of_date: str, conn=None) -> Dict[str, Dict[str, Any]]:
+    """
+    스냅샷 날짜 기준 채널 정보 (구독자 수는 channel_snapshots의 as-of 값)
+
+    채널마다 (channel_id, snapshot_date) PK로 as_of_date 이하 마지막 행 1개를 찾는다.
+    그 이전 기록이 없으면 가장 가까운 이후 값, 시계열이 아예 없으면 channels의 현재 값.
+
+    Returns:
+        {channel_id: channels 행 + subscriber_count(as-of) + subscriber_count_date}
+    """
+    if not channel_ids:
+        return {}
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+
+    result = {}
+    for i in range(0, len(channel_ids), 500):
+        batch = channel_ids[i:i + 500]
+        rows = conn.execute(f"""
+            WITH as_of AS (
+                SELECT c.channel_id,
+                    COALESCE(
+                        (SELECT cs.snapshot_date FROM channel_snapshots cs
+                         WHERE cs.channel_id = c.channel_id AND cs.snapshot_date <= ?
+                         ORDER BY cs.snapshot_date DESC LIMIT 1),
+                        (SELECT cs.snapshot_date FROM channel_snapshots cs
+                         WHERE cs.channel_id = c.channel_id AND cs.snapshot_date > ?
+                         ORDER BY cs.snapshot_date ASC LIMIT 1)
+                    ) AS snapshot_date
+                FROM channels c
+                WHERE c.channel_id IN ({','.join('?' * len(batch))})
+            )
+            SELECT c.*,
+                a.snapshot_date AS subscriber_count_date,
+                cs.subscriber_count AS as_of_subscriber_count
+            FROM as_of a
+            JOIN channels c ON c.channel_id = a.channel_id
+            LEFT JOIN channel_snapshots cs ON cs.channel_id = a.channel_id AND cs.snapshot_date = a.snapshot_date
+        """, [as_of_date, as_of_date] + batch).fetchall()
+
+        for row in rows:
+            channel = dict(row)
+            as_of_count = channel.pop('as_of_subscriber_count')
+            if as_of_count is not None:
+                channel['subscriber_count'] = as_of_count
+            result[channel['channel_id']] = channel
+
+    if own_conn:
+        conn.close()
+    return result
+
+
+def get_channel_history(channel_id: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+    """채널 통계 시계열 (날짜순, 전일 대비 구독자 증감 포함)"""
+    conn = get_connection()
+    rows = conn.execute("""
+        SELECT snapshot_date, subscriber_count, view_count, video_count,
+            subscriber_count - LAG(subscriber_count) OVER (ORDER BY snapshot_date) AS subscriber_delta
+        FROM channel_snapshots
+        WHERE channel_id = ?
+          AND (? IS NULL OR snapshot_date >= ?)
+          AND (? IS NULL OR snapshot_date <= ?)
+        ORDER BY snapshot_date
+    """, (channel_id, start_date, start_date, end_date, end_date)).fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
+def get_video_tags(video_id: str) -> List[str]:
+    """영상 태그 (원래 순서, 태그 사전의 표기)"""
+    conn = get_connection()
+    rows = conn.execute("""
+        SELECT t.display_name FROM video_tags vt
+        JOIN tags t ON t.tag_id = vt.tag_id
+        WHERE vt.video_id = ?
+        ORDER BY vt.position
+    """, (video_id,)).fetchall()
+    conn.close()
+    return [row['display_name'] for row in rows]
+
+
+def _tag_daily_cte(start_date: str, end_date: str, data_source: str, min_senior_score: Optional[float]) -> Tuple[str, List[Any]]:
+    """
+    태그 집계용 CTE: (영상, 날짜)별 1행 (여러 소스면 조회수·SeniorScore 최댓값)
+    min_senior_score가 있으면 그 이상인 행만 (시니어 대상 영상)
+    """
+    source_filter = {
+        'channel': "AND s.category_id LIKE 'channel:%'",
+        'category': "AND s.category_id NOT LIKE 'channel:%'"
+    }.get(data_source, '')
+    sql = f"""
+        daily AS (
+            SELECT s.video_id, s.snapshot_date, MAX(s.view_count) AS view_count, MAX(ss.score) AS senior_score
+            FROM snapshots s
+            LEFT JOIN senior_scores ss ON ss.snapshot_id = s.id
+            WHERE s.snapshot_date >= ? AND s.snapshot_date <= ? {source_filter}
+            GROUP BY s.video_id, s.snapshot_date
+            HAVING ? IS NULL OR MAX(ss.score) >= ?
+        )
+    """
+    return sql, [start_date, end_date, min_senior_score, min_senior_score]
+
+
+def get_tag_counts(
+    start_date: str,
+    end_date: str,
+    data_source: str = 'all',
+    min_senior_score: Optional[float] = None,
+    limit: int = 50
+) -> List[Dict[str, Any]]:
+    """기간 안에 수집된 영상 수가 많은 태그 (영상당 1번)"""
+    daily_sql, params = _tag_daily_cte(start_date, end_date, data_source, min_senior_score)
+    conn = get_connection()
+    rows = conn.execute(f"""
+        WITH {daily_sql}
+        SELECT t.display_name AS tag, COUNT(DISTINCT d.video_id) AS video_count
+        FROM daily d
+        JOIN video_tags vt ON vt.video_id = d.video_id
+        JOIN tags t ON t.tag_id = vt.tag_id
+        GROUP BY t.tag_id
+        ORDER BY video_count DESC, t.name
+        LIMIT ?
+    """, (*params, limit)).fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
+def get_tag_trends(
+    tags: List[str],
+    start_date: str,
+    end_date: str,
+    data_source: str = 'all',
+    min_senior_score: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """태그별 일별 영상 수와 조회수 합계 (날짜순)"""
+    daily_sql, params = _tag_daily_cte(start_date, end_date, data_source, min_senior_score)
+    conn = get_connection()
+    rows = conn.execute(f"""
+        WITH {daily_sql}
+        SELECT d.snapshot_date, t.display_name AS tag,
+               COUNT(*) AS video_count, SUM(d.view_count) AS total_views
+        FROM tags t
+        JOIN video_tags vt ON vt.tag_id = t.tag_id
+        JOIN daily d ON d.video_id = vt.video_id
+        WHERE t.name IN (SELECT {TAG_NAME_SQL.format('value')} FROM json_each(?))
+        GROUP BY d.snapshot_date, t.tag_id
+        ORDER BY d.snapshot_date, t.name
+    """, (*params, json.dumps(tags, ensure_ascii=False))).fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
+def get_rising_tags(
+    end_date: str,
+    days: int = 7,
+    data_source: str = 'all',
+    min_senior_score: Optional[float] = None,
+    min_videos: int = 3,
+    limit: int = 50
+) -> List[Dict[str, Any]]:
+    """
+    최근 days일과 그 전 days일의 태그별 영상 수 비교 (증가율 순)
+
+    growth = (최근 + 1) / (이전 + 1), 최근 영상 수가 min_videos 이상인 태그만
+    """
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    recent_start = (end - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+    previous_start = (end - timedelta(days=2 * days - 1)).strftime('%Y-%m-%d')
+
+    daily_sql, params = _tag_daily_cte(previous_start, end_date, data_source, min_senior_score)
+    conn = get_connection()
+    rows = conn.execute(f"""
+        WITH {daily_sql},
+        counts AS (
+            SELECT vt.tag_id,
+                   COUNT(DISTINCT CASE WHEN d.snapshot_date >= ? THEN d.video_id END) AS recent_count,
+                   COUNT(DISTINCT CASE WHEN d.snapshot_date < ? THEN d.video_id END) AS previous_count
+            FROM daily d
+            JOIN video_tags vt ON vt.video_id = d.video_id
+            GROUP BY vt.tag_id
+        )
+        SELECT t.display_name AS tag, c.recent_count, c.previous_count,
+               ROUND((c.recent_count + 1.0) / (c.previous_count + 1.0), 3) AS growth
+        FROM counts c
+        JOIN tags t ON t.tag_id = c.tag_id
+        WHERE c.recent_count >= ?
+        ORDER BY growth DESC, c.recent_count DESC, t.name
+        LIMIT ?
+    """, (*params, recent_start, recent_start, min_videos, limit)).fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
 def get_channel_by_id(channel_id: str) -> Optional[Dict[str, Any]]:
     """채널 정보 조회 (channel_id로)"""
     conn = get_connection()
@@ -381,6 +1303,176 @@ def check_snapshot_exists(video_id: str, snapshot_date: str, category_id: str) -
     return result['count'] > 0
 
 
+def normalize_handle(handle: Optional[str]) -> Optional[str]:
+    """채널 핸들 정규화 ('Foo', '@Foo' → '@foo')"""
+    if not handle:
+        return None
+    handle = handle.strip().lower()
+    if not handle:
+        return None
+    return handle if handle.startswith('@') else '@' + handle
+
+
+def get_whitelist_channel_ids() -> List[str]:
+    """수집 대상(화이트리스트) 채널 ID 목록"""
+    conn = get_connection()
+    rows = conn.execute("SELECT channel_id FROM channels WHERE is_whitelist = 1").fetchall()
+    conn.close()
+    return [row['channel_id'] for row in rows]
+
+
+def get_channel_ids_by_handles(handles: List[str]) -> Dict[str, str]:
+    """이미 저장된 채널의 핸들 → 채널 ID (정규화된 '@handle', 화이트리스트 여부 무관)"""
+    if not handles:
+        return {}
+
+    conn = get_connection()
+    rows = conn.execute(f"""
+        SELECT handle, channel_id FROM channels
+        WHERE handle IN ({','.join('?' * len(handles))})
+    """, handles).fetchall()
+    conn.close()
+    return {row['handle']: row['channel_id'] for row in rows}
+
+
+def upsert_whitelist_channels(channels: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    여러 채널을 트랜잭션 하나로 화이트리스트에 저장
+
+    Args:
+        channels: youtube_api.get_channel_info 결과
+
+    Returns:
+        {channel_id: 'added'(새로 등록) | 'updated'(이미 등록, 정보 갱신)}
+    """
+    if not channels:
+        return {}
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+
+    channel_ids = [channel['channel_id'] for channel in channels]
+    whitelisted = {
+        row['channel_id'] for row in cursor.execute(f"""
+            SELECT channel_id FROM channels
+            WHERE is_whitelist = 1 AND channel_id IN ({','.join('?' * len(channel_ids))})
+        """, channel_ids)
+    }
+
+    cursor.executemany("""
+        INSERT INTO channels (channel_id, channel_title, subscriber_count, senior_weight, is_whitelist, handle)
+        VALUES (?, ?, ?, 1.0, 1, ?)
+        ON CONFLICT(channel_id) DO UPDATE SET
+            channel_title = excluded.channel_title,
+            subscriber_count = excluded.subscriber_count,
+            is_whitelist = 1,
+            handle = COALESCE(excluded.handle, channels.handle),
+            updated_at = CURRENT_TIMESTAMP
+    """, [
+        (
+            channel['channel_id'],
+            channel.get('channel_title', ''),
+            channel.get('subscriber_count', 0),
+            normalize_handle(channel.get('handle'))
+        )
+        for channel in channels
+    ])
+
+    conn.commit()
+    conn.close()
+
+    return {
+        channel_id: 'updated' if channel_id in whitelisted else 'added'
+        for channel_id in channel_ids
+    }
+
+
+def check_whitelisted_channels(channel_ids: List[str], handles: List[str]) -> List[Dict[str, Any]]:
+    """
+    여러 채널의 등록 여부를 쿼리 1번으로 확인 (PK/핸들 인덱스)
+
+    Args:
+        channel_ids: 채널 ID 리스트
+        handles: 핸들 리스트 (정규화된 '@handle')
+
+    Returns:
+        등록된 채널만 [{'channel_id', 'channel_title', 'handle'}, ...]
+    """
+    if not channel_ids and not handles:
+        return []
+
+    conditions = []
+    params: List[str] = []
+    if channel_ids:
+        conditions.append(f"channel_id IN ({','.join('?' * len(channel_ids))})")
+        params.extend(channel_ids)
+    if handles:
+        conditions.append(f"handle IN ({','.join('?' * len(handles))})")
+        params.extend(handles)
+
+    conn = get_connection()
+    rows = conn.execute(f"""
+        SELECT channel_id, channel_title, handle
+        FROM channels
+        WHERE is_whitelist = 1 AND ({' OR '.join(conditions)})
+    """, params).fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
+def get_whitelist_changes(since: int = 0) -> Dict[str, Any]:
+    """
+    화이트리스트 델타 (확장프로그램 로컬 캐시 동기화용)
+
+    Args:
+        since: 클라이언트가 가진 버전 (0이면 전체)
+
+    Returns:
+        {
+            'version': 현재 버전,
+            'full': True면 channels가 전체 목록 (클라이언트 캐시를 교체),
+            'channels': 등록(또는 이름/핸들 변경)된 채널 [{'channel_id', 'channel_title', 'handle'}],
+            'removed': 등록 해제된 채널 ID
+        }
+    """
+    conn = get_connection()
+    conn.execute("BEGIN")  # 버전과 행을 같은 스냅샷에서 읽음
+    counters = {
+        row['name']: row['value'] for row in conn.execute("""
+            SELECT name, value FROM stats_counters
+            WHERE name IN ('whitelist_version', 'whitelist_reset_version')
+        """)
+    }
+    version = counters.get('whitelist_version', 0)
+
+    # 버전이 미래(DB 교체 등)거나 그 사이 행이 삭제됐으면 전체 동기화
+    full = since <= 0 or since > version or since < counters.get('whitelist_reset_version', 0)
+
+    if full:
+        rows = conn.execute("""
+            SELECT channel_id, channel_title, handle, is_whitelist FROM channels
+            WHERE is_whitelist = 1
+        """).fetchall()
+    else:
+        rows = conn.execute("""
+            SELECT channel_id, channel_title, handle, is_whitelist FROM channels
+            WHERE whitelist_version > ?
+        """, (since,)).fetchall()
+    conn.rollback()
+    conn.close()
+
+    return {
+        'version': version,
+        'full': full,
+        'channels': [
+            {'channel_id': row['channel_id'], 'channel_title': row['channel_title'], 'handle': row['handle']}
+            for row in rows if row['is_whitelist'] == 1
+        ],
+        'removed': [row['channel_id'] for row in rows if row['is_whitelist'] != 1]
+    }
+
+
 def check_channel_collected_today(channel_id: str) -> bool:
     """채널이 오늘 수집되었는지 확인"""
     conn = get_connection()
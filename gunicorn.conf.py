@@ -0,0 +1,50 @@
+"""
+gunicorn 설정
+
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+- gthread 워커: 프로세스 여러 개 × 스레드 (읽기 API를 코어 수만큼 병렬 처리)
+- DB 초기화(DDL, 마이그레이션, 라벨링 큐 백필)는 마스터에서 워커 fork 전에 1회만
+- 수집은 웹 요청 대신 별도 프로세스로 실행 권장 (python data_collector.py ..., cron 등)
+  SQLite WAL + busy timeout이라 수집이 쓰는 동안에도 워커는 읽을 수 있음
+
+환경 변수로 조정: WEB_BIND, WEB_WORKERS, WEB_THREADS, WEB_TIMEOUT
+"""
+import os
+import sys
+import subprocess
+import multiprocessing
+
+
+bind = os.getenv('WEB_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_WORKERS', str(min(multiprocessing.cpu_count() + 1, 8))))
+worker_class = 'gthread'
+threads = int(os.getenv('WEB_THREADS', '4'))
+
+# gthread는 요청 스레드가 바빠도 워커가 살아 있다고 알리므로, 긴 수집 요청(/api/collect)도 끊기지 않음
+timeout = int(os.getenv('WEB_TIMEOUT', '60'))
+graceful_timeout = 30
+keepalive = 5
+
+# 메모리 누수 대비 주기적 워커 교체
+max_requests = 2000
+max_requests_jitter = 200
+
+accesslog = '-'
+errorlog = '-'
+
+# 워커마다 앱을 import (preload 하지 않음 → HUP으로 코드 다시 읽기 가능)
+preload_app = False
+
+# 워커에서는 초기화 건너뜀 (마스터가 on_starting에서 이미 함)
+raw_env = ['APP_INIT_DB=0']
+
+
+def on_starting(server):
+    """
+    마스터 시작 시 1회: DB 스키마/마이그레이션 + 라벨링 큐 백필
+
+    마스터가 앱 모듈을 import하면 워커가 fork로 그 복사본을 물려받아 HUP 재시작 때 코드가
+    다시 읽히지 않으므로, 별도 프로세스에서 실행한다.
+    """
+    subprocess.run([sys.executable, '-c', 'import app; app.initialize()'], check=True)
@@ -0,0 +1,385 @@
+"""
+키워드 사전 관리 모듈
+
+SeniorScore에 쓰이는 사전(시니어 키워드, 트로트 가수, 댓글 연령 지표,
+Z세대 밈, 시니어 친화 채널)을 DB에 저장하고, 미리 컴파일한 매처를
+원자적으로 교체하는 방식으로 핫 리로드한다.
+- 사전이 바뀔 때마다 dictionary_versions에 버전이 하나 추가됨
+- 점수에는 계산 당시 사전 버전이 기록됨 → 바뀐 용어가 걸린 영상만 재계산
+"""
+import re
+import json
+import time
+import threading
+from typing import Dict, Any, List, Optional, Iterable
+
+import database
+
+
+# 사전 이름 (keyword_dictionary.dict_name 값)
+DICTIONARY_NAMES = [
+    'senior_keywords',
+    'trot_artists',
+    'comment_age_indicators',
+    'zgen_memes',
+    'senior_friendly_channels',
+]
+
+# 채널 사전은 텍스트가 아니라 channel_id로 매칭
+CHANNEL_DICTIONARY = 'senior_friendly_channels'
+
+# 다른 프로세스에서 사전이 바뀌었는지 확인하는 주기 (초)
+RELOAD_CHECK_INTERVAL = 5.0
+
+
+class TermMatcher:
+    """
+    용어 사전 하나에 대한 컴파일된 매처
+
+    정규식 하나로 텍스트를 한 번만 훑고, 같은 위치에서 시작하는 짧은 용어
+    (예: '전통시장' 안의 '전통')는 미리 계산한 포함 관계로 보충한다.
+    → 기존 `term in text` 루프와 결과가 같음
+    """
+
+    def __init__(self, terms: Dict[str, float]):
+        self.weights = dict(terms)
+        # 긴 용어 우선 → 같은 시작 위치에서는 가장 긴 용어가 매칭됨
+        ordered = sorted(self.weights, key=len, reverse=True)
+        if ordered:
+            alternation = '|'.join(re.escape(term) for term in ordered)
+            self._pattern = re.compile(f'(?=({alternation}))')
+        else:
+            self._pattern = None
+        self._contained = {
+            term: [other for other in ordered if other != term and other in term]
+            for term in ordered
+        }
+
+    def find(self, text: str) -> List[str]:
+        """텍스트에 포함된 용어 리스트 (사전 순서 유지, 중복 없음)"""
+        if not text or self._pattern is None:
+            return []
+
+        found = set()
+        for match in self._pattern.finditer(text):
+            term = match.group(1)
+            if term not in found:
+                found.add(term)
+                found.update(self._contained[term])
+
+        return [term for term in self.weights if term in found]
+
+
+class DictionaryMatcher:
+    """특정 버전의 전체 사전 + 사전별 컴파일된 매처 (불변 객체)"""
+
+    def __init__(self, version: int, dictionaries: Dict[str, Dict[str, float]]):
+        self.version = version
+        self.dictionaries = dictionaries
+        self.senior_keywords = TermMatcher(dictionaries.get('senior_keywords', {}))
+        self.trot_artists = TermMatcher(dictionaries.get('trot_artists', {}))
+        self.comment_age_indicators = TermMatcher(dictionaries.get('comment_age_indicators', {}))
+        self.zgen_memes = TermMatcher(dictionaries.get('zgen_memes', {}))
+        self.senior_friendly_channels = dict(dictionaries.get(CHANNEL_DICTIONARY, {}))
+
+
+_matcher: Optional[DictionaryMatcher] = None
+_last_checked = 0.0
+_reload_lock = threading.Lock()
+
+
+def get_default_dictionaries() -> Dict[str, Dict[str, float]]:
+    """senior_classifier의 기본 사전 (DB 시드용)"""
+    import senior_classifier
+
+    return {
+        'senior_keywords': dict(senior_classifier.SENIOR_KEYWORDS),
+        'trot_artists': {artist: 3.0 for artist in senior_classifier.TROT_ARTISTS},
+        'comment_age_indicators': dict(senior_classifier.COMMENT_AGE_INDICATORS),
+        'zgen_memes': {meme: 0.5 for meme in senior_classifier.ZGEN_MEMES},
+        'senior_friendly_channels': dict(senior_classifier.SENIOR_FRIENDLY_CHANNELS),
+    }
+
+
+def get_current_version(conn=None) -> int:
+    """현재 사전 버전 (dictionary_versions의 최대값, 없으면 0)"""
+    own_conn = conn is None
+    if own_conn:
+        conn = database.get_connection()
+
+    row = conn.execute("SELECT MAX(version) as version FROM dictionary_versions").fetchone()
+
+    if own_conn:
+        conn.close()
+
+    return row['version'] or 0
+
+
+def seed_defaults() -> int:
+    """사전 테이블이 비어 있으면 기본 사전으로 채움 (버전 1)"""
+    conn = database.get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT COUNT(*) as count FROM dictionary_versions")
+    if cursor.fetchone()['count'] > 0:
+        conn.close()
+        return 0
+
+    dictionaries = get_default_dictionaries()
+    cursor.execute("""
+        INSERT INTO dictionary_versions (dict_name, changed_terms, note)
+        VALUES (?, ?, ?)
+    """, ('*', json.dumps([], ensure_ascii=False), '기본 사전 시드'))
+    version = cursor.lastrowid
+
+    rows = [
+        (dict_name, term, weight, version)
+        for dict_name, terms in dictionaries.items()
+        for term, weight in terms.items()
+    ]
+    cursor.executemany("""
+        INSERT OR IGNORE INTO keyword_dictionary (dict_name, term, weight, version)
+        VALUES (?, ?, ?, ?)
+    """, rows)
+
+    conn.commit()
+    conn.close()
+    return len(rows)
+
+
+def load_dictionaries() -> DictionaryMatcher:
+    """DB에서 사전을 읽어 새 매처 생성 (비어 있으면 기본 사전 시드)"""
+    seed_defaults()
+
+    conn = database.get_connection()
+    version = get_current_version(conn)
+    rows = conn.execute("""
+        SELECT dict_name, term, weight FROM keyword_dictionary
+        ORDER BY dict_name, rowid
+    """).fetchall()
+    conn.close()
+
+    dictionaries = {name: {} for name in DICTIONARY_NAMES}
+    for row in rows:
+        dictionaries.setdefault(row['dict_name'], {})[row['term']] = row['weight']
+
+    return DictionaryMatcher(version, dictionaries)
+
+
+def reload() -> DictionaryMatcher:
+    """사전을 다시 읽고 매처를 원자적으로 교체"""
+    global _matcher, _last_checked
+
+    with _reload_lock:
+        new_matcher = load_dictionaries()
+        _matcher = new_matcher  # 참조 교체 한 번 → 읽는 쪽은 항상 완전한 매처를 봄
+        _last_checked = time.monotonic()
+
+    print(f"[OK] 키워드 사전 로드 (버전 {new_matcher.version})")
+    return new_matcher
+
+
+def get_matcher() -> DictionaryMatcher:
+    """
+    현재 매처 반환
+
+    다른 프로세스(수집 워커 등)에서 사전을 고쳤을 수 있으므로
+    RELOAD_CHECK_INTERVAL마다 DB 버전을 확인하고 바뀌었으면 리로드
+    """
+    global _last_checked
+
+    matcher = _matcher
+    if matcher is None:
+        return reload()
+
+    now = time.monotonic()
+    if now - _last_checked >= RELOAD_CHECK_INTERVAL:
+        _last_checked = now
+        if get_current_version() != matcher.version:
+            return reload()
+
+    return matcher
+
+
+def get_dictionaries() -> Dict[str, Any]:
+    """전체 사전 조회 (API용)"""
+    matcher = get_matcher()
+    return {
+        'version': matcher.version,
+        'dictionaries': matcher.dictionaries
+    }
+
+
+def update_dictionary(
+    dict_name: str,
+    upsert: Optional[Dict[str, float]] = None,
+    remove: Optional[Iterable[str]] = None,
+    note: str = ''
+) -> Dict[str, Any]:
+    """
+    사전 수정 (추가/가중치 변경/삭제) 후 새 버전 발행 + 핫 리로드
+
+    Args:
+        dict_name: 사전 이름 (DICTIONARY_NAMES 중 하나)
+        upsert: {용어: 가중치} 추가 또는 가중치 변경
+        remove: 삭제할 용어 리스트
+        note: 변경 메모
+
+    Returns:
+        {'version': 새 버전, 'changed_terms': [...]}
+    """
+    if dict_name not in DICTIONARY_NAMES:
+        raise ValueError(f"알 수 없는 사전입니다: {dict_name}")
+
+    upsert = {term.strip(): float(weight) for term, weight in (upsert or {}).items() if term.strip()}
+    remove = [term.strip() for term in (remove or []) if term.strip()]
+    changed_terms = sorted(set(upsert) | set(remove))
+
+    if not changed_terms:
+        return {'version': get_matcher().version, 'changed_terms': []}
+
+    seed_defaults()
+
+    conn = database.get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        INSERT INTO dictionary_versions (dict_name, changed_terms, note)
+        VALUES (?, ?, ?)
+    """, (dict_name, json.dumps(changed_terms, ensure_ascii=False), note))
+    version = cursor.lastrowid
+
+    cursor.executemany("""
+        INSERT INTO keyword_dictionary (dict_name, term, weight, version)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(dict_name, term) DO UPDATE SET
+            weight = excluded.weight,
+            version = excluded.version,
+            updated_at = CURRENT_TIMESTAMP
+    """, [(dict_name, term, weight, version) for term, weight in upsert.items()])
+
+    cursor.executemany("""
+        DELETE FROM keyword_dictionary WHERE dict_name = ? AND term = ?
+    """, [(dict_name, term) for term in remove])
+
+    conn.commit()
+    conn.close()
+
+    reload()
+
+    return {'version': version, 'changed_terms': changed_terms}
+
+
+def get_changes_since(version: int) -> Dict[str, List[str]]:
+    """특정 버전 이후 바뀐 용어 {사전 이름: [용어, ...]}"""
+    conn = database.get_connection()
+    rows = conn.execute("""
+        SELECT dict_name, changed_terms FROM dictionary_versions
+        WHERE version > ?
+    """, (version,)).fetchall()
+    conn.close()
+
+    changes: Dict[str, set] = {}
+    for row in rows:
+        changes.setdefault(row['dict_name'], set()).update(json.loads(row['changed_terms'] or '[]'))
+
+    return {name: sorted(terms) for name, terms in changes.items()}
+
+
+def _is_affected(video: Dict[str, Any], changes: Dict[str, List[str]]) -> bool:
+    """바뀐 용어가 영상 텍스트/채널에 걸리는지 확인"""
+    if '*' in changes:
+        return True
+
+    text = ' '.join([
+        video.get('title') or '',
+        video.get('description') or '',
+        video.get('tags') or ''
+    ])
+
+    for dict_name, terms in changes.items():
+        if dict_name == CHANNEL_DICTIONARY:
+            if video.get('channel_id') in terms:
+                return True
+        elif any(term in text for term in terms):
+            return True
+
+    return False
+
+
+def rescore_stale_scores() -> Dict[str, int]:
+    """
+    사전 버전이 오래된 SeniorScore 재계산
+
+    버전별로 그 이후 바뀐 용어를 모아, 용어가 실제로 걸린 영상만 다시 계산하고
+    나머지는 점수가 그대로이므로 버전만 올린다.
+
+    Returns:
+        {'rescored': 재계산 수, 'bumped': 버전만 갱신한 수}
+    """
+    import senior_classifier
+    import weight_trainer
+
+    matcher = get_matcher()
+    senior_weights = weight_trainer.get_active_weights('senior')
+    stats = {'rescored': 0, 'bumped': 0}
+
+    conn = database.get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT DISTINCT dictionary_version FROM senior_scores
+        WHERE dictionary_version IS NULL OR dictionary_version < ?
+    """, (matcher.version,))
+    stale_versions = [row['dictionary_version'] for row in cursor.fetchall()]
+
+    for stale_version in stale_versions:
+        # 버전 기록이 없는 과거 점수는 전부 재계산
+        changes = get_changes_since(stale_version) if stale_version is not None else {'*': []}
+
+        cursor.execute("""
+            SELECT DISTINCT v.video_id, v.title, v.description, v.tags,
+                   v.duration, v.channel_id
+            FROM senior_scores ss
+            JOIN videos v ON ss.video_id = v.video_id
+            WHERE ss.dictionary_version IS ?
+        """, (stale_version,))
+        videos = [dict(row) for row in cursor.fetchall()]
+
+        for video in videos:
+            if _is_affected(video, changes):
+                video['tags'] = json.loads(video['tags']) if video.get('tags') else []
+                result = senior_classifier.calculate_senior_score(video, weights=senior_weights)
+                cursor.execute("""
+                    UPDATE senior_scores
+                    SET score = ?, keyword_score = ?, genre_score = ?, comment_score = ?,
+                        channel_score = ?, length_score = ?, zgen_penalty = ?,
+                        highlights = ?, dictionary_version = ?,
+                        calculated_at = CURRENT_TIMESTAMP
+                    WHERE video_id = ? AND dictionary_version IS ?
+                """, (
+                    result['score'], result['keyword_score'], result['genre_score'],
+                    result['comment_score'], result['channel_score'], result['length_score'],
+                    result['zgen_penalty'],
+                    json.dumps(result['highlights'], ensure_ascii=False),
+                    result['dictionary_version'],
+                    video['video_id'], stale_version
+                ))
+                stats['rescored'] += 1
+            else:
+                cursor.execute("""
+                    UPDATE senior_scores SET dictionary_version = ?
+                    WHERE video_id = ? AND dictionary_version IS ?
+                """, (matcher.version, video['video_id'], stale_version))
+                stats['bumped'] += 1
+
+    conn.commit()
+    conn.close()
+
+    # 라벨링 큐의 SeniorScore/불확실도도 새 점수로 갱신
+    if stats['rescored'] > 0:
+        import labeling_queue
+        labeling_queue.rebuild()
+
+    print(f"[OK] SeniorScore 재계산: {stats['rescored']}개, 버전 갱신만: {stats['bumped']}개")
+    return stats
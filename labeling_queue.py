@@ -0,0 +1,260 @@
+"""
+라벨링 큐 (액티브 러닝 샘플러)
+
+수집 시점에 라벨 안 된 영상을 labeling_queue 테이블에 증분으로 넣어두고,
+/api/labels/unlabeled는 인덱스 순서대로 limit개만 읽는다 (전체 조인/정렬 없음).
+- 영상당 1행 (스냅샷이 여러 개여도 중복 없음)
+- margin: 결정 경계까지의 거리 (작을수록 모델이 헷갈리는 영상)
+  · 학습된 SeniorScore 모델이 있으면 로지스틱 로짓의 절댓값
+  · 없으면 |SeniorScore - SENIOR_THRESHOLD|
+"""
+import json
+from typing import Dict, Any, List, Optional, Tuple
+
+import database
+
+
+# SeniorScore 판정 임계값 (UI 기본값과 동일)
+SENIOR_THRESHOLD = 5.0
+
+# 샘플링 전략
+STRATEGIES = ['score', 'uncertainty', 'diversity', 'recency']
+
+# diversity 전략: 채널 중복 제거용으로 limit의 몇 배까지 읽을지
+DIVERSITY_OVERFETCH = 5
+
+# senior_scores 컬럼 순서 (weight_trainer.MODEL_FEATURES['senior']와 동일)
+SENIOR_FEATURE_COLUMNS = ['keyword_score', 'genre_score', 'comment_score', 'channel_score',
+                          'length_score', 'zgen_penalty']
+
+
+def get_decision_model() -> Optional[Tuple[List[float], float]]:
+    """활성 SeniorScore 모델의 (계수, 절편), 학습된 버전이 없으면 None"""
+    import weight_trainer
+
+    active = weight_trainer.get_active_version('senior')
+    if not active or 'coefficients' not in active['metrics']:
+        return None
+    return active['metrics']['coefficients'], active['metrics']['intercept']
+
+
+def compute_margin(senior_score: Dict[str, Any], decision_model: Optional[Tuple[List[float], float]] = None) -> float:
+    """결정 경계까지의 거리 (0에 가까울수록 불확실)"""
+    if decision_model:
+        coef, intercept = decision_model
+        logit = intercept + sum(
+            c * (senior_score.get(col) or 0.0) for c, col in zip(coef, SENIOR_FEATURE_COLUMNS)
+        )
+        return abs(logit)
+
+    return abs((senior_score.get('score') or 0.0) - SENIOR_THRESHOLD)
+
+
+def enqueue(
+    video: Dict[str, Any],
+    snapshot_date: str,
+    view_score_id: Optional[int],
+    view_score: float,
+    senior_score_id: Optional[int],
+    senior_score: Dict[str, Any],
+    decision_model: Optional[Tuple[List[float], float]] = None
+) -> None:
+    """
+    수집된 영상을 라벨링 큐에 추가/갱신 (이미 라벨된 영상은 무시)
+
+    같은 영상이 다시 수집되면 최신 점수와 스냅샷 날짜로 갱신된다.
+    """
+    conn = database.get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        INSERT INTO labeling_queue
+        (video_id, channel_id, snapshot_date, view_score_id, view_score,
+         senior_score_id, senior_score, margin)
+        SELECT ?, ?, ?, ?, ?, ?, ?, ?
+        WHERE NOT EXISTS (SELECT 1 FROM labels WHERE video_id = ?)
+        ON CONFLICT(video_id) DO UPDATE SET
+            snapshot_date = excluded.snapshot_date,
+            view_score_id = excluded.view_score_id,
+            view_score = excluded.view_score,
+            senior_score_id = excluded.senior_score_id,
+            senior_score = excluded.senior_score,
+            margin = excluded.margin
+    """, (
+        video['video_id'],
+        video['channel_id'],
+        snapshot_date,
+        view_score_id,
+        view_score,
+        senior_score_id,
+        senior_score.get('score', 0.0),
+        compute_margin(senior_score, decision_model),
+        video['video_id']
+    ))
+
+    conn.commit()
+    conn.close()
+
+
+def dequeue(video_id: str, conn=None) -> None:
+    """라벨 저장 시 큐에서 제거"""
+    own_conn = conn is None
+    if own_conn:
+        conn = database.get_connection()
+
+    conn.execute("DELETE FROM labeling_queue WHERE video_id = ?", (video_id,))
+
+    if own_conn:
+        conn.commit()
+        conn.close()
+
+
+def _fetch_queue(cursor, order_by: str, limit: int) -> List[Dict[str, Any]]:
+    """큐에서 정렬 순서대로 limit개 + 표시용 정보 조회 (PK 조인만 사용)"""
+    outer_order_by = ', '.join(f'q.{term.strip()}' for term in order_by.split(','))
+    cursor.execute(f"""
+        SELECT
+            q.video_id, q.channel_id, q.snapshot_date, q.margin,
+            v.title, v.channel_title, v.thumbnail_url,
+            q.view_score, vs.metadata,
+            q.senior_score, ss.highlights
+        FROM (
+            SELECT * FROM labeling_queue
+            ORDER BY {order_by}
+            LIMIT ?
+        ) q
+        JOIN videos v ON q.video_id = v.video_id
+        LEFT JOIN view_scores vs ON vs.id = q.view_score_id
+        LEFT JOIN senior_scores ss ON ss.id = q.senior_score_id
+        ORDER BY {outer_order_by}
+    """, (limit,))
+
+    return [dict(row) for row in cursor.fetchall()]
+
+
+def sample(limit: int = 50, strategy: str = 'score') -> List[Dict[str, Any]]:
+    """
+    라벨링할 영상 샘플링
+
+    Args:
+        limit: 최대 반환 수
+        strategy:
+            - 'score': ViewScore 높은 순 (기존 동작)
+            - 'uncertainty': 결정 경계에 가까운 순 (모델이 가장 헷갈리는 영상)
+            - 'diversity': 불확실한 순이되 채널당 1개씩 우선 배분
+            - 'recency': 최근 수집된 순 (같은 날짜 안에서는 불확실한 순)
+
+    Returns:
+        영상 리스트
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"알 수 없는 샘플링 전략입니다: {strategy}")
+
+    conn = database.get_connection()
+    cursor = conn.cursor()
+
+    if strategy == 'score':
+        videos = _fetch_queue(cursor, 'view_score DESC', limit)
+    elif strategy == 'uncertainty':
+        videos = _fetch_queue(cursor, 'margin ASC', limit)
+    elif strategy == 'recency':
+        videos = _fetch_queue(cursor, 'snapshot_date DESC, margin ASC', limit)
+    else:  # 'diversity'
+        candidates = _fetch_queue(cursor, 'margin ASC', limit * DIVERSITY_OVERFETCH)
+        seen_channels = set()
+        videos, rest = [], []
+        for video in candidates:
+            if video['channel_id'] in seen_channels:
+                rest.append(video)
+            else:
+                seen_channels.add(video['channel_id'])
+                videos.append(video)
+        videos = (videos + rest)[:limit]
+
+    conn.close()
+
+    for video in videos:
+        if video.get('metadata'):
+            video['metadata'] = json.loads(video['metadata'])
+        if video.get('highlights'):
+            video['highlights'] = json.loads(video['highlights'])
+
+    return videos
+
+
+def count() -> int:
+    """큐에 남은 영상 수 (stats_counters, 트리거로 유지 → 전체 스캔 없음)"""
+    conn = database.get_connection()
+    row = conn.execute("SELECT value FROM stats_counters WHERE name = 'total_labeling_queue'").fetchone()
+    conn.close()
+    return row['value'] if row else 0
+
+
+def rebuild() -> int:
+    """
+    기존 데이터로 큐 전체 재구성 (최초 도입 시 백필, 모델 재학습 후 margin 갱신)
+
+    Returns:
+        큐에 들어간 영상 수
+    """
+    decision_model = get_decision_model()
+
+    conn = database.get_connection()
+    cursor = conn.cursor()
+
+    # 라벨 안 된 영상별 최신 점수 1개
+    cursor.execute("""
+        SELECT v.video_id, v.channel_id,
+               s.snapshot_date,
+               vs.id as view_score_id, vs.score as view_score,
+               ss.id as senior_score_id, ss.score,
+               ss.keyword_score, ss.genre_score, ss.comment_score,
+               ss.channel_score, ss.length_score, ss.zgen_penalty
+        FROM videos v
+        JOIN (
+            SELECT video_id, MAX(id) as view_score_id FROM view_scores GROUP BY video_id
+        ) latest_vs ON latest_vs.video_id = v.video_id
+        JOIN view_scores vs ON vs.id = latest_vs.view_score_id
+        LEFT JOIN snapshots s ON s.id = vs.snapshot_id
+        LEFT JOIN (
+            SELECT video_id, MAX(id) as senior_score_id FROM senior_scores GROUP BY video_id
+        ) latest_ss ON latest_ss.video_id = v.video_id
+        LEFT JOIN senior_scores ss ON ss.id = latest_ss.senior_score_id
+        WHERE NOT EXISTS (SELECT 1 FROM labels l WHERE l.video_id = v.video_id)
+    """)
+
+    rows = []
+    for row in cursor.fetchall():
+        senior_score = dict(row)
+        rows.append((
+            row['video_id'], row['channel_id'], row['snapshot_date'],
+            row['view_score_id'], row['view_score'],
+            row['senior_score_id'], row['score'] or 0.0,
+            compute_margin(senior_score, decision_model)
+        ))
+
+    cursor.execute("DELETE FROM labeling_queue")
+    cursor.executemany("""
+        INSERT INTO labeling_queue
+        (video_id, channel_id, snapshot_date, view_score_id, view_score,
+         senior_score_id, senior_score, margin)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+
+    conn.commit()
+    conn.close()
+
+    print(f"[OK] 라벨링 큐 재구성: {len(rows)}개")
+    return len(rows)
+
+
+def backfill_if_empty() -> int:
+    """큐가 비어 있고 라벨 안 된 점수가 있으면 재구성 (앱 시작 시 1회)"""
+    conn = database.get_connection()
+    queued = conn.execute("SELECT 1 FROM labeling_queue LIMIT 1").fetchone()
+    scored = conn.execute("SELECT 1 FROM view_scores LIMIT 1").fetchone()
+    conn.close()
+
+    if queued or not scored:
+        return 0
+    return rebuild()
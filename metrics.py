@@ -0,0 +1,285 @@
+"""
+Prometheus 형식 메트릭 (프로세스 내 레지스트리)
+
+외부 라이브러리 없이 Counter / Gauge / Histogram과 텍스트 노출 형식만 구현한다.
+- 수집기: 저장 영상 수, 중복 스킵 수, 수집 실행 시간, 마지막 수집 시각
+- YouTube API: 요청 수(리소스별), 에러 수(HTTP 상태별), 지연 분포
+- Flask: 요청 수(엔드포인트·상태별), 지연 분포 (/api/videos 포함)
+- DB: 파일 크기, 테이블 행 수 (stats_counters, 스크레이프 시점에 갱신)
+
+GET /metrics로 노출된다. 수집기 메트릭은 수집이 별도 프로세스(cron)에서 돌아도 보이도록
+DB(stats_counters, 'collector:' 접두사)에 누적하고 스크레이프 시점에 읽으므로 워커와 관계없이 같은 값이다.
+나머지(YouTube API, HTTP)는 프로세스별 값이다.
+"""
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Tuple, Sequence
+
+import database
+
+
+PREFIX = 'senior_trends_'
+
+# 기본 지연 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry: List['_Metric'] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Tuple[str, ...], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}')
+        return lines
+
+
+    def set_total(self, value: float, **labels) -> None:
+        """다른 프로세스가 DB에 누적한 값으로 맞춤"""
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key → [버킷별 개수..., +Inf 개수, 합계]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+
+    def set_totals(self, bucket_counts: Sequence[float], total: float, **labels) -> None:
+        """다른 프로세스가 DB에 누적한 값으로 맞춤 (bucket_counts: 버킷별 + +Inf, 누적 아님)"""
+        with self._lock:
+            self._values[self._key(labels)] = [float(count) for count in bucket_counts] + [float(total)]
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                cumulative = 0.0
+                for bound, count in zip(self.buckets, state):
+                    cumulative += count
+                    labels = _format_labels(self.labelnames, key, 'le="%g"' % bound)
+                    lines.append(f'{self.name}_bucket{labels} {_format_value(cumulative)}')
+                cumulative += state[len(self.buckets)]
+                labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f'{self.name}_bucket{labels} {_format_value(cumulative)}')
+                lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state[-1])}')
+                lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(cumulative)}')
+        return lines
+
+
+# ============================================================
+# 메트릭 정의
+# ============================================================
+
+VIDEOS_INGESTED = Counter('videos_ingested_total', '수집으로 새로 저장된 영상 수', ['source'])
+DUPLICATES_SKIPPED = Counter('duplicates_skipped_total', '이미 수집되어 건너뛴 영상 수', ['source'])
+COLLECTION_RUNS = Counter('collection_runs_total', '수집 실행 횟수', ['source'])
+COLLECTION_DURATION = Histogram(
+    'collection_duration_seconds', '수집 실행 1회 소요 시간', ['source'],
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+)
+LAST_COLLECTION = Gauge('last_collection_timestamp_seconds', '마지막 수집 완료 시각 (Unix 초)', ['source'])
+
+YOUTUBE_API_REQUESTS = Counter('youtube_api_requests_total', 'YouTube API 요청 수 (list 요청 1회 = 쿼터 1)', ['method'])
+YOUTUBE_API_ERRORS = Counter('youtube_api_errors_total', 'YouTube API 에러 수', ['method', 'status'])
+YOUTUBE_API_LATENCY = Histogram('youtube_api_request_duration_seconds', 'YouTube API 요청 시간', ['method'])
+
+HTTP_REQUESTS = Counter('http_requests_total', 'HTTP 요청 수', ['method', 'endpoint', 'status'])
+HTTP_LATENCY = Histogram('http_request_duration_seconds', 'HTTP 요청 처리 시간', ['method', 'endpoint'])
+RESPONSE_CACHE_REQUESTS = Counter('response_cache_requests_total', '응답 캐시 조회 결과 (hit/miss/not_modified)', ['endpoint', 'result'])
+
+DB_SIZE = Gauge('db_size_bytes', 'SQLite DB 파일 크기 (WAL 포함)')
+DB_ROWS = Gauge('db_rows', '테이블 행 수', ['table'])
+
+
+# 수집기 메트릭 (stats_counters 이름: 'collector:<메트릭>:<source>[:<버킷 번호>]')
+COLLECTOR_PREFIX = 'collector:'
+
+
+def record_collection(source: str, duration: float, ingested: int, duplicates: int) -> None:
+    """수집 1회 결과를 DB에 누적 (수집 프로세스에서 호출, 트랜잭션 1번)"""
+    buckets = COLLECTION_DURATION.buckets
+    bucket_index = next((i for i, bound in enumerate(buckets) if duration <= bound), len(buckets))
+
+    increments = [
+        (f'{COLLECTOR_PREFIX}videos_ingested:{source}', ingested),
+        (f'{COLLECTOR_PREFIX}duplicates_skipped:{source}', duplicates),
+        (f'{COLLECTOR_PREFIX}runs:{source}', 1),
+        (f'{COLLECTOR_PREFIX}duration_sum:{source}', duration),
+        (f'{COLLECTOR_PREFIX}duration_bucket:{source}:{bucket_index}', 1),
+    ]
+
+    conn = database.get_connection()
+    conn.executemany("""
+        INSERT INTO stats_counters (name, value) VALUES (?, ?)
+        ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+    """, increments)
+    conn.execute("""
+        INSERT INTO stats_counters (name, value) VALUES (?, ?)
+        ON CONFLICT(name) DO UPDATE SET value = excluded.value
+    """, (f'{COLLECTOR_PREFIX}last_timestamp:{source}', time.time()))
+    conn.commit()
+    conn.close()
+
+
+def update_collection_metrics() -> None:
+    """DB에 누적된 수집기 메트릭 읽기 (스크레이프 시점에 호출)"""
+    conn = database.get_connection()
+    rows = conn.execute(
+        "SELECT name, value FROM stats_counters WHERE name LIKE ?", (COLLECTOR_PREFIX + '%',)
+    ).fetchall()
+    conn.close()
+
+    bucket_count = len(COLLECTION_DURATION.buckets) + 1  # +Inf 포함
+    durations: Dict[str, Dict[str, object]] = {}
+
+    for row in rows:
+        parts = row['name'][len(COLLECTOR_PREFIX):].split(':')
+        name, source, value = parts[0], parts[1], row['value'] or 0
+
+        if name == 'videos_ingested':
+            VIDEOS_INGESTED.set_total(value, source=source)
+        elif name == 'duplicates_skipped':
+            DUPLICATES_SKIPPED.set_total(value, source=source)
+        elif name == 'runs':
+            COLLECTION_RUNS.set_total(value, source=source)
+        elif name == 'last_timestamp':
+            LAST_COLLECTION.set(value, source=source)
+        elif name in ('duration_sum', 'duration_bucket'):
+            state = durations.setdefault(source, {'buckets': [0.0] * bucket_count, 'sum': 0.0})
+            if name == 'duration_sum':
+                state['sum'] = value
+            elif int(parts[2]) < bucket_count:
+                state['buckets'][int(parts[2])] = value
+
+    for source, state in durations.items():
+        COLLECTION_DURATION.set_totals(state['buckets'], state['sum'], source=source)
+
+
+def update_db_gauges() -> None:
+    """DB 크기와 행 수 갱신 (스크레이프 시점에 호출, stats_counters라 O(1))"""
+    size = 0
+    for suffix in ['', '-wal']:
+        path = database.DATABASE_PATH + suffix
+        if os.path.exists(path):
+            size += os.path.getsize(path)
+    DB_SIZE.set(size)
+
+    conn = database.get_connection()
+    rows = conn.execute("SELECT name, value FROM stats_counters WHERE name LIKE 'total_%'").fetchall()
+    conn.close()
+    for row in rows:
+        DB_ROWS.set(row['value'] or 0, table=row['name'][len('total_'):])
+
+
+def render() -> str:
+    """Prometheus 텍스트 노출 형식"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def init_app(app) -> None:
+    """Flask 요청 수/지연 계측 훅 등록"""
+    from flask import request, g
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return response
+
+        # 엔드포인트는 라우트 규칙으로 (/api/video/<video_id> → 라벨 수 폭증 방지)
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUESTS.inc(method=request.method, endpoint=endpoint, status=str(response.status_code))
+        HTTP_LATENCY.observe(time.perf_counter() - start, method=request.method, endpoint=endpoint)
+        return response
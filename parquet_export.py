@@ -0,0 +1,292 @@
+"""
+스냅샷 이력 컬럼형(Parquet) 내보내기
+
+오프라인 분석용으로 snapshots + 점수 요소 + 비디오 정적 정보를
+날짜·데이터 소스별로 파티셔닝된 Parquet 파일로 내보낸다.
+- 증분 내보내기: export_state에 데이터셋별 마지막 ID를 기록, 새 행만 새 파트 파일로 추가
+- 필요한 컬럼만 읽기: read_snapshots(columns=[...])  (JSONL 전체 json.loads 불필요)
+
+출력 구조 (Hive 파티셔닝):
+    export/snapshots/snapshot_date=2025-11-06/source=category/part-00000101-00000250.parquet
+    export/videos/part-00000001-00000300.parquet
+
+pyarrow가 필요하다 (선택 의존성):
+    pip install pyarrow
+
+사용법:
+    python parquet_export.py              # 증분 내보내기
+    python parquet_export.py --full       # 처음부터 다시 내보내기
+"""
+import os
+import json
+import shutil
+import argparse
+from typing import Dict, Any, List, Optional
+
+import database
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.dataset as ds
+except ImportError:  # 선택 의존성
+    pa = None
+
+
+EXPORT_DIR = 'export'
+
+# 한 번에 읽어 파일로 쓸 최대 행 수 (메모리 상한)
+EXPORT_BATCH_SIZE = 50000
+
+# snapshots 데이터셋 스키마 (설명/메타데이터 JSON 같은 큰 컬럼은 제외)
+SNAPSHOT_SCHEMA_FIELDS = [
+    ('snapshot_id', 'int64'),
+    ('video_id', 'string'),
+    ('category_id', 'string'),
+    ('channel_id', 'string'),
+    ('video_category_id', 'string'),
+    ('view_count', 'int64'),
+    ('like_count', 'int64'),
+    ('comment_count', 'int64'),
+    ('rank_position', 'int64'),
+    ('resolution', 'string'),
+    ('view_score', 'float64'),
+    ('view_component', 'float64'),
+    ('subscriber_score', 'float64'),
+    ('recency_score', 'float64'),
+    ('engagement_score', 'float64'),
+    ('senior_score', 'float64'),
+    ('keyword_score', 'float64'),
+    ('genre_score', 'float64'),
+    ('comment_score', 'float64'),
+    ('channel_score', 'float64'),
+    ('length_score', 'float64'),
+    ('zgen_penalty', 'float64'),
+]
+
+VIDEO_SCHEMA_FIELDS = [
+    ('video_id', 'string'),
+    ('title', 'string'),
+    ('description', 'string'),
+    ('channel_id', 'string'),
+    ('channel_title', 'string'),
+    ('category_id', 'string'),
+    ('published_at', 'string'),
+    ('duration', 'string'),
+    ('tags', 'list<string>'),
+]
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("Parquet 내보내기에는 pyarrow가 필요합니다: pip install pyarrow")
+
+
+def _schema(fields) -> 'pa.Schema':
+    types = {
+        'string': pa.string(),
+        'int64': pa.int64(),
+        'float64': pa.float64(),
+        'list<string>': pa.list_(pa.string()),
+    }
+    return pa.schema([(name, types[type_name]) for name, type_name in fields])
+
+
+def get_export_state(dataset: str) -> int:
+    """데이터셋별 마지막으로 내보낸 ID (없으면 0)"""
+    conn = database.get_connection()
+    row = conn.execute("SELECT last_id FROM export_state WHERE dataset = ?", (dataset,)).fetchone()
+    conn.close()
+    return row['last_id'] if row else 0
+
+
+def set_export_state(dataset: str, last_id: int) -> None:
+    conn = database.get_connection()
+    conn.execute("""
+        INSERT INTO export_state (dataset, last_id) VALUES (?, ?)
+        ON CONFLICT(dataset) DO UPDATE SET
+            last_id = excluded.last_id,
+            updated_at = CURRENT_TIMESTAMP
+    """, (dataset, last_id))
+    conn.commit()
+    conn.close()
+
+
+def _write_part(directory: str, first_id: int, last_id: int, rows: List[Dict[str, Any]], schema) -> str:
+    """파트 파일 1개 쓰기 (임시 파일에 쓴 뒤 이름 변경 → 읽는 쪽은 완성된 파일만 봄)"""
+    os.makedirs(directory, exist_ok=True)
+    path = f'{directory}/part-{first_id:08d}-{last_id:08d}.parquet'
+    tmp_path = path + '.tmp'
+
+    table = pa.Table.from_pylist(rows, schema=schema)
+    pq.write_table(table, tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+    return path
+
+
+def export_snapshots(export_dir: str = EXPORT_DIR) -> Dict[str, int]:
+    """
+    새 스냅샷 행을 (snapshot_date, source) 파티션별 Parquet 파트로 내보내기
+
+    Returns:
+        {'rows': 내보낸 행 수, 'files': 생성한 파일 수}
+    """
+    _require_pyarrow()
+    schema = _schema(SNAPSHOT_SCHEMA_FIELDS)
+    last_id = get_export_state('snapshots')
+    stats = {'rows': 0, 'files': 0}
+
+    while True:
+        conn = database.get_connection()
+        rows = conn.execute("""
+            SELECT
+                s.id as snapshot_id, s.video_id, s.category_id, s.snapshot_date,
+                v.channel_id, v.category_id as video_category_id,
+                s.view_count, s.like_count, s.comment_count, s.rank_position, s.resolution,
+                vs.score as view_score, vs.view_score as view_component,
+                vs.subscriber_score, vs.recency_score, vs.engagement_score,
+                ss.score as senior_score, ss.keyword_score, ss.genre_score,
+                ss.comment_score, ss.channel_score, ss.length_score, ss.zgen_penalty
+            FROM snapshots s
+            JOIN videos v ON s.video_id = v.video_id
+            LEFT JOIN view_scores vs ON vs.snapshot_id = s.id
+            LEFT JOIN senior_scores ss ON ss.snapshot_id = s.id
+            WHERE s.id > ?
+            ORDER BY s.id
+            LIMIT ?
+        """, (last_id, EXPORT_BATCH_SIZE)).fetchall()
+        conn.close()
+
+        if not rows:
+            break
+
+        # (날짜, 소스)별로 나눠 파트 파일 작성
+        partitions: Dict[tuple, List[Dict[str, Any]]] = {}
+        for row in rows:
+            row = dict(row)
+            source = 'channel' if row['category_id'].startswith('channel:') else 'category'
+            partitions.setdefault((row.pop('snapshot_date'), source), []).append(row)
+
+        batch_first_id, batch_last_id = rows[0]['snapshot_id'], rows[-1]['snapshot_id']
+        for (snapshot_date, source), partition_rows in partitions.items():
+            directory = f'{export_dir}/snapshots/snapshot_date={snapshot_date}/source={source}'
+            _write_part(directory, batch_first_id, batch_last_id, partition_rows, schema)
+            stats['files'] += 1
+
+        last_id = batch_last_id
+        set_export_state('snapshots', last_id)
+        stats['rows'] += len(rows)
+
+    return stats
+
+
+def export_videos(export_dir: str = EXPORT_DIR) -> Dict[str, int]:
+    """
+    새 비디오(정적 메타데이터)를 Parquet 파트로 내보내기 (videos.rowid 기준 증분)
+
+    Returns:
+        {'rows': 내보낸 행 수, 'files': 생성한 파일 수}
+    """
+    _require_pyarrow()
+    schema = _schema(VIDEO_SCHEMA_FIELDS)
+    last_id = get_export_state('videos')
+    stats = {'rows': 0, 'files': 0}
+
+    while True:
+        conn = database.get_connection()
+        rows = conn.execute("""
+            SELECT rowid, video_id, title, description, channel_id, channel_title,
+                   category_id, published_at, duration, tags
+            FROM videos
+            WHERE rowid > ?
+            ORDER BY rowid
+            LIMIT ?
+        """, (last_id, EXPORT_BATCH_SIZE)).fetchall()
+        conn.close()
+
+        if not rows:
+            break
+
+        records = []
+        for row in rows:
+            record = dict(row)
+            record.pop('rowid')
+            record['tags'] = json.loads(record['tags']) if record.get('tags') else []
+            records.append(record)
+
+        first_id, last_id = rows[0]['rowid'], rows[-1]['rowid']
+        _write_part(f'{export_dir}/videos', first_id, last_id, records, schema)
+        set_export_state('videos', last_id)
+
+        stats['rows'] += len(rows)
+        stats['files'] += 1
+
+    return stats
+
+
+def export_all(export_dir: str = EXPORT_DIR, full: bool = False) -> Dict[str, Any]:
+    """
+    스냅샷 + 비디오 증분 내보내기
+
+    Args:
+        export_dir: 출력 폴더
+        full: True면 기존 출력과 상태를 지우고 처음부터 다시 내보냄
+    """
+    _require_pyarrow()
+
+    if full:
+        for dataset in ['snapshots', 'videos']:
+            shutil.rmtree(f'{export_dir}/{dataset}', ignore_errors=True)
+            set_export_state(dataset, 0)
+
+    stats = {
+        'snapshots': export_snapshots(export_dir),
+        'videos': export_videos(export_dir)
+    }
+
+    print(f"✅ Parquet 내보내기 완료: 스냅샷 {stats['snapshots']['rows']}행, 비디오 {stats['videos']['rows']}행")
+    return stats
+
+
+def read_snapshots(
+    columns: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    source: Optional[str] = None,
+    export_dir: str = EXPORT_DIR
+) -> 'pa.Table':
+    """
+    내보낸 스냅샷 읽기 (필요한 컬럼·파티션만 읽음)
+
+    Args:
+        columns: 읽을 컬럼 (None이면 전체), 파티션 컬럼 snapshot_date/source 포함 가능
+        start_date, end_date: 날짜 범위 (YYYY-MM-DD, 포함)
+        source: 'category' 또는 'channel'
+
+    Returns:
+        pyarrow.Table (pandas가 있으면 .to_pandas()로 변환 가능)
+    """
+    _require_pyarrow()
+
+    dataset = ds.dataset(f'{export_dir}/snapshots', format='parquet', partitioning='hive')
+
+    condition = None
+    for expression in [
+        ds.field('snapshot_date') >= start_date if start_date else None,
+        ds.field('snapshot_date') <= end_date if end_date else None,
+        ds.field('source') == source if source else None,
+    ]:
+        if expression is not None:
+            condition = expression if condition is None else condition & expression
+
+    return dataset.to_table(columns=columns, filter=condition)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='스냅샷 이력 Parquet 내보내기')
+    parser.add_argument('--out', default=EXPORT_DIR, help='출력 폴더')
+    parser.add_argument('--full', action='store_true', help='처음부터 다시 내보내기')
+    args = parser.parse_args()
+
+    database.init_database()
+    print(json.dumps(export_all(args.out, full=args.full), indent=2, ensure_ascii=False))
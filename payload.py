@@ -0,0 +1,145 @@
+"""
+API 응답 페이로드 축소
+
+- 필드 선택: fields=["video_id", "title", ...] 로 필요한 키만 반환
+- 컬럼형 JSON: format="columnar" 이면 행 객체 배열 대신 {컬럼: [값, ...]}
+  (키 이름이 행마다 반복되지 않아 100~1000행 페이지에서 크기가 크게 줄어듦)
+- 응답 압축: Accept-Encoding에 따라 br(brotli 설치 시) 또는 gzip, COMPRESSION_MIN_BYTES 이상만
+
+brotli는 선택 의존성이다 (없으면 gzip만 사용):
+    pip install brotli
+"""
+import os
+import gzip
+from typing import Dict, Any, List, Optional, Union
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', '1') == '1'
+COMPRESSION_MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', '1024'))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # 기본값(11)은 응답마다 압축하기엔 느림
+
+# 압축할 응답 형식
+COMPRESSIBLE_TYPES = ['application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript', 'text/javascript']
+
+# 응답 형식
+FORMATS = ['rows', 'columnar']
+
+
+def parse_fields(value: Union[str, List[str], None]) -> Optional[List[str]]:
+    """
+    fields 파라미터 정규화
+
+    Args:
+        value: "video_id,title" 문자열 또는 ["video_id", "title"] 리스트
+
+    Returns:
+        필드 리스트 (순서 유지, 중복 제거), 없으면 None (전체 필드)
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+
+    fields = []
+    for field in value:
+        field = str(field).strip()
+        if field and field not in fields:
+            fields.append(field)
+    return fields or None
+
+
+def project(rows: List[Dict[str, Any]], fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """행마다 fields만 남김 (없는 키는 null)"""
+    if fields is None:
+        return rows
+    return [{field: row.get(field) for field in fields} for row in rows]
+
+
+def to_columnar(rows: List[Dict[str, Any]], fields: Optional[List[str]] = None) -> Dict[str, List[Any]]:
+    """
+    행 리스트 → 컬럼형 {컬럼: [값, ...]}
+
+    fields가 없으면 행에 나온 모든 키 (처음 나온 순서)
+    """
+    if fields is None:
+        fields = []
+        seen = set()
+        for row in rows:
+            for key in row:
+                if key not in seen:
+                    seen.add(key)
+                    fields.append(key)
+
+    return {field: [row.get(field) for row in rows] for field in fields}
+
+
+def format_rows(
+    rows: List[Dict[str, Any]],
+    fields: Optional[List[str]] = None,
+    response_format: str = 'rows'
+) -> Union[List[Dict[str, Any]], Dict[str, List[Any]]]:
+    """필드 선택 + 응답 형식 적용"""
+    if response_format == 'columnar':
+        return to_columnar(rows, fields)
+    return project(rows, fields)
+
+
+# ============================================================
+# 응답 압축
+# ============================================================
+
+def _choose_encoding(accept_encoding) -> Optional[str]:
+    if brotli is not None and accept_encoding['br']:
+        return 'br'
+    if accept_encoding['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def init_app(app) -> None:
+    """Flask 응답 압축 훅 등록 (COMPRESSION_ENABLED=0이면 끔)"""
+    if not COMPRESSION_ENABLED:
+        return
+
+    from flask import request
+
+    @app.after_request
+    def _compress_response(response):
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES
+        ):
+            return response
+
+        encoding = _choose_encoding(request.accept_encodings)
+        response.vary.add('Accept-Encoding')
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        if len(data) < COMPRESSION_MIN_BYTES:
+            return response
+
+        response.set_data(compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+
+        # 압축본은 바이트가 다르므로 약한 ETag로 (If-None-Match는 약한 비교라 304는 그대로 동작)
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+        return response
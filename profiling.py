@@ -0,0 +1,214 @@
+"""
+요청 단위 프로파일링 (선택 기능)
+
+PROFILING_ENABLED=1일 때만 동작하고, 꺼져 있으면 phase()는 아무 일도 하지 않는다.
+- 단계별 시간: with profiling.phase('scoring'): ... → 응답 헤더 Server-Timing으로 전달
+  (sql: 모든 SQLite 문 실행+fetch 합계, total: 요청 전체)
+- 느린 SQL 로그: SLOW_QUERY_MS 이상 걸린 문을 파라미터가 채워진 SQL로 출력
+  (set_trace_callback으로 실제 실행된 SQL 텍스트를 받고, 커서 래퍼로 시간 측정)
+- 느린 요청 로그: SLOW_REQUEST_MS 이상 걸린 요청의 단계별 시간 출력
+- cProfile 샘플링: PROFILE_SAMPLE_RATE 확률로 (또는 ?_profile=1 요청) 프로파일해서
+  최근 PROFILE_KEEP개를 /api/debug/profile로 조회
+
+사용법:
+    PROFILING_ENABLED=1 SLOW_QUERY_MS=50 PROFILE_SAMPLE_RATE=0.05 python app.py
+"""
+import io
+import os
+import time
+import random
+import pstats
+import sqlite3
+import cProfile
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+
+ENABLED = os.getenv('PROFILING_ENABLED', '0') == '1'
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '100'))
+SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', '500'))
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', '10'))
+
+# 프로파일 출력 줄 수 (누적 시간 상위)
+PROFILE_TOP_N = 40
+
+# 현재 스레드에서 처리 중인 요청의 단계별 누적 시간 (초)
+_local = threading.local()
+
+# 최근 샘플 프로파일
+_profiles: deque = deque(maxlen=PROFILE_KEEP)
+_profiles_lock = threading.Lock()
+
+
+def _current() -> Optional[Dict[str, float]]:
+    return getattr(_local, 'phases', None)
+
+
+def _add(name: str, seconds: float) -> None:
+    phases = _current()
+    if phases is not None:
+        phases[name] = phases.get(name, 0.0) + seconds
+
+
+@contextmanager
+def phase(name: str):
+    """단계 시간 측정 (같은 이름은 누적, 요청 밖이거나 꺼져 있으면 측정 안 함)"""
+    if _current() is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _add(name, time.perf_counter() - start)
+
+
+# ============================================================
+# SQLite 계측
+# ============================================================
+
+class ProfiledCursor(sqlite3.Cursor):
+    """execute/fetch 시간을 재서 sql 단계에 더하고, 느린 문을 로그로 남김"""
+
+    def _measure(self, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            _add('sql', elapsed)
+            self._statement_elapsed = getattr(self, '_statement_elapsed', 0.0) + elapsed
+            if not getattr(self, '_slow_logged', False) and self._statement_elapsed * 1000 >= SLOW_QUERY_MS:
+                self._slow_logged = True
+                sql = ' '.join((self.connection.last_sql or '').split())
+                print(f"🐢 느린 SQL ({self._statement_elapsed * 1000:.1f}ms): {sql[:500]}")
+
+    def execute(self, sql, parameters=()):
+        self._statement_elapsed = 0.0
+        self._slow_logged = False
+        return self._measure(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._statement_elapsed = 0.0
+        self._slow_logged = False
+        return self._measure(super().executemany, sql, seq_of_parameters)
+
+    def fetchone(self):
+        return self._measure(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._measure(super().fetchmany, size if size is not None else self.arraysize)
+
+    def fetchall(self):
+        return self._measure(super().fetchall)
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """모든 커서를 ProfiledCursor로 만들고, 실행된 SQL 텍스트(파라미터 포함)를 기록"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_sql = None
+        self.set_trace_callback(self._trace)
+
+    def _trace(self, statement: str) -> None:
+        if statement.startswith('--'):
+            return  # 트리거 내부 문 ('-- TRIGGER ...')은 바깥 문 텍스트를 덮어쓰지 않음
+        self.last_sql = statement
+        phases = _current()
+        if phases is not None:
+            phases['sql_count'] = phases.get('sql_count', 0) + 1
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+
+def connect_kwargs() -> Dict[str, Any]:
+    """sqlite3.connect 추가 인자 (꺼져 있으면 빈 dict → 오버헤드 없음)"""
+    return {'factory': ProfiledConnection} if ENABLED else {}
+
+
+# ============================================================
+# Flask 연동
+# ============================================================
+
+def _server_timing(phases: Dict[str, float], total: float) -> str:
+    parts = []
+    for name, seconds in phases.items():
+        if name == 'sql_count':
+            continue
+        description = f';desc="{int(phases["sql_count"])} queries"' if name == 'sql' and 'sql_count' in phases else ''
+        parts.append(f'{name};dur={seconds * 1000:.1f}{description}')
+    parts.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(parts)
+
+
+def init_app(app) -> None:
+    """Flask 앱에 요청 계측 훅 등록 (PROFILING_ENABLED=1일 때만)"""
+    if not ENABLED:
+        return
+
+    from flask import request, g
+
+    @app.before_request
+    def _start_request():
+        _local.phases = {}
+        g.profile_start = time.perf_counter()
+        g.profiler = None
+
+        sampled = request.args.get('_profile') == '1' or random.random() < PROFILE_SAMPLE_RATE
+        if sampled and not request.path.startswith('/api/debug/'):
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    @app.after_request
+    def _finish_request(response):
+        start = g.pop('profile_start', None)
+        if start is None:
+            return response
+
+        total = time.perf_counter() - start
+        phases = _current() or {}
+        _local.phases = None
+
+        response.headers['Server-Timing'] = _server_timing(phases, total)
+
+        if total * 1000 >= SLOW_REQUEST_MS:
+            breakdown = ', '.join(
+                f'{k}={v * 1000:.0f}ms' if k != 'sql_count' else f'{k}={int(v)}'
+                for k, v in phases.items()
+            )
+            print(f"🐢 느린 요청 {request.method} {request.path} ({total * 1000:.0f}ms): {breakdown}")
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            _store_profile(request.method, request.full_path, total, phases, profiler)
+
+        return response
+
+
+def _store_profile(method: str, path: str, total: float, phases: Dict[str, float], profiler: cProfile.Profile) -> None:
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(PROFILE_TOP_N)
+
+    with _profiles_lock:
+        _profiles.append({
+            'method': method,
+            'path': path,
+            'profiled_at': datetime.now().isoformat(timespec='seconds'),
+            'total_ms': round(total * 1000, 1),
+            'phases_ms': {k: (round(v * 1000, 1) if k != 'sql_count' else int(v)) for k, v in phases.items()},
+            'profile': stream.getvalue()
+        })
+
+
+def get_profiles() -> List[Dict[str, Any]]:
+    """최근 샘플 프로파일 (최신순)"""
+    with _profiles_lock:
+        return list(reversed(_profiles))
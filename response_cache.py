@@ -0,0 +1,149 @@
+"""
+읽기 API 응답 캐시 (프로세스 내 LRU + TTL)
+
+/api/videos, /api/stats, /api/channels, /api/channels/names 결과는 수집이나 채널 수정이
+커밋될 때만 바뀐다. 그래서 정규화한 요청 파라미터 + 데이터 버전을 키로 응답 본문을 저장한다.
+- 데이터 버전: stats_counters의 data_version / channels_version (테이블 트리거로 증가,
+  수집기 CLI 등 다른 프로세스에서 쓴 것도 반영됨)
+- TTL: 버전이 같아도 RESPONSE_CACHE_TTL초가 지나면 다시 계산 (안전장치, ViewScore 최신성 점수는
+  스냅샷 날짜 기준이라 같은 버전이면 결과가 바뀌지 않음)
+- ETag: 응답 본문 해시. GET 요청에 If-None-Match가 맞으면 본문 없이 304
+- X-Cache 헤더: HIT / MISS
+- 날짜를 생략하면 오늘(KST)을 쓰는 라우트는 today=True: 키에 오늘 날짜를 넣어 자정이 지나면
+  전날 기준 응답을 돌려주지 않음
+
+사용법:
+    @app.route('/api/stats')
+    @response_cache.cached('data_version')
+    def get_stats(): ...
+"""
+import os
+import json
+import time
+import hashlib
+import functools
+import threading
+from datetime import datetime
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+import database
+import metrics
+
+
+ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', '1') == '1'
+TTL_SECONDS = float(os.getenv('RESPONSE_CACHE_TTL', '300'))
+MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '128'))
+
+
+class LRUCache:
+    """크기 제한 + 만료 시간이 있는 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl_seconds: float = TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[Any, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            stored_at, value = item
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache = LRUCache()
+
+
+def clear() -> None:
+    """캐시 전체 비우기"""
+    _cache.clear()
+
+
+def _request_key() -> str:
+    """경로 + 정렬한 쿼리 파라미터 + 정규화한 JSON 본문 (_로 시작하는 파라미터는 제외)"""
+    from flask import request
+
+    args = sorted(
+        (name, value) for name, value in request.args.items(multi=True)
+        if not name.startswith('_')
+    )
+    body = request.get_json(silent=True) if request.method == 'POST' else None
+    return json.dumps([request.method, request.path, args, body], sort_keys=True, ensure_ascii=False)
+
+
+def _etag(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()[:20]
+
+
+def cached(*version_names: str, today: bool = False):
+    """
+    라우트 응답 캐시 데코레이터 (@app.route 아래에 붙임)
+
+    Args:
+        version_names: 응답이 의존하는 데이터 버전 ('data_version', 'channels_version')
+        today: 날짜 파라미터 기본값이 오늘(KST)인 라우트면 True (키에 오늘 날짜 포함)
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import request, make_response
+
+            if not ENABLED:
+                return view(*args, **kwargs)
+
+            endpoint = request.url_rule.rule if request.url_rule else request.path
+            key = (_request_key(), database.get_data_versions(list(version_names)))
+            if today:
+                key += (datetime.now(database.KST).strftime('%Y-%m-%d'),)
+
+            entry: Optional[Dict[str, Any]] = _cache.get(key)
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+                body = response.get_data()
+                entry = {'body': body, 'etag': _etag(body), 'content_type': response.content_type}
+                _cache.set(key, entry)
+                result = 'miss'
+            else:
+                response = make_response(entry['body'])
+                response.content_type = entry['content_type']
+                result = 'hit'
+
+            response.set_etag(entry['etag'])
+            response.headers['Cache-Control'] = 'no-cache'  # 매번 재검증 (If-None-Match → 304)
+            response.headers['X-Cache'] = result.upper()
+
+            # GET/HEAD만 304 처리 (werkzeug 규칙)
+            response.make_conditional(request)
+            if response.status_code == 304:
+                result = 'not_modified'
+
+            metrics.RESPONSE_CACHE_REQUESTS.inc(endpoint=endpoint, result=result)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,246 @@
+"""
+일별 롤업 테이블
+
+/api/stats와 트렌드 대시보드가 전체 테이블을 집계하지 않도록 미리 계산해 둔다.
+- stats_counters: 전체 비디오/스냅샷/라벨 수, 최신 스냅샷 날짜 (트리거로 자동 유지)
+- daily_rollups: (날짜, 데이터 소스, 차원, 키)별 영상 수, 총 조회수, Δviews, 점수 분위수
+  · 수집이 끝날 때마다 해당 날짜만 다시 계산 (하루치 행만 읽음)
+
+사용법:
+    python rollups.py              # 전체 날짜 롤업 재구성 (최초 도입 시)
+    python rollups.py 2025-11-06   # 특정 날짜만 재계산
+"""
+import sys
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+import database
+
+
+# 데이터 소스 (snapshots.category_id가 'channel:'로 시작하면 채널 기반)
+SOURCES = ['category', 'channel']
+
+# 롤업 차원
+DIMENSIONS = ['category', 'channel']
+
+
+def _quantiles(values: List[float]) -> Dict[str, Optional[float]]:
+    """점수 분위수 (p50, p90, max)"""
+    values = [v for v in values if v is not None]
+    if not values:
+        return {'p50': None, 'p90': None, 'max': None}
+
+    p50, p90 = np.percentile(values, [50, 90])
+    return {
+        'p50': round(float(p50), 2),
+        'p90': round(float(p90), 2),
+        'max': round(float(max(values)), 2)
+    }
+
+
+def refresh_daily_rollups(snapshot_date: str) -> int:
+    """
+    특정 날짜의 롤업 재계산 (수집 직후 호출)
+
+    Δviews는 같은 영상의 직전 스냅샷 날짜(해당 날짜 이전) 대비 증가량.
+    같은 날 여러 소스에서 잡힌 영상의 조회수는 (영상, 날짜)별 MAX (video_trends와 같은 기준).
+
+    Returns:
+        저장된 롤업 행 수
+    """
+    conn = database.get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT
+            s.video_id, s.category_id as snapshot_category_id,
+            MAX(s.view_count) OVER (PARTITION BY s.video_id) as view_count,
+            v.category_id as video_category_id, v.channel_id,
+            vs.score as view_score,
+            ss.score as senior_score,
+            (
+                SELECT MAX(prev.view_count) FROM snapshots prev
+                WHERE prev.video_id = s.video_id
+                  AND prev.snapshot_date = (
+                      SELECT MAX(p.snapshot_date) FROM snapshots p
+                      WHERE p.video_id = s.video_id AND p.snapshot_date < s.snapshot_date
+                  )
+            ) as prev_view_count
+        FROM snapshots s
+        JOIN videos v ON s.video_id = v.video_id
+        LEFT JOIN view_scores vs ON vs.snapshot_id = s.id
+        LEFT JOIN senior_scores ss ON ss.snapshot_id = s.id
+        WHERE s.snapshot_date = ?
+    """, (snapshot_date,))
+
+    # (source, dimension, key) → {video_id: row}  (같은 영상은 그룹당 1번만 집계)
+    groups: Dict[tuple, Dict[str, Dict[str, Any]]] = {}
+    for row in cursor.fetchall():
+        row = dict(row)
+        if row['snapshot_category_id'].startswith('channel:'):
+            source = 'channel'
+            category_key = row['video_category_id'] or ''
+        else:
+            source = 'category'
+            category_key = row['snapshot_category_id']
+
+        groups.setdefault((source, 'category', category_key), {})[row['video_id']] = row
+        groups.setdefault((source, 'channel', row['channel_id']), {})[row['video_id']] = row
+
+    rollup_rows = []
+    for (source, dimension, key), videos in groups.items():
+        rows = list(videos.values())
+        view_quantiles = _quantiles([r['view_score'] for r in rows])
+        senior_quantiles = _quantiles([r['senior_score'] for r in rows])
+        delta_views = sum(
+            (r['view_count'] or 0) - r['prev_view_count']
+            for r in rows if r['prev_view_count'] is not None
+        )
+
+        rollup_rows.append((
+            snapshot_date, source, dimension, key,
+            len(rows),
+            sum(r['view_count'] or 0 for r in rows),
+            delta_views,
+            view_quantiles['p50'], view_quantiles['p90'], view_quantiles['max'],
+            senior_quantiles['p50'], senior_quantiles['p90']
+        ))
+
+    cursor.execute("DELETE FROM daily_rollups WHERE rollup_date = ?", (snapshot_date,))
+    cursor.executemany("""
+        INSERT INTO daily_rollups
+        (rollup_date, source, dimension, dim_key,
+         video_count, total_views, delta_views,
+         score_p50, score_p90, score_max, senior_p50, senior_p90)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, rollup_rows)
+
+    conn.commit()
+    conn.close()
+    return len(rollup_rows)
+
+
+def rebuild_all() -> int:
+    """
+    전체 날짜 롤업 재구성 + 카운터 재계산
+
+    보존 기간 압축(snapshot_retention.py)으로 weekly 행만 남은 날짜는 일별 행이 없어
+    다시 계산하면 값이 줄어드므로, 이미 롤업이 있으면 그대로 둔다.
+    """
+    reset_counters()
+
+    conn = database.get_connection()
+    dates = [row['snapshot_date'] for row in conn.execute("""
+        SELECT DISTINCT s.snapshot_date FROM snapshots s
+        WHERE s.resolution = 'daily'
+           OR NOT EXISTS (SELECT 1 FROM daily_rollups r WHERE r.rollup_date = s.snapshot_date)
+        ORDER BY s.snapshot_date
+    """).fetchall()]
+    conn.close()
+
+    total = 0
+    for snapshot_date in dates:
+        total += refresh_daily_rollups(snapshot_date)
+
+    print(f"[OK] 롤업 재구성: {len(dates)}일, {total}행")
+    return total
+
+
+def reset_counters() -> None:
+    """stats_counters를 실제 테이블 값으로 다시 맞춤 (전체 집계 1회)"""
+    conn = database.get_connection()
+    conn.execute("""
+        INSERT OR REPLACE INTO stats_counters (name, value, text_value)
+        VALUES
+            ('total_videos', (SELECT COUNT(*) FROM videos), NULL),
+            ('total_snapshots', (SELECT COUNT(*) FROM snapshots), NULL),
+            ('total_labels', (SELECT COUNT(*) FROM labels), NULL),
+            ('total_labeling_queue', (SELECT COUNT(*) FROM labeling_queue), NULL),
+            ('latest_snapshot_date', NULL, (SELECT MAX(snapshot_date) FROM snapshots))
+    """)
+    conn.commit()
+    conn.close()
+
+
+def get_stats() -> Dict[str, Any]:
+    """전체 통계 (카운터 테이블에서 O(1) 조회)"""
+    conn = database.get_connection()
+    rows = conn.execute("SELECT name, value, text_value FROM stats_counters").fetchall()
+    conn.close()
+
+    counters = {row['name']: row for row in rows}
+
+    def value(name):
+        return counters[name]['value'] if name in counters else 0
+
+    latest = counters.get('latest_snapshot_date')
+
+    return {
+        'total_videos': value('total_videos'),
+        'total_snapshots': value('total_snapshots'),
+        'total_labels': value('total_labels'),
+        'latest_snapshot_date': latest['text_value'] if latest else None
+    }
+
+
+def get_trends(
+    dimension: str,
+    source: str = 'all',
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    keys: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    롤업 기반 트렌드 조회
+
+    Args:
+        dimension: 'category' 또는 'channel'
+        source: 'category', 'channel', 'all' (all이면 소스별 행을 그대로 반환)
+        start_date, end_date: 조회 기간 (YYYY-MM-DD, 포함)
+        keys: 특정 카테고리 ID / 채널 ID만 (None이면 전체)
+
+    Returns:
+        날짜순 롤업 행 리스트
+    """
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"알 수 없는 차원입니다: {dimension}")
+
+    where = ["dimension = ?"]
+    params: List[Any] = [dimension]
+
+    if source in SOURCES:
+        where.append("source = ?")
+        params.append(source)
+    if start_date:
+        where.append("rollup_date >= ?")
+        params.append(start_date)
+    if end_date:
+        where.append("rollup_date <= ?")
+        params.append(end_date)
+    if keys:
+        where.append(f"dim_key IN ({','.join(['?' for _ in keys])})")
+        params.extend(keys)
+
+    conn = database.get_connection()
+    rows = conn.execute(f"""
+        SELECT rollup_date, source, dim_key, video_count, total_views, delta_views,
+               score_p50, score_p90, score_max, senior_p50, senior_p90
+        FROM daily_rollups
+        WHERE {' AND '.join(where)}
+        ORDER BY rollup_date, source, dim_key
+    """, tuple(params)).fetchall()
+    conn.close()
+
+    return [dict(row) for row in rows]
+
+
+if __name__ == '__main__':
+    database.init_database()
+
+    if len(sys.argv) > 1:
+        for date_arg in sys.argv[1:]:
+            count = refresh_daily_rollups(date_arg)
+            print(f"[OK] {date_arg}: {count}행")
+    else:
+        rebuild_all()
@@ -6,9 +6,12 @@ import re
 import isodate
 from typing import Dict, Any, List, Optional
 
+import keyword_dictionary
+
 
 # ============================================================
 # 시니어 키워드 사전 (초안)
+# 기본값(DB 시드용) - 실제 점수 계산은 keyword_dictionary의 DB 사전 사용
 # ============================================================
 
 SENIOR_KEYWORDS = {
@@ -110,6 +113,17 @@ ZGEN_MEMES = [
 ]
 
 
+# 기본 가중치 (수동 설정, weight_trainer로 학습한 버전이 있으면 그것을 사용)
+DEFAULT_SENIOR_WEIGHTS = {
+    'keyword': 1.0,
+    'genre': 1.5,
+    'comment': 0.5,
+    'channel': 1.0,
+    'length': 0.8,
+    'zgen': 1.0,
+}
+
+
 # ============================================================
 # 점수 계산 함수들
 # ============================================================
@@ -124,20 +138,18 @@ def calculate_keyword_score(text: str) -> tuple[float, List[str]]:
     if not text:
         return 0.0, []
 
-    text_lower = text.lower()
+    matcher = keyword_dictionary.get_matcher()
     score = 0.0
     matched_keywords = []
 
-    for keyword, weight in SENIOR_KEYWORDS.items():
-        if keyword in text:
-            score += weight
-            matched_keywords.append(keyword)
+    for keyword in matcher.senior_keywords.find(text):
+        score += matcher.senior_keywords.weights[keyword]
+        matched_keywords.append(keyword)
 
     # 트로트 가수명 체크
-    for artist in TROT_ARTISTS:
-        if artist in text:
-            score += 3.0
-            matched_keywords.append(f"트로트:{artist}")
+    for artist in matcher.trot_artists.find(text):
+        score += matcher.trot_artists.weights[artist]
+        matched_keywords.append(f"트로트:{artist}")
 
     return score, matched_keywords
 
@@ -185,17 +197,17 @@ def calculate_comment_score(comments: List[Dict[str, Any]]) -> tuple[float, List
     if not comments:
         return 0.0, []
 
+    indicators = keyword_dictionary.get_matcher().comment_age_indicators
     score = 0.0
     matched_indicators = []
 
     for comment in comments[:50]:  # 상위 50개만 체크
         text = comment.get('text', '')
 
-        for indicator, weight in COMMENT_AGE_INDICATORS.items():
-            if indicator in text:
-                score += weight * 0.1  # 댓글은 가중치 낮게
-                if indicator not in matched_indicators:
-                    matched_indicators.append(indicator)
+        for indicator in indicators.find(text):
+            score += indicators.weights[indicator] * 0.1  # 댓글은 가중치 낮게
+            if indicator not in matched_indicators:
+                matched_indicators.append(indicator)
 
     return score, matched_indicators
 
@@ -212,8 +224,9 @@ def calculate_channel_score(channel_id: str, subscriber_count: int) -> float:
         채널 점수
     """
     # 화이트리스트/블랙리스트 체크
-    if channel_id in SENIOR_FRIENDLY_CHANNELS:
-        return SENIOR_FRIENDLY_CHANNELS[channel_id] * 5.0
+    friendly_channels = keyword_dictionary.get_matcher().senior_friendly_channels
+    if channel_id in friendly_channels:
+        return friendly_channels[channel_id] * 5.0
 
     # 구독자 수 기반 보정 (작은 채널 발굴 장려)
     if subscriber_count < 10000:
@@ -260,15 +273,15 @@ def check_zgen_penalty(title: str, description: str) -> tuple[float, List[str]]:
     Returns:
         (감점 점수, 매칭된 밈 리스트)
     """
+    memes = keyword_dictionary.get_matcher().zgen_memes
     combined = title + ' ' + description
     penalty = 0.0
     matched_memes = []
 
-    for meme in ZGEN_MEMES:
+    for meme in memes.find(combined):
         count = combined.count(meme)
-        if count > 0:
-            penalty -= count * 0.5
-            matched_memes.append(meme)
+        penalty -= count * memes.weights[meme]
+        matched_memes.append(meme)
 
     return penalty, matched_memes
 
@@ -279,7 +292,8 @@ def check_zgen_penalty(title: str, description: str) -> tuple[float, List[str]]:
 
 def calculate_senior_score(
     video_data: Dict[str, Any],
-    comments: Optional[List[Dict[str, Any]]] = None
+    comments: Optional[List[Dict[str, Any]]] = None,
+    weights: Optional[Dict[str, float]] = None
 ) -> Dict[str, Any]:
     """
     시니어 점수 계산 (규칙 기반 v0)
@@ -287,6 +301,7 @@ def calculate_senior_score(
     Args:
         video_data: 비디오 정보 (youtube_api에서 반환)
         comments: 댓글 리스트 (선택)
+        weights: 가중치 딕셔너리 (기본값: DEFAULT_SENIOR_WEIGHTS)
 
     Returns:
         {
@@ -296,6 +311,8 @@ def calculate_senior_score(
             'comment_score': 댓글 점수,
             'channel_score': 채널 점수,
             'length_score': 길이 점수,
+            'zgen_penalty': Z세대 밈 감점,
+            'dictionary_version': 계산에 사용한 키워드 사전 버전,
             'highlights': {
                 'matched_keywords': [...],
                 'matched_genres': [...],
@@ -305,6 +322,8 @@ def calculate_senior_score(
             }
         }
     """
+    dictionary_version = keyword_dictionary.get_matcher().version
+
     title = video_data.get('title', '')
     description = video_data.get('description', '')
     tags = video_data.get('tags', [])
@@ -340,14 +359,8 @@ def calculate_senior_score(
     zgen_penalty, zgen_memes = check_zgen_penalty(title, description)
 
     # 최종 점수 계산 (가중치 적용)
-    # w1*키워드 + w2*장르 + w3*댓글 + w4*채널 + w5*길이 + 감점
-    weights = {
-        'keyword': 1.0,
-        'genre': 1.5,
-        'comment': 0.5,
-        'channel': 1.0,
-        'length': 0.8,
-    }
+    # w1*키워드 + w2*장르 + w3*댓글 + w4*채널 + w5*길이 + w6*감점
+    weights = {**DEFAULT_SENIOR_WEIGHTS, **(weights or {})}
 
     total_score = (
         keyword_score * weights['keyword'] +
@@ -355,7 +368,7 @@ def calculate_senior_score(
         comment_score * weights['comment'] +
         channel_score * weights['channel'] +
         length_score * weights['length'] +
-        zgen_penalty
+        zgen_penalty * weights['zgen']
     )
 
     return {
@@ -366,6 +379,8 @@ def calculate_senior_score(
         'comment_score': round(comment_score, 2),
         'channel_score': round(channel_score, 2),
         'length_score': round(length_score, 2),
+        'zgen_penalty': round(zgen_penalty, 2),
+        'dictionary_version': dictionary_version,
         'highlights': {
             'matched_keywords': matched_keywords,
             'matched_genres': matched_genres,
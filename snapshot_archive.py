@@ -0,0 +1,253 @@
+"""
+일별 스냅샷 아카이브 (gzip 스트리밍 JSONL)
+
+수집 중 영상 1개가 저장될 때마다 바로 압축 파일에 기록한다.
+- 파일: data/YYYY-MM-DD/snapshots_<source>.jsonl.gz  (source: 'category' 또는 'channel')
+- 레코드 2종류 (한 줄에 JSON 1개)
+  · {"type": "video", ...}: 정적 메타데이터 (제목, 설명, 태그 등) - 파일당 영상별 1번만
+  · {"type": "snapshot", ...}: 그날의 조회수/좋아요/댓글/순위 + ViewScore/SeniorScore
+- (영상, 날짜, 수집 출처) 중복 제거: 같은 날 다시 수집해도 이미 기록된 스냅샷은 건너뜀
+- 주기적으로 flush하므로 수집 중 프로세스가 죽어도 그때까지 쓴 행은 읽을 수 있음
+  (다음 실행 시 잘린 부분을 정리하고 이어서 기록)
+- 같은 파일에 쓰는 수집은 파일 잠금(.lock)으로 한 번에 하나씩 (웹 워커 여러 개 + 수집 CLI)
+
+읽기는 제너레이터라 하루치를 재생해도 전체 리스트를 만들지 않는다.
+기존 videos.jsonl / videos_channels.jsonl 파일도 같은 형태로 읽을 수 있다.
+"""
+import os
+import gzip
+import json
+import zlib
+from typing import Dict, Any, Iterator, List, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 동작
+    fcntl = None
+
+# 데이터 소스별 아카이브 파일 (rollups.SOURCES와 동일)
+SOURCES = ['category', 'channel']
+
+# 이전 형식 (비압축 JSONL, 영상 dict 전체를 한 줄씩)
+LEGACY_FILES = {
+    'category': 'videos.jsonl',
+    'channel': 'videos_channels.jsonl',
+}
+
+# 스냅샷마다 달라지는 필드 (나머지는 정적 메타데이터)
+SNAPSHOT_FIELDS = ['view_count', 'like_count', 'comment_count', 'rank_position']
+
+# 수집 시 붙는 계산 결과 필드
+SCORE_FIELDS = ['view_score', 'senior_score']
+
+# 몇 행마다 flush할지 (작을수록 안전, 클수록 압축률 ↑)
+FLUSH_EVERY = 50
+
+
+def get_archive_path(snapshot_date: str, source: str, data_dir: str = 'data') -> str:
+    return f'{data_dir}/{snapshot_date}/snapshots_{source}.jsonl.gz'
+
+
+def _read_lines(path: str) -> Iterator[str]:
+    """gzip 파일 줄 단위 읽기 (중간에 잘린 파일은 읽을 수 있는 데까지만)"""
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.endswith('\n'):
+                    yield line
+    except (EOFError, gzip.BadGzipFile, zlib.error):
+        print(f"⚠️  아카이브 끝부분이 손상됨 (읽을 수 있는 데까지만 사용): {path}")
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    """아카이브 원본 레코드 읽기 (제너레이터)"""
+    for line in _read_lines(path):
+        yield json.loads(line)
+
+
+class SnapshotArchiveWriter:
+    """
+    하루치 스냅샷 아카이브 쓰기
+
+    사용법:
+        with SnapshotArchiveWriter(snapshot_date, 'category') as archive:
+            archive.write(video, snapshot_category_id)
+    """
+
+    def __init__(self, snapshot_date: str, source: str, data_dir: str = 'data'):
+        if source not in SOURCES:
+            raise ValueError(f"알 수 없는 데이터 소스입니다: {source}")
+
+        self.snapshot_date = snapshot_date
+        self.source = source
+        self.path = get_archive_path(snapshot_date, source, data_dir)
+        self.written = 0
+
+        self._seen_videos: Set[str] = set()
+        self._seen_snapshots: Set[Tuple[str, str]] = set()
+        self._pending = 0
+        self._file = None
+        self._lock_file = None
+
+    def __enter__(self) -> 'SnapshotArchiveWriter':
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def open(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        # 다른 프로세스가 같은 파일에 쓰는 중이면 끝날 때까지 대기 (중복 제거 키를 잠금 후에 읽음)
+        if fcntl is not None:
+            self._lock_file = open(self.path + '.lock', 'w')
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+
+        if os.path.exists(self.path):
+            self._load_existing()
+
+        # 이어쓰기 = 새 gzip 멤버 추가 (gzip 리더는 여러 멤버를 이어서 읽음)
+        self._file = gzip.open(self.path, 'at', encoding='utf-8')
+
+    def _load_existing(self) -> None:
+        """이미 기록된 영상/스냅샷 키 로드, 잘린 파일은 온전한 행만 남겨 다시 씀"""
+        intact_lines = []
+        damaged = False
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.endswith('\n'):
+                        intact_lines.append(line)
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            damaged = True
+
+        for line in intact_lines:
+            record = json.loads(line)
+            if record['type'] == 'video':
+                self._seen_videos.add(record['video_id'])
+            else:
+                self._seen_snapshots.add((record['video_id'], record['snapshot_category_id']))
+
+        if damaged:
+            print(f"⚠️  손상된 아카이브 복구: {self.path} ({len(intact_lines)}행 유지)")
+            tmp_path = self.path + '.tmp'
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                f.writelines(intact_lines)
+            os.replace(tmp_path, self.path)
+
+    def _write_record(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def write(self, video: Dict[str, Any], snapshot_category_id: str) -> bool:
+        """
+        수집된 영상 1개 기록
+
+        Args:
+            video: 수집 결과 영상 dict (view_score, senior_score 포함 가능)
+            snapshot_category_id: snapshots.category_id (카테고리 ID 또는 'channel:<채널 ID>')
+
+        Returns:
+            기록했으면 True, 이미 있는 (영상, 출처) 스냅샷이면 False
+        """
+        video_id = video['video_id']
+        key = (video_id, snapshot_category_id)
+        if key in self._seen_snapshots:
+            return False
+
+        if video_id not in self._seen_videos:
+            metadata = {
+                k: v for k, v in video.items()
+                if k not in SNAPSHOT_FIELDS and k not in SCORE_FIELDS
+            }
+            self._write_record({'type': 'video', **metadata})
+            self._seen_videos.add(video_id)
+
+        snapshot = {
+            'type': 'snapshot',
+            'video_id': video_id,
+            'snapshot_date': self.snapshot_date,
+            'snapshot_category_id': snapshot_category_id,
+        }
+        for field in SNAPSHOT_FIELDS + SCORE_FIELDS:
+            if field in video:
+                snapshot[field] = video[field]
+        self._write_record(snapshot)
+        self._seen_snapshots.add(key)
+
+        self.written += 1
+        self._pending += 1
+        if self._pending >= FLUSH_EVERY:
+            self.flush()
+
+        return True
+
+    def flush(self) -> None:
+        """지금까지 쓴 행을 디스크에 반영 (Z_SYNC_FLUSH + fsync)"""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+
+def iter_snapshots(
+    snapshot_date: str,
+    source: str = 'all',
+    data_dir: str = 'data'
+) -> Iterator[Dict[str, Any]]:
+    """
+    하루치 스냅샷 재생 (제너레이터)
+
+    정적 메타데이터와 스냅샷을 합친 영상 dict를 수집 당시 순서대로 돌려준다.
+    (예전 JSONL 행과 같은 형태 + 'snapshot_category_id')
+    아카이브가 없고 이전 형식 JSONL만 있으면 그 파일을 읽는다.
+
+    Args:
+        snapshot_date: 날짜 (YYYY-MM-DD)
+        source: 'category', 'channel', 'all'
+    """
+    sources = SOURCES if source == 'all' else [source]
+
+    for src in sources:
+        archive_path = get_archive_path(snapshot_date, src, data_dir)
+        legacy_path = f'{data_dir}/{snapshot_date}/{LEGACY_FILES[src]}'
+
+        if os.path.exists(archive_path):
+            metadata: Dict[str, Dict[str, Any]] = {}  # 그날 고유 영상 수만큼만 유지
+            for record in iter_records(archive_path):
+                record_type = record.pop('type')
+                if record_type == 'video':
+                    metadata[record['video_id']] = record
+                else:
+                    yield {**metadata.get(record['video_id'], {}), **record}
+
+        elif os.path.exists(legacy_path):
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    yield json.loads(line)
+
+
+def list_archived_dates(data_dir: str = 'data') -> List[str]:
+    """아카이브(또는 이전 형식 JSONL)가 있는 날짜 목록 (오름차순)"""
+    if not os.path.isdir(data_dir):
+        return []
+
+    filenames = [f'snapshots_{src}.jsonl.gz' for src in SOURCES] + list(LEGACY_FILES.values())
+    dates = []
+    for name in sorted(os.listdir(data_dir)):
+        day_dir = f'{data_dir}/{name}'
+        if os.path.isdir(day_dir) and any(os.path.exists(f'{day_dir}/{fn}') for fn in filenames):
+            dates.append(name)
+    return dates
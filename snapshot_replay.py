@@ -0,0 +1,253 @@
+"""
+스냅샷 아카이브 재생 (오프라인 백필)
+
+data/YYYY-MM-DD/의 스냅샷 아카이브(이전 형식 JSONL 포함)를 수집 파이프라인에
+다시 흘려 DB를 재구성한다. YouTube API는 호출하지 않는다 (쿼터 0).
+- 날짜마다 연결 1개, REPLAY_COMMIT_EVERY행마다 커밋 (영상마다 연결/커밋 X)
+- 멱등: snapshots의 UNIQUE(video_id, snapshot_date, category_id)로 이미 있는 행은 건너뜀
+- 점수는 아카이브에 저장된 값이 아니라 현재 계산기/활성 가중치/키워드 사전으로 다시 계산
+- 채널 정보(구독자 수)는 channel_snapshots의 그 날짜 기준 값 사용 (as-of)
+  DB를 잃어 채널 기록이 없으면 아카이브의 view_score.metadata.raw_subscriber_count로
+  channels / channel_snapshots를 다시 채운 뒤 조회 (수집 당시 ViewScore 재현)
+- 끝나면 재생한 날짜의 롤업과 라벨링 큐를 한 번에 갱신
+
+사용법:
+    python snapshot_replay.py                          # 아카이브 전체 재생
+    python snapshot_replay.py 2025-11-05 2025-11-06    # 특정 날짜만
+    python snapshot_replay.py --start 2025-11-01 --rescore   # 기존 스냅샷 점수도 다시 계산
+"""
+import json
+import argparse
+from typing import Dict, Any, List, Optional, Tuple
+
+import database
+import view_score_calculator
+import senior_classifier
+import weight_trainer
+import labeling_queue
+import rollups
+import video_trends
+import snapshot_archive
+
+
+# 몇 행마다 커밋할지
+REPLAY_COMMIT_EVERY = 500
+
+
+def _snapshot_category_id(video: Dict[str, Any], source: str) -> str:
+    """snapshots.category_id (이전 형식 JSONL에는 없으므로 소스로 추정)"""
+    if video.get('snapshot_category_id'):
+        return video['snapshot_category_id']
+    if source == 'channel':
+        return f"channel:{video['channel_id']}"
+    return video.get('category_id', '')
+
+
+def _archived_subscriber_count(video: Dict[str, Any]) -> Optional[int]:
+    """수집 당시 ViewScore 계산에 쓴 구독자 수 (아카이브의 view_score 메타데이터, 없으면 None)"""
+    view_score = video.get('view_score')
+    if not isinstance(view_score, dict):
+        return None
+    subscriber_count = (view_score.get('metadata') or {}).get('raw_subscriber_count')
+    return subscriber_count if subscriber_count else None  # 0 = 수집 당시에도 채널 정보 없음
+
+
+def _restore_channel_snapshot(conn, video: Dict[str, Any], snapshot_date: str, subscriber_count: int) -> None:
+    """아카이브 값으로 channels / channel_snapshots 복원 (이미 있는 행은 그대로)"""
+    conn.execute("""
+        INSERT OR IGNORE INTO channels (channel_id, channel_title, subscriber_count, senior_weight)
+        VALUES (?, ?, ?, 1.0)
+    """, (video['channel_id'], video.get('channel_title', ''), subscriber_count))
+    conn.execute("""
+        INSERT OR IGNORE INTO channel_snapshots (channel_id, snapshot_date, subscriber_count)
+        VALUES (?, ?, ?)
+    """, (video['channel_id'], snapshot_date, subscriber_count))
+
+
+def replay_date(
+    snapshot_date: str,
+    source: str = 'all',
+    rescore: bool = False,
+    senior_weights: Optional[Dict[str, float]] = None,
+    channel_cache: Optional[Dict[Tuple[str, str], Optional[Dict[str, Any]]]] = None,
+    data_dir: str = 'data'
+) -> Dict[str, int]:
+    """
+    하루치 아카이브를 DB에 재생
+
+    Args:
+        snapshot_date: 날짜 (YYYY-MM-DD)
+        source: 'category', 'channel', 'all'
+        rescore: True면 이미 있는 스냅샷도 점수를 지우고 다시 계산
+        senior_weights: SeniorScore 가중치 (None이면 활성 버전)
+        channel_cache: (채널 ID, 날짜)별 채널 정보 캐시 (여러 날짜 재생 시 공유)
+
+    Returns:
+        {'rows': 읽은 행, 'inserted': 새 스냅샷, 'rescored': 점수 재계산, 'skipped': 건너뜀}
+    """
+    if senior_weights is None:
+        senior_weights = weight_trainer.get_active_weights('senior')
+    if channel_cache is None:
+        channel_cache = {}
+
+    stats = {'rows': 0, 'inserted': 0, 'rescored': 0, 'skipped': 0}
+    restored_channels = set()  # 이 날짜에 아카이브 값으로 채널 통계를 복원한 채널
+    reference_time = view_score_calculator.snapshot_reference_time(snapshot_date)
+    sources = snapshot_archive.SOURCES if source == 'all' else [source]
+
+    conn = database.get_connection()
+    cursor = conn.cursor()
+
+    for src in sources:
+        for video in snapshot_archive.iter_snapshots(snapshot_date, src, data_dir=data_dir):
+            stats['rows'] += 1
+
+            snapshot_data = {
+                'video_id': video['video_id'],
+                'category_id': _snapshot_category_id(video, src),
+                'snapshot_date': snapshot_date,
+                'view_count': video.get('view_count', 0),
+                'like_count': video.get('like_count', 0),
+                'comment_count': video.get('comment_count', 0),
+                'rank_position': video.get('rank_position', 0)
+            }
+
+            # 1. 비디오 + 스냅샷 (UNIQUE 키로 멱등)
+            database.insert_video(video, conn=conn)
+            snapshot_id = database.insert_snapshot(snapshot_data, conn=conn)
+
+            if snapshot_id is None:
+                if not rescore:
+                    stats['skipped'] += 1
+                    continue
+
+                row = cursor.execute("""
+                    SELECT id FROM snapshots
+                    WHERE video_id = ? AND snapshot_date = ? AND category_id = ?
+                """, (snapshot_data['video_id'], snapshot_date, snapshot_data['category_id'])).fetchone()
+                snapshot_id = row['id']
+                cursor.execute("DELETE FROM view_scores WHERE snapshot_id = ?", (snapshot_id,))
+                cursor.execute("DELETE FROM senior_scores WHERE snapshot_id = ?", (snapshot_id,))
+                stats['rescored'] += 1
+            else:
+                stats['inserted'] += 1
+
+            # 2. 채널 정보 (그 날짜 기준 구독자 수, API 호출 없음)
+            channel_id = video['channel_id']
+            cache_key = (channel_id, snapshot_date)
+
+            # 채널 통계가 없는 날짜는 아카이브 값으로 복원 (DB를 잃었을 때 ViewScore 재현)
+            subscriber_count = _archived_subscriber_count(video)
+            if subscriber_count is not None and channel_id not in restored_channels:
+                _restore_channel_snapshot(conn, video, snapshot_date, subscriber_count)
+                restored_channels.add(channel_id)
+                channel_cache.pop(cache_key, None)
+
+            if cache_key not in channel_cache:
+                channel_cache[cache_key] = database.get_channels_as_of([channel_id], snapshot_date, conn=conn).get(channel_id)
+
+            # 3. 현재 계산기로 점수 계산 및 저장
+            view_score_result = view_score_calculator.calculate_view_score(
+                video_data=video,
+                snapshot_data=snapshot_data,
+                channel_data=channel_cache[cache_key],
+                reference_time=reference_time
+            )
+            view_score_result['snapshot_id'] = snapshot_id
+            database.insert_view_score(view_score_result, conn=conn)
+
+            senior_score_result = senior_classifier.calculate_senior_score(video, weights=senior_weights)
+            senior_score_result['snapshot_id'] = snapshot_id
+            database.insert_senior_score(senior_score_result, conn=conn)
+
+            if (stats['inserted'] + stats['rescored']) % REPLAY_COMMIT_EVERY == 0:
+                conn.commit()
+
+    conn.commit()
+    conn.close()
+    return stats
+
+
+def replay(
+    dates: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    source: str = 'all',
+    rescore: bool = False,
+    data_dir: str = 'data'
+) -> Dict[str, Any]:
+    """
+    여러 날짜 아카이브 재생 (날짜 오름차순)
+
+    Args:
+        dates: 재생할 날짜 (None이면 아카이브가 있는 모든 날짜)
+        start_date, end_date: 날짜 범위 (YYYY-MM-DD, 포함)
+        source: 'category', 'channel', 'all'
+        rescore: 이미 있는 스냅샷도 점수 재계산
+
+    Returns:
+        재생 결과 통계
+    """
+    if dates is None:
+        dates = snapshot_archive.list_archived_dates(data_dir)
+    dates = sorted(
+        d for d in dates
+        if (not start_date or d >= start_date) and (not end_date or d <= end_date)
+    )
+
+    senior_weights = weight_trainer.get_active_weights('senior')
+    channel_cache: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+
+    totals = {'dates': len(dates), 'rows': 0, 'inserted': 0, 'rescored': 0, 'skipped': 0}
+    changed_dates: List[str] = []
+
+    for snapshot_date in dates:
+        day_stats = replay_date(
+            snapshot_date, source=source, rescore=rescore,
+            senior_weights=senior_weights, channel_cache=channel_cache, data_dir=data_dir
+        )
+        if day_stats['inserted'] or day_stats['rescored']:
+            rollups.refresh_daily_rollups(snapshot_date)
+            video_trends.refresh_trends(snapshot_date)
+            changed_dates.append(snapshot_date)
+
+        for key in ['rows', 'inserted', 'rescored', 'skipped']:
+            totals[key] += day_stats[key]
+        print(f"  🔁 {snapshot_date}: 읽음 {day_stats['rows']}, 추가 {day_stats['inserted']}, "
+              f"재계산 {day_stats['rescored']}, 건너뜀 {day_stats['skipped']}")
+
+    # 과거 날짜를 채웠으면 그 뒤 창(14일) 안의 이미 있던 날짜도 추세 재계산 (날짜 오름차순)
+    if changed_dates:
+        for snapshot_date in video_trends.get_dependent_dates(changed_dates):
+            if snapshot_date not in changed_dates:
+                video_trends.refresh_trends(snapshot_date)
+
+    # 라벨링 큐는 마지막에 한 번만 재구성 (영상별 최신 점수 기준)
+    if totals['inserted'] or totals['rescored']:
+        labeling_queue.rebuild()
+
+    print(f"\n✅ 재생 완료: {totals['dates']}일, 추가 {totals['inserted']}개, "
+          f"재계산 {totals['rescored']}개, 건너뜀 {totals['skipped']}개")
+    return totals
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='스냅샷 아카이브 재생 (오프라인 백필)')
+    parser.add_argument('dates', nargs='*', help='재생할 날짜 (YYYY-MM-DD), 생략하면 전체')
+    parser.add_argument('--start', default=None, help='시작 날짜 (포함)')
+    parser.add_argument('--end', default=None, help='끝 날짜 (포함)')
+    parser.add_argument('--source', choices=['category', 'channel', 'all'], default='all')
+    parser.add_argument('--rescore', action='store_true', help='이미 있는 스냅샷도 점수 재계산')
+    parser.add_argument('--data-dir', default='data', help='아카이브 폴더')
+    args = parser.parse_args()
+
+    database.init_database()
+    result = replay(
+        dates=args.dates or None,
+        start_date=args.start,
+        end_date=args.end,
+        source=args.source,
+        rescore=args.rescore,
+        data_dir=args.data_dir
+    )
+    print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -0,0 +1,379 @@
+"""
+스냅샷 보존 기간 관리 및 압축 (compaction)
+
+snapshots는 영상 × 카테고리 × 날짜마다 한 행씩 계속 늘어나지만,
+오래된 날짜는 Δviews 계산용으로 주 단위 해상도면 충분하다.
+- 최근 RETENTION_DAYS일: 일별 행 그대로 유지
+- 그 이전: (영상, 카테고리)별·주별(월요일 시작)로 가장 늦은 스냅샷 1행만 남김 (resolution='weekly')
+  · 같은 영상이 카테고리와 channel:<id>로 모두 잡혔으면 소스별 행이 각각 남음
+  · daily_rollups는 압축 전(일별 행 기준) 값을 그대로 유지 (롤업이 없는 날짜만 삭제 전에 계산)
+- 남은 스냅샷이 없는 (영상, 날짜)의 video_trends 행도 함께 삭제
+- channel_snapshots도 채널별·주별로 가장 늦은 1행만 남김 (구독자 수 as-of 조회는 주 해상도)
+- 지운 원본 행(스냅샷 + ViewScore + SeniorScore + 추세, 채널 통계)은 data/archive/에 gzip JSONL로 보관
+
+온라인 실행 안전성:
+- 주 단위로 짧은 트랜잭션을 나눠 처리 (수집/조회와 동시에 실행 가능)
+- 아카이브 파일을 먼저 쓰고 flush한 뒤에 DB에서 삭제 (중간에 멈춰도 데이터 손실 없음)
+- 아카이브는 주별 파일을 임시 파일에 다시 쓰고 rename (행 키로 중복 제거),
+  삭제 전에 멈춘 뒤 다시 실행해도 같은 행이 두 번 들어가지 않음
+- 삭제된 페이지는 SQLite가 이후 INSERT에 재사용하므로 DB 파일 크기는 거의 일정하게 유지됨
+  (파일 자체를 줄이려면 --vacuum)
+
+사용법:
+    python snapshot_retention.py                      # 기본 보존 기간 (90일)
+    python snapshot_retention.py --retention-days 60 --dry-run
+"""
+import os
+import gzip
+import json
+import argparse
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, List, Optional
+
+import database
+import rollups
+
+
+# 일별 행을 유지할 기간 (일)
+RETENTION_DAYS = int(os.getenv('SNAPSHOT_RETENTION_DAYS', '90'))
+
+# 원본 행 보관 폴더
+ARCHIVE_DIR = 'data/archive'
+
+# 한 번의 IN (...) 쿼리에 넣을 최대 ID 수
+DELETE_BATCH_SIZE = 500
+
+
+def _week_start(date_str: str) -> str:
+    """해당 날짜가 속한 주의 월요일 (YYYY-MM-DD)"""
+    date = datetime.strptime(date_str, '%Y-%m-%d')
+    return (date - timedelta(days=date.weekday())).strftime('%Y-%m-%d')
+
+
+def _chunks(items: List[Any], size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _fetch_by_ids(cursor, table: str, column: str, ids: List[int]) -> List[Dict[str, Any]]:
+    """ID 리스트로 행 조회 (배치)"""
+    rows = []
+    for batch in _chunks(ids, DELETE_BATCH_SIZE):
+        placeholders = ','.join(['?' for _ in batch])
+        cursor.execute(f"SELECT * FROM {table} WHERE {column} IN ({placeholders})", tuple(batch))
+        rows.extend(dict(row) for row in cursor.fetchall())
+    return rows
+
+
+def _rollup_totals(cursor, start_date: str, end_date: str) -> tuple:
+    """기간 안 daily_rollups 요약 (행 수, 영상 수, 조회수, Δviews 합계)"""
+    row = cursor.execute("""
+        SELECT COUNT(*), SUM(video_count), SUM(total_views), SUM(delta_views)
+        FROM daily_rollups WHERE rollup_date BETWEEN ? AND ?
+    """, (start_date, end_date)).fetchone()
+    return tuple(row)
+
+
+def _snapshot_record_key(record: Dict[str, Any]) -> str:
+    return str(record['snapshot']['id'])
+
+
+def _row_key(record: Dict[str, Any]) -> str:
+    """video_trends / channel_snapshots 행 키 (ID|날짜)"""
+    return f"{record.get('video_id') or record.get('channel_id')}|{record['snapshot_date']}"
+
+
+def _archive_rows(
+    archive_dir: str,
+    name: str,
+    week_start: str,
+    records: List[Dict[str, Any]],
+    record_key: Callable[[Dict[str, Any]], str]
+) -> str:
+    """
+    원본 행을 gzip JSONL로 보관 (주별 파일)
+
+    기존 파일 + 새 행을 record_key로 중복 제거해 임시 파일에 쓰고 fsync 후 rename하므로,
+    같은 주를 다시 보관해도(삭제 전에 멈춘 뒤 재실행) 행이 중복되지 않고 파일이 깨지지 않는다.
+
+    Returns:
+        아카이브 파일 경로
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    archive_file = f'{archive_dir}/{name}_{week_start}.jsonl.gz'
+
+    merged: Dict[str, Dict[str, Any]] = {}
+    if os.path.exists(archive_file):
+        for record in read_archive(archive_file):
+            merged[record_key(record)] = record
+    for record in records:
+        merged[record_key(record)] = record
+
+    temp_file = archive_file + '.tmp'
+    with gzip.open(temp_file, 'wt', encoding='utf-8') as f:
+        for record in merged.values():
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, archive_file)
+
+    return archive_file
+
+
+def _compact_channel_week(conn, week_start: str, range_end: str, archive_dir: str, dry_run: bool) -> int:
+    """
+    한 주의 channel_snapshots를 채널별 가장 늦은 1행만 남기고 보관 후 삭제
+
+    Returns:
+        보관 후 삭제한 행 수
+    """
+    rows = conn.execute("""
+        SELECT * FROM channel_snapshots
+        WHERE snapshot_date BETWEEN ? AND ?
+        ORDER BY channel_id, snapshot_date DESC
+    """, (week_start, range_end)).fetchall()
+
+    removed = []
+    last_channel_id = None
+    for row in rows:
+        if row['channel_id'] != last_channel_id:
+            last_channel_id = row['channel_id']  # 채널별 그 주의 가장 늦은 값은 유지
+        else:
+            removed.append(dict(row))
+
+    if dry_run or not removed:
+        return len(removed)
+
+    _archive_rows(archive_dir, 'channel_snapshots', week_start, removed, _row_key)
+
+    for batch in _chunks(removed, DELETE_BATCH_SIZE):
+        conn.executemany(
+            "DELETE FROM channel_snapshots WHERE channel_id = ? AND snapshot_date = ?",
+            [(row['channel_id'], row['snapshot_date']) for row in batch]
+        )
+        conn.commit()
+
+    return len(removed)
+
+
+def compact_week(
+    week_start: str,
+    cutoff_date: str,
+    archive_dir: str = ARCHIVE_DIR,
+    dry_run: bool = False
+) -> Dict[str, int]:
+    """
+    한 주의 (보존 기간 이전) 스냅샷 압축
+
+    같은 주의 이전 실행에서 남긴 weekly 행도 후보에 포함하므로
+    주가 보존 기간 경계에 걸쳐 있어도 (영상, 카테고리)당 1행만 남는다.
+    영상 단위로 1행만 남기면 다른 소스(채널/카테고리)의 행이 사라져
+    data_source, category_ids 필터와 소스별 롤업에서 그 주의 영상이 빠지므로 카테고리별로 유지한다.
+
+    Returns:
+        {'kept': 남긴 행 수, 'archived': 보관 후 삭제한 행 수,
+         'trends_archived': 삭제한 추세 행 수, 'channel_archived': 삭제한 채널 통계 행 수}
+    """
+    week_end = (datetime.strptime(week_start, '%Y-%m-%d') + timedelta(days=6)).strftime('%Y-%m-%d')
+    range_end = min(week_end, (datetime.strptime(cutoff_date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d'))
+
+    conn = database.get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT id, video_id, category_id, snapshot_date FROM snapshots
+        WHERE snapshot_date BETWEEN ? AND ?
+        ORDER BY video_id, category_id, snapshot_date DESC, id
+    """, (week_start, range_end))
+
+    keep_ids, remove_ids = [], []
+    week_dates = set()
+    kept_pairs = set()
+    last_key = None
+    for row in cursor.fetchall():
+        week_dates.add(row['snapshot_date'])
+        key = (row['video_id'], row['category_id'])
+        if key != last_key:
+            keep_ids.append(row['id'])  # (영상, 카테고리)별 그 주의 가장 늦은 스냅샷
+            kept_pairs.add((row['video_id'], row['snapshot_date']))
+            last_key = key
+        else:
+            remove_ids.append(row['id'])
+
+    # 스냅샷이 하나도 안 남는 (영상, 날짜)의 추세 행 (이전 실행에서 남은 것 포함)
+    trend_rows = [
+        dict(row) for row in cursor.execute(
+            "SELECT * FROM video_trends WHERE snapshot_date BETWEEN ? AND ?", (week_start, range_end)
+        ).fetchall()
+        if (row['video_id'], row['snapshot_date']) not in kept_pairs
+    ]
+
+    stats = {'kept': len(keep_ids), 'archived': len(remove_ids), 'trends_archived': len(trend_rows)}
+
+    if dry_run:
+        stats['channel_archived'] = _compact_channel_week(conn, week_start, range_end, archive_dir, dry_run=True)
+        conn.close()
+        return stats
+
+    if remove_ids:
+        # 0. 롤업이 아직 없는 날짜는 일별 행이 남아 있을 때 계산 (압축 후에는 다시 계산하지 않음)
+        stored = {row['rollup_date'] for row in cursor.execute(f"""
+            SELECT DISTINCT rollup_date FROM daily_rollups
+            WHERE rollup_date IN ({','.join('?' * len(week_dates))})
+        """, tuple(week_dates)).fetchall()}
+        for snapshot_date in sorted(week_dates - stored):
+            rollups.refresh_daily_rollups(snapshot_date)
+        rollup_totals = _rollup_totals(cursor, week_start, range_end)
+
+        # 1. 아카이브 먼저 기록 (스냅샷 + 점수 원본)
+        snapshots = _fetch_by_ids(cursor, 'snapshots', 'id', remove_ids)
+        view_scores = _fetch_by_ids(cursor, 'view_scores', 'snapshot_id', remove_ids)
+        senior_scores = _fetch_by_ids(cursor, 'senior_scores', 'snapshot_id', remove_ids)
+
+        view_scores_by_snapshot: Dict[int, List[Dict[str, Any]]] = {}
+        for score in view_scores:
+            view_scores_by_snapshot.setdefault(score['snapshot_id'], []).append(score)
+        senior_scores_by_snapshot: Dict[int, List[Dict[str, Any]]] = {}
+        for score in senior_scores:
+            senior_scores_by_snapshot.setdefault(score['snapshot_id'], []).append(score)
+
+        records = [
+            {
+                'snapshot': snapshot,
+                'view_scores': view_scores_by_snapshot.get(snapshot['id'], []),
+                'senior_scores': senior_scores_by_snapshot.get(snapshot['id'], [])
+            }
+            for snapshot in snapshots
+        ]
+        _archive_rows(archive_dir, 'snapshots', week_start, records, _snapshot_record_key)
+
+    if trend_rows:
+        _archive_rows(archive_dir, 'video_trends', week_start, trend_rows, _row_key)
+
+    # 2. 짧은 트랜잭션으로 삭제 + 대표 행 표시
+    for batch in _chunks(remove_ids, DELETE_BATCH_SIZE):
+        placeholders = ','.join(['?' for _ in batch])
+        cursor.execute(f"DELETE FROM view_scores WHERE snapshot_id IN ({placeholders})", tuple(batch))
+        cursor.execute(f"DELETE FROM senior_scores WHERE snapshot_id IN ({placeholders})", tuple(batch))
+        cursor.execute(f"DELETE FROM snapshots WHERE id IN ({placeholders})", tuple(batch))
+        conn.commit()
+
+    for batch in _chunks(trend_rows, DELETE_BATCH_SIZE):
+        cursor.executemany(
+            "DELETE FROM video_trends WHERE video_id = ? AND snapshot_date = ?",
+            [(row['video_id'], row['snapshot_date']) for row in batch]
+        )
+        conn.commit()
+
+    for batch in _chunks(keep_ids, DELETE_BATCH_SIZE):
+        placeholders = ','.join(['?' for _ in batch])
+        cursor.execute(f"UPDATE snapshots SET resolution = 'weekly' WHERE id IN ({placeholders})", tuple(batch))
+        conn.commit()
+
+    stats['channel_archived'] = _compact_channel_week(conn, week_start, range_end, archive_dir, dry_run=False)
+
+    # 3. 롤업은 압축 전 값 그대로여야 함 (일별 트렌드 이력 보존)
+    if remove_ids and _rollup_totals(cursor, week_start, range_end) != rollup_totals:
+        conn.close()
+        raise RuntimeError(f"{week_start} 주 압축 후 daily_rollups 값이 바뀌었습니다")
+
+    conn.close()
+    return stats
+
+
+def compact_snapshots(
+    retention_days: int = RETENTION_DAYS,
+    archive_dir: str = ARCHIVE_DIR,
+    today: Optional[str] = None,
+    dry_run: bool = False,
+    vacuum: bool = False
+) -> Dict[str, Any]:
+    """
+    보존 기간 이전 스냅샷을 주 단위로 압축
+
+    Args:
+        retention_days: 일별 행을 유지할 기간
+        archive_dir: 원본 행 보관 폴더
+        today: 기준 날짜 (YYYY-MM-DD), None이면 오늘 (KST)
+        dry_run: True면 삭제하지 않고 통계만 계산
+        vacuum: True면 마지막에 VACUUM으로 DB 파일 크기 축소 (실행 중 쓰기 잠금)
+
+    Returns:
+        압축 결과 통계
+    """
+    if today is None:
+        today = datetime.now(database.KST).strftime('%Y-%m-%d')
+
+    cutoff_date = (datetime.strptime(today, '%Y-%m-%d') - timedelta(days=retention_days)).strftime('%Y-%m-%d')
+
+    conn = database.get_connection()
+    dates = [row['snapshot_date'] for row in conn.execute("""
+        SELECT DISTINCT snapshot_date FROM snapshots
+        WHERE snapshot_date < ? AND resolution = 'daily'
+        ORDER BY snapshot_date
+    """, (cutoff_date,)).fetchall()]
+    # 채널 통계는 채널·주에 2행 이상 남은 주만 (스냅샷은 이미 압축된 주 포함)
+    channel_dates = [row['snapshot_date'] for row in conn.execute("""
+        SELECT MIN(snapshot_date) AS snapshot_date FROM channel_snapshots
+        WHERE snapshot_date < ?
+        GROUP BY channel_id, date(snapshot_date, '-' || ((CAST(strftime('%w', snapshot_date) AS INTEGER) + 6) % 7) || ' days')
+        HAVING COUNT(*) > 1
+    """, (cutoff_date,)).fetchall()]
+    conn.close()
+
+    weeks = sorted(set(_week_start(date) for date in dates + channel_dates))
+
+    stats = {
+        'cutoff_date': cutoff_date,
+        'weeks': len(weeks),
+        'kept': 0,
+        'archived': 0,
+        'trends_archived': 0,
+        'channel_archived': 0,
+        'dry_run': dry_run
+    }
+
+    for week_start in weeks:
+        week_stats = compact_week(week_start, cutoff_date, archive_dir=archive_dir, dry_run=dry_run)
+        stats['kept'] += week_stats['kept']
+        stats['archived'] += week_stats['archived']
+        stats['trends_archived'] += week_stats['trends_archived']
+        stats['channel_archived'] += week_stats['channel_archived']
+        print(f"  📦 {week_start} 주: 유지 {week_stats['kept']}개, 보관 후 삭제 {week_stats['archived']}개 "
+              f"(추세 {week_stats['trends_archived']}개, 채널 통계 {week_stats['channel_archived']}개)")
+
+    if vacuum and not dry_run:
+        conn = database.get_connection()
+        conn.execute("VACUUM")
+        conn.close()
+
+    print(f"\n✅ 압축 완료 (기준일 {cutoff_date} 이전, {stats['weeks']}주): "
+          f"유지 {stats['kept']}개, 보관 후 삭제 {stats['archived']}개 "
+          f"(추세 {stats['trends_archived']}개, 채널 통계 {stats['channel_archived']}개)")
+    return stats
+
+
+def read_archive(archive_file: str):
+    """아카이브 파일 읽기 (제너레이터, 한 줄씩)"""
+    with gzip.open(archive_file, 'rt', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='스냅샷 보존 기간 관리 및 압축')
+    parser.add_argument('--retention-days', type=int, default=RETENTION_DAYS, help='일별 행을 유지할 기간')
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR, help='원본 행 보관 폴더')
+    parser.add_argument('--today', default=None, help='기준 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--dry-run', action='store_true', help='삭제하지 않고 통계만 출력')
+    parser.add_argument('--vacuum', action='store_true', help='마지막에 VACUUM 실행')
+    args = parser.parse_args()
+
+    database.init_database()
+    compact_snapshots(
+        retention_days=args.retention_days,
+        archive_dir=args.archive_dir,
+        today=args.today,
+        dry_run=args.dry_run,
+        vacuum=args.vacuum
+    )
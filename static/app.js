@@ -322,7 +322,9 @@ async function recalculateViewScores() {
             sort_by: currentSort,
             order: currentOrder,
             limit: 100,
-            weights: weights
+            weights: weights,
+            // 테이블에 그리는 필드만 요청 (응답 크기 축소)
+            fields: ['video_id', 'title', 'channel_title', 'thumbnail_url', 'view_count', 'view_score', 'metadata', 'delta_views_14d']
         };
 
         // 카테고리 필터가 있으면 추가
@@ -431,12 +433,13 @@ function saveWeights() {
 /**
  * 가중치 복원 (localStorage)
  */
-function loadWeights() {
+async function loadWeights() {
     const savedWeights = localStorage.getItem('viewScoreWeights');
-    if (!savedWeights) return;
 
     try {
-        const weights = JSON.parse(savedWeights);
+        // 저장된 가중치가 없으면 서버의 활성 가중치(라벨 학습 버전) 사용
+        const weights = savedWeights ? JSON.parse(savedWeights) : await fetchActiveWeights();
+        if (!weights) return;
 
         document.getElementById('view-weight').value = weights.view;
         document.getElementById('view-weight-val').textContent = weights.view.toFixed(1);
@@ -454,6 +457,20 @@ function loadWeights() {
     }
 }
 
+/**
+ * 서버의 활성 ViewScore 가중치 조회 (weight_trainer로 학습한 버전)
+ */
+async function fetchActiveWeights() {
+    try {
+        const response = await fetch('/api/weights?model=view');
+        const result = await response.json();
+        return result.success ? result.data.active.view : null;
+    } catch (error) {
+        console.error('활성 가중치 조회 실패:', error);
+        return null;
+    }
+}
+
 /**
  * 섹션 토글 (접기/펼치기)
  */
@@ -519,7 +536,8 @@ async function loadAvailableCategories() {
             body: JSON.stringify({
                 snapshot_date: viewDate,
                 data_source: 'all',
-                limit: 1000
+                limit: 1000,
+                fields: ['video_category_id']
             })
         });
 
@@ -0,0 +1,125 @@
+"""
+영상 전문 검색 (SQLite FTS5)
+
+videos의 제목, 설명, 태그, 채널명을 FTS5 테이블(videos_fts, contentless, rowid = videos.rowid)에
+색인한다. 한국어는 대부분 두 음절 단어라 FTS5 trigram 토크나이저로는 '건강', '체조' 같은
+검색어가 걸리지 않으므로, 저장 전에 한글·한자·가나 구간을 2-gram으로 나눠 넣는다.
+- 색인: '트로트 메들리' → '트로 로트 메들 들리' (unicode61 토크나이저가 공백 기준으로 자름)
+- 검색: '트로트' → 구문 "트로 로트" (연속한 2-gram → 부분 문자열 일치), 한 글자는 접두어 "트"*
+- 영문·숫자 단어는 그대로 색인하고 접두어로 검색 ('music' → "music"*)
+
+색인은 database.insert_video에서 새 영상이 들어갈 때 같이 쓰고, 기존 DB는 init_database가
+색인되지 않은 rowid 이후만 채운다. 순위는 BM25 관련도 + ViewScore/SeniorScore 가중 평균(rank_results).
+"""
+import re
+import json
+from typing import Dict, Any, List, Optional
+
+
+# 한글 음절/자모, 한자, 가나 구간 (2-gram 대상)
+_CJK = '\u3040-\u30ff\u3131-\u318e\u4e00-\u9fff\uac00-\ud7a3'
+_CJK_PATTERN = re.compile(f'[{_CJK}]')
+_TOKEN_PATTERN = re.compile(f'[{_CJK}]+|(?:(?![{_CJK}])[^\\W_])+')
+
+# videos_fts 컬럼 순서와 BM25 컬럼 가중치
+FTS_COLUMNS = ['title', 'description', 'tags', 'channel_title']
+BM25_WEIGHTS = (10.0, 1.0, 5.0, 3.0)
+
+# 검색 결과 순위 가중치 (relevance: 관련도, view: ViewScore, senior: SeniorScore)
+DEFAULT_SEARCH_WEIGHTS = {
+    'text': 1.0,
+    'view': 1.0,
+    'senior': 1.0
+}
+
+SORT_KEYS = ['score', 'relevance', 'view_score', 'senior_score', 'view_count', 'published_at']
+
+
+def _is_cjk(token: str) -> bool:
+    return _CJK_PATTERN.match(token) is not None
+
+
+def ngram_text(text: Optional[str]) -> str:
+    """색인용 텍스트: 한글·한자·가나 구간은 2-gram, 나머지 단어는 그대로 (소문자)"""
+    if not text:
+        return ''
+
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if _is_cjk(token) and len(token) > 2:
+            tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+        else:
+            tokens.append(token)
+    return ' '.join(tokens)
+
+
+def index_values(video_data: Dict[str, Any]) -> tuple:
+    """videos 행(또는 수집 데이터) → videos_fts 컬럼 값 (FTS_COLUMNS 순서)"""
+    tags = video_data.get('tags') or []
+    if isinstance(tags, str):
+        try:
+            tags = json.loads(tags)
+        except ValueError:
+            tags = [tags]
+
+    return (
+        ngram_text(video_data.get('title')),
+        ngram_text(video_data.get('description')),
+        ngram_text(' '.join(str(tag) for tag in tags)),
+        ngram_text(video_data.get('channel_title'))
+    )
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    검색어 → FTS5 MATCH 식 (단어끼리는 AND)
+
+    Returns:
+        MATCH 식, 검색할 단어가 없으면 None
+    """
+    terms = []
+    for token in _TOKEN_PATTERN.findall((query or '').lower()):
+        if _is_cjk(token) and len(token) >= 2:
+            bigrams = [token[i:i + 2] for i in range(len(token) - 1)]
+            terms.append('"' + ' '.join(bigrams) + '"')
+        else:
+            terms.append(f'"{token}"*')
+    return ' '.join(terms) or None
+
+
+def rank_results(
+    rows: List[Dict[str, Any]],
+    weights: Optional[Dict[str, float]] = None,
+    sort_by: str = 'score'
+) -> List[Dict[str, Any]]:
+    """
+    BM25 관련도를 0-100으로 바꾸고 ViewScore/SeniorScore와 가중 평균해 정렬
+
+    Args:
+        rows: database.search_videos 결과 (bm25: 작을수록 관련도 높음, 음수)
+        weights: {'text', 'view', 'senior'} (기본값: DEFAULT_SEARCH_WEIGHTS)
+        sort_by: SORT_KEYS 중 하나 (기본 score, 모두 내림차순)
+    """
+    if weights is None:
+        weights = DEFAULT_SEARCH_WEIGHTS
+
+    best = min((row['bm25'] for row in rows), default=0.0)
+    total_weight = sum(weights.get(name, 0.0) for name in DEFAULT_SEARCH_WEIGHTS)
+
+    for row in rows:
+        relevance = 100.0 * row['bm25'] / best if best < 0 else 100.0
+        row['relevance'] = round(relevance, 2)
+        if total_weight == 0:
+            row['score'] = 0.0
+        else:
+            row['score'] = round((
+                relevance * weights.get('text', 0.0) +
+                (row.get('view_score') or 0.0) * weights.get('view', 0.0) +
+                (row.get('senior_score') or 0.0) * weights.get('senior', 0.0)
+            ) / total_weight, 2)
+        del row['bm25']
+
+    if sort_by not in SORT_KEYS:
+        sort_by = 'score'
+    rows.sort(key=lambda row: (row.get(sort_by) or 0), reverse=True)
+    return rows
@@ -0,0 +1,241 @@
+"""
+영상 조회수 추세 (속도, 가속도, EWMA)
+
+Δviews(기간 처음과 끝 조회수 차이) 하나로는 수집이 빠진 날의 간격을 반영하지 못하고,
+꾸준히 오르는 영상과 하루 반짝한 영상도 구별하지 못한다.
+여기서는 달력 기준 창(TREND_WINDOW_DAYS일)의 스냅샷 이력을 NumPy로 한 번에 계산해
+video_trends 테이블에 (영상, 스냅샷 날짜)별로 저장한다.
+- views_per_day: 창 안 첫 관측 → 기준 날짜까지 일 평균 조회수 증가
+- velocity: 마지막 구간(직전 관측 → 기준 날짜)의 일 조회수 증가
+- acceleration: 마지막 두 구간 속도 차이 / 구간 중점 사이 일 수 (조회수/일²)
+- ewma_views_per_day: 구간 속도의 지수 가중 이동 평균 (반감기 TREND_EWMA_HALFLIFE_DAYS일,
+  구간 길이에 맞춰 감쇠) — 직전 날짜의 저장값에 이어서 갱신
+- delta_views_14d: 창 안 첫 관측 대비 조회수 증가 (행 수가 아니라 달력 기준 14일)
+
+같은 날짜에 여러 카테고리로 잡힌 영상은 가장 큰 조회수 하나만 사용한다.
+수집이 끝날 때마다 해당 날짜만 계산하고, 기존 DB는 CLI로 전체 날짜를 한 번 재구성한다.
+
+사용법:
+    python video_trends.py              # 전체 날짜 재구성 (날짜 오름차순, EWMA 이어서 계산)
+    python video_trends.py 2025-11-06   # 특정 날짜만 재계산
+"""
+import os
+import sys
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import database
+
+
+TREND_WINDOW_DAYS = 14  # delta_views_14d와 같은 창
+TREND_EWMA_HALFLIFE_DAYS = float(os.getenv('TREND_EWMA_HALFLIFE_DAYS', '3'))
+
+# /api/videos에서 정렬할 수 있는 추세 필드
+TREND_FIELDS = ['views_per_day', 'velocity', 'acceleration', 'ewma_views_per_day']
+
+
+def _day_numbers(dates: List[str]) -> np.ndarray:
+    """'YYYY-MM-DD' → 일 번호 (날짜 종류만큼만 파싱)"""
+    ordinals = {d: date.fromisoformat(d).toordinal() for d in set(dates)}
+    return np.array([ordinals[d] for d in dates], dtype=np.int64)
+
+
+def compute_trends(
+    video_ids: np.ndarray,
+    days: np.ndarray,
+    views: np.ndarray,
+    prev_ewma: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    영상별 추세 일괄 계산 (영상마다 기준 날짜가 마지막 관측)
+
+    Args:
+        video_ids: 영상 번호 (0..n-1), (영상, 일) 순으로 정렬된 관측 행
+        days: 관측 일 번호
+        views: 관측 조회수
+        prev_ewma: 영상별 직전 EWMA (없으면 NaN)
+
+    Returns:
+        영상별 배열 {'views_per_day', 'velocity', 'acceleration', 'ewma_views_per_day',
+        'delta_views_14d', 'window_days', 'observations'} (계산할 수 없으면 NaN)
+    """
+    n = int(video_ids.max()) + 1 if len(video_ids) else 0
+    days = days.astype(float)
+    views = views.astype(float)
+
+    counts = np.bincount(video_ids, minlength=n)
+    last = np.cumsum(counts) - 1  # 영상별 마지막 관측 행
+    first = last - counts + 1
+
+    # 같은 영상 안의 구간별 속도 (행 i-1 → i, 첫 행은 NaN)
+    rate = np.full(len(days), np.nan)
+    if len(days) > 1:
+        same = video_ids[1:] == video_ids[:-1]
+        gap = np.diff(days)
+        rate[1:] = np.where(same & (gap > 0), np.diff(views) / np.where(gap > 0, gap, 1), np.nan)
+
+    nan = np.full(n, np.nan)
+    has_two = counts >= 2
+    has_three = counts >= 3
+
+    span = days[last] - days[first]
+    views_per_day = np.where(has_two & (span > 0), (views[last] - views[first]) / np.where(span > 0, span, 1), nan)
+
+    velocity = np.where(has_two, rate[last], nan)
+
+    prev_rate = rate[np.maximum(last - 1, 0)]
+    mid_gap = (days[last] - days[np.maximum(last - 2, 0)]) / 2.0
+    acceleration = np.where(has_three & (mid_gap > 0), (velocity - prev_rate) / np.where(mid_gap > 0, mid_gap, 1), nan)
+
+    # 구간 길이만큼 감쇠: alpha = 1 - 2^(-구간일수/반감기)
+    last_gap = days[last] - days[np.maximum(last - 1, 0)]
+    alpha = 1.0 - np.power(2.0, -last_gap / TREND_EWMA_HALFLIFE_DAYS)
+    if prev_ewma is None:
+        prev_ewma = nan
+    ewma = np.where(np.isnan(prev_ewma), velocity, prev_ewma + alpha * (velocity - prev_ewma))
+    ewma = np.where(np.isnan(velocity), prev_ewma, ewma)
+
+    delta_views = np.where(has_two, views[last] - views[first], nan)
+
+    return {
+        'views_per_day': views_per_day,
+        'velocity': velocity,
+        'acceleration': acceleration,
+        'ewma_views_per_day': ewma,
+        'delta_views_14d': delta_views,
+        'window_days': span,
+        'observations': counts
+    }
+
+
+def _value(array: np.ndarray, index: int, digits: int = 2) -> Optional[float]:
+    value = array[index]
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def refresh_trends(snapshot_date: str) -> int:
+    """
+    특정 날짜 스냅샷 영상들의 추세 계산 및 저장 (수집 직후 호출)
+
+    Returns:
+        저장된 행 수
+    """
+    window_start = (date.fromisoformat(snapshot_date) - timedelta(days=TREND_WINDOW_DAYS)).isoformat()
+
+    conn = database.get_connection()
+    cursor = conn.cursor()
+
+    # 창 안 이력 (영상, 날짜)별 1행, 기준 날짜에 스냅샷이 있는 영상만
+    rows = cursor.execute("""
+        SELECT h.video_id, h.snapshot_date, MAX(h.view_count) AS view_count
+        FROM snapshots h
+        WHERE h.snapshot_date BETWEEN ? AND ?
+          AND h.video_id IN (SELECT video_id FROM snapshots WHERE snapshot_date = ?)
+        GROUP BY h.video_id, h.snapshot_date
+        ORDER BY h.video_id, h.snapshot_date
+    """, (window_start, snapshot_date, snapshot_date)).fetchall()
+
+    if not rows:
+        conn.close()
+        return 0
+
+    video_list: List[str] = []
+    video_index: Dict[str, int] = {}
+    for row in rows:
+        if row['video_id'] not in video_index:
+            video_index[row['video_id']] = len(video_list)
+            video_list.append(row['video_id'])
+
+    video_ids = np.array([video_index[row['video_id']] for row in rows], dtype=np.int64)
+    days = _day_numbers([row['snapshot_date'] for row in rows])
+    views = np.array([row['view_count'] or 0 for row in rows], dtype=float)
+
+    # 직전 날짜까지의 EWMA (PK 조회, 영상마다 1행)
+    prev = cursor.execute("""
+        SELECT v.video_id, (
+            SELECT p.ewma_views_per_day FROM video_trends p
+            WHERE p.video_id = v.video_id AND p.snapshot_date < ? AND p.snapshot_date >= ?
+            ORDER BY p.snapshot_date DESC LIMIT 1
+        ) AS ewma_views_per_day
+        FROM (SELECT DISTINCT video_id FROM snapshots WHERE snapshot_date = ?) v
+    """, (snapshot_date, window_start, snapshot_date)).fetchall()
+    prev_ewma = np.full(len(video_list), np.nan)
+    for row in prev:
+        if row['ewma_views_per_day'] is not None:
+            prev_ewma[video_index[row['video_id']]] = row['ewma_views_per_day']
+
+    trends = compute_trends(video_ids, days, views, prev_ewma)
+
+    trend_rows = []
+    for i, video_id in enumerate(video_list):
+        delta = trends['delta_views_14d'][i]
+        trend_rows.append((
+            video_id, snapshot_date,
+            _value(trends['views_per_day'], i),
+            _value(trends['velocity'], i),
+            _value(trends['acceleration'], i),
+            _value(trends['ewma_views_per_day'], i),
+            None if np.isnan(delta) else int(delta),
+            int(trends['window_days'][i]),
+            int(trends['observations'][i])
+        ))
+
+    cursor.executemany("""
+        INSERT OR REPLACE INTO video_trends
+        (video_id, snapshot_date, views_per_day, velocity, acceleration,
+         ewma_views_per_day, delta_views_14d, window_days, observations)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, trend_rows)
+
+    conn.commit()
+    conn.close()
+    return len(trend_rows)
+
+
+def get_dependent_dates(changed_dates: List[str]) -> List[str]:
+    """
+    changed_dates의 스냅샷이 바뀌었을 때 추세를 다시 계산해야 하는 날짜
+    (가장 이른 날짜부터 마지막 날짜 + 창 안에 스냅샷이 있는 날짜, 오름차순)
+    """
+    start = min(changed_dates)
+    end = (date.fromisoformat(max(changed_dates)) + timedelta(days=TREND_WINDOW_DAYS)).isoformat()
+
+    conn = database.get_connection()
+    dates = [row['snapshot_date'] for row in conn.execute("""
+        SELECT DISTINCT snapshot_date FROM snapshots
+        WHERE snapshot_date >= ? AND snapshot_date <= ?
+        ORDER BY snapshot_date
+    """, (start, end)).fetchall()]
+    conn.close()
+    return dates
+
+
+def rebuild_all() -> int:
+    """전체 날짜 재구성 (날짜 오름차순이라 EWMA가 이어짐)"""
+    conn = database.get_connection()
+    dates = [row['snapshot_date'] for row in conn.execute(
+        "SELECT DISTINCT snapshot_date FROM snapshots ORDER BY snapshot_date"
+    ).fetchall()]
+    conn.execute("DELETE FROM video_trends")
+    conn.commit()
+    conn.close()
+
+    total = 0
+    for snapshot_date in dates:
+        total += refresh_trends(snapshot_date)
+
+    print(f"[OK] 추세 재구성: {len(dates)}일, {total}행")
+    return total
+
+
+if __name__ == '__main__':
+    database.init_database()
+
+    if len(sys.argv) > 1:
+        for date_arg in sys.argv[1:]:
+            count = refresh_trends(date_arg)
+            print(f"[OK] {date_arg}: {count}행")
+    else:
+        rebuild_all()
@@ -4,12 +4,17 @@ ViewScore 계산기
 영상의 조회수 잠재력을 평가하는 점수 시스템
 - 조회수: 높을수록 좋음
 - 구독자수: 조회수 대비 구독자가 적을수록 좋음 (언더독 보너스)
-- 최신성: 최근일수록 좋음
+- 최신성: 최근일수록 좋음 (기준 시각 대비, 스냅샷 날짜 기준이면 언제 다시 계산해도 같은 값)
 - 참여도: 좋아요+댓글 많을수록 좋음
 """
 import math
-from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional, Union
+
+
+# KST (한국 표준시) = UTC+9, 스냅샷 날짜 기준
+KST = timezone(timedelta(hours=9))
+SECONDS_PER_DAY = 86400
 
 
 # 기본 가중치
@@ -87,29 +92,62 @@ def normalize_subscriber_count_inverse(subscriber_count: int, view_count: int =
         return 10.0
 
 
-def normalize_recency(published_at: str) -> float:
+def parse_published_at(published_at: str) -> Optional[int]:
     """
-    최신성 정규화 (0-100점)
-    지수 감쇠: 오늘 = 100점, 30일 = 50점, 90일 = ~0점
+    업로드 시각 → UTC epoch 초 (파싱 실패 시 None)
+    ISO 8601 ('2025-11-05T10:00:00Z') 또는 날짜만 ('2025-11-05', UTC 자정으로)
+    database.insert_video가 저장하는 videos.published_at_epoch와 같은 값 (소수 초 버림)
     """
+    if not published_at:
+        return None
     try:
-        # ISO 8601 날짜 파싱
         if 'T' in published_at:
             published_date = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+            if published_date.tzinfo is None:
+                published_date = published_date.replace(tzinfo=timezone.utc)
         else:
-            published_date = datetime.strptime(published_at, '%Y-%m-%d')
+            published_date = datetime.strptime(published_at, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+        return int(published_date.timestamp())
+    except ValueError:
+        return None
+
+
+def snapshot_reference_time(snapshot_date: str) -> int:
+    """
+    스냅샷 날짜의 최신성 기준 시각 (그 날짜가 끝나는 시각, KST 다음날 0시) → epoch 초
+    수집 시점과 나중에 /api/videos·재생에서 다시 계산할 때 같은 기준을 쓰기 위함
+    """
+    day = datetime.strptime(snapshot_date, '%Y-%m-%d').replace(tzinfo=KST)
+    return int((day + timedelta(days=1)).timestamp())
+
 
-        # 며칠 전인지 계산 (UTC 기준으로 통일)
-        days_old = (datetime.now(timezone.utc) - published_date).days
+def normalize_recency(published_at: Union[str, int, float, None], reference_time: Optional[float] = None) -> float:
+    """
+    최신성 정규화 (0-100점)
+    지수 감쇠: 기준 시각 당일 = 100점, 30일 = 50점, 90일 = ~0점
+
+    Args:
+        published_at: 업로드 시각 (epoch 초 또는 ISO 8601 문자열)
+        reference_time: 기준 시각 epoch 초 (None이면 현재 시각)
+    """
+    if isinstance(published_at, (int, float)):
+        published_epoch = published_at
+    else:
+        published_epoch = parse_published_at(published_at)
+        if published_epoch is None:
+            print(f"⚠️  날짜 파싱 오류: {published_at}")
+            return 50.0  # 파싱 실패 시 중간 점수
 
-        # 지수 감쇠: 30일 반감기
-        # score = 100 * exp(-days_old / 30)
-        score = 100.0 * math.exp(-days_old / 30.0)
-        return max(0.0, min(100.0, score))
+    if reference_time is None:
+        reference_time = datetime.now(timezone.utc).timestamp()
 
-    except Exception as e:
-        print(f"⚠️  날짜 파싱 오류: {published_at} - {e}")
-        return 50.0  # 파싱 실패 시 중간 점수
+    # 며칠 전인지 계산 (기준 시각까지 경과한 일 수, 내림)
+    days_old = (reference_time - published_epoch) // SECONDS_PER_DAY
+
+    # 지수 감쇠: 30일 반감기
+    # score = 100 * exp(-days_old / 30)
+    score = 100.0 * math.exp(-days_old / 30.0)
+    return max(0.0, min(100.0, score))
 
 
 def normalize_engagement(like_count: int, comment_count: int) -> float:
@@ -134,16 +172,19 @@ def calculate_view_score(
     video_data: Dict[str, Any],
     snapshot_data: Dict[str, Any],
     channel_data: Optional[Dict[str, Any]] = None,
-    weights: Optional[Dict[str, float]] = None
+    weights: Optional[Dict[str, float]] = None,
+    reference_time: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     ViewScore 계산
 
     Args:
-        video_data: 비디오 정보 (published_at 포함)
+        video_data: 비디오 정보 (published_at_epoch가 있으면 사용, 없으면 published_at 파싱)
         snapshot_data: 스냅샷 정보 (view_count, like_count, comment_count 포함)
         channel_data: 채널 정보 (subscriber_count 포함)
         weights: 가중치 딕셔너리 (기본값: DEFAULT_WEIGHTS)
+        reference_time: 최신성 기준 시각 epoch 초 (None이면 snapshot_data의 snapshot_date 기준,
+            그것도 없으면 현재 시각)
 
     Returns:
         {
@@ -172,7 +213,15 @@ def calculate_view_score(
     subscriber_count = channel_data.get('subscriber_count', 0) if channel_data else 0
     subscriber_score = normalize_subscriber_count_inverse(subscriber_count, view_count)
 
-    recency_score = normalize_recency(video_data.get('published_at', ''))
+    if reference_time is None:
+        if snapshot_data.get('snapshot_date'):
+            reference_time = snapshot_reference_time(snapshot_data['snapshot_date'])
+        else:
+            reference_time = int(datetime.now(timezone.utc).timestamp())
+    published_at = video_data.get('published_at_epoch')
+    if published_at is None:
+        published_at = video_data.get('published_at', '')
+    recency_score = normalize_recency(published_at, reference_time)
 
     engagement_score = normalize_engagement(
         snapshot_data.get('like_count', 0),
@@ -202,6 +251,7 @@ def calculate_view_score(
         'raw_view_count': snapshot_data.get('view_count', 0),
         'raw_subscriber_count': subscriber_count,
         'raw_published_at': video_data.get('published_at', ''),
+        'recency_reference_time': reference_time,
         'raw_like_count': snapshot_data.get('like_count', 0),
         'raw_comment_count': snapshot_data.get('comment_count', 0),
         'raw_engagement': snapshot_data.get('like_count', 0) + snapshot_data.get('comment_count', 0)
@@ -232,7 +282,8 @@ def calculate_view_score(
 def batch_calculate_view_scores(
     videos_with_snapshots: list,
     channels_dict: Dict[str, Dict],
-    weights: Optional[Dict[str, float]] = None
+    weights: Optional[Dict[str, float]] = None,
+    reference_time: Optional[float] = None
 ) -> list:
     """
     여러 비디오의 ViewScore를 일괄 계산
@@ -241,22 +292,29 @@ def batch_calculate_view_scores(
         videos_with_snapshots: 비디오+스냅샷 데이터 리스트
         channels_dict: channel_id를 키로 하는 채널 정보 딕셔너리
         weights: 가중치
+        reference_time: 최신성 기준 시각 epoch 초 (None이면 행마다 snapshot_date 기준,
+            snapshot_date가 없으면 호출 시점 1번)
 
     Returns:
         ViewScore 결과 리스트
     """
     results = []
+    now = int(datetime.now(timezone.utc).timestamp())
 
     for video in videos_with_snapshots:
         channel_id = video.get('channel_id')
         channel_data = channels_dict.get(channel_id, {})
+        row_reference_time = reference_time
+        if row_reference_time is None and not video.get('snapshot_date'):
+            row_reference_time = now
 
         try:
             score_result = calculate_view_score(
                 video_data=video,
                 snapshot_data=video,
                 channel_data=channel_data,
-                weights=weights
+                weights=weights,
+                reference_time=row_reference_time
             )
             results.append(score_result)
         except Exception as e:
@@ -0,0 +1,336 @@
+"""
+라벨 기반 가중치 학습
+
+labels 테이블의 is_senior_content 판정과 저장된 점수 요소(view_scores,
+senior_scores)로 특징 행렬을 만들고, NumPy 로지스틱 회귀로 가중치를 학습한다.
+- 전체 라벨 영상을 한 번에 벡터 연산 (주간 50개 라벨링 후 바로 재실행 가능)
+- 학습 결과는 weight_versions 테이블에 새 버전으로 발행
+- /api/videos는 활성 ViewScore 가중치를 기본값으로 사용
+
+사용법:
+    python weight_trainer.py              # view, senior 모두 학습 후 활성화
+    python weight_trainer.py --model view --no-activate
+"""
+import json
+import argparse
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+import database
+import view_score_calculator
+import senior_classifier
+
+
+# 모델별 특징 (저장된 점수 요소 컬럼 → 가중치 키)
+MODEL_FEATURES = {
+    'view': {
+        'table': 'view_scores',
+        'columns': ['view_score', 'subscriber_score', 'recency_score', 'engagement_score'],
+        'keys': ['view', 'subscriber', 'recency', 'engagement'],
+    },
+    'senior': {
+        'table': 'senior_scores',
+        'columns': ['keyword_score', 'genre_score', 'comment_score', 'channel_score',
+                    'length_score', 'zgen_penalty'],
+        'keys': ['keyword', 'genre', 'comment', 'channel', 'length', 'zgen'],
+    },
+}
+
+# 학습에 필요한 최소 라벨 수 (클래스별)
+MIN_SAMPLES_PER_CLASS = 5
+
+# L2 정규화 강도
+L2_PENALTY = 1.0
+
+
+def get_default_weights(model: str) -> Dict[str, float]:
+    """모델별 기본(수동 설정) 가중치"""
+    if model == 'view':
+        return dict(view_score_calculator.DEFAULT_WEIGHTS)
+    return dict(senior_classifier.DEFAULT_SENIOR_WEIGHTS)
+
+
+def build_feature_matrix(model: str) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    라벨된 영상의 특징 행렬 생성 (영상당 최신 점수 1행, 최신 라벨 1개)
+
+    Returns:
+        (X: n×d 특징 행렬, y: n 라벨 벡터, video_ids)
+    """
+    spec = MODEL_FEATURES[model]
+    columns = ', '.join(f'sc.{col}' for col in spec['columns'])
+
+    conn = database.get_connection()
+    rows = conn.execute(f"""
+        SELECT l.video_id, l.is_senior_content, {columns}
+        FROM labels l
+        JOIN (
+            SELECT video_id, MAX(id) as label_id FROM labels GROUP BY video_id
+        ) latest_label ON l.id = latest_label.label_id
+        JOIN (
+            SELECT video_id, MAX(id) as score_id FROM {spec['table']} GROUP BY video_id
+        ) latest_score ON l.video_id = latest_score.video_id
+        JOIN {spec['table']} sc ON sc.id = latest_score.score_id
+    """).fetchall()
+    conn.close()
+
+    video_ids = [row['video_id'] for row in rows]
+    y = np.array([row['is_senior_content'] for row in rows], dtype=float)
+    X = np.array([[row[col] or 0.0 for col in spec['columns']] for row in rows], dtype=float)
+    X = X.reshape(len(rows), len(spec['columns']))
+
+    return X, y, video_ids
+
+
+def fit_logistic_regression(
+    X: np.ndarray,
+    y: np.ndarray,
+    l2: float = L2_PENALTY,
+    max_iter: int = 50,
+    tol: float = 1e-8
+) -> Tuple[np.ndarray, float]:
+    """
+    L2 정규화 로지스틱 회귀 (뉴턴-랩슨, 전체 행렬 벡터 연산)
+
+    특징은 표준화해서 학습하고, 계수는 원래 스케일로 되돌려 반환한다.
+
+    Returns:
+        (계수 벡터, 절편)
+    """
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    Z = np.hstack([np.ones((X.shape[0], 1)), (X - mean) / std])
+
+    beta = np.zeros(Z.shape[1])
+    penalty = np.full(Z.shape[1], l2)
+    penalty[0] = 0.0  # 절편은 정규화하지 않음
+
+    for _ in range(max_iter):
+        p = 1.0 / (1.0 + np.exp(-(Z @ beta)))
+        gradient = Z.T @ (p - y) + penalty * beta
+        hessian = (Z * (p * (1 - p))[:, None]).T @ Z + np.diag(penalty)
+        step = np.linalg.solve(hessian, gradient)
+        beta -= step
+        if np.max(np.abs(step)) < tol:
+            break
+
+    coef = beta[1:] / std
+    intercept = beta[0] - np.sum(beta[1:] * mean / std)
+    return coef, float(intercept)
+
+
+def evaluate(X: np.ndarray, y: np.ndarray, coef: np.ndarray, intercept: float) -> Dict[str, float]:
+    """학습 데이터 기준 지표 (정확도, 정밀도, 재현율, 로그 손실)"""
+    p = 1.0 / (1.0 + np.exp(-(X @ coef + intercept)))
+    predicted = p >= 0.5
+    actual = y == 1
+
+    true_positive = np.sum(predicted & actual)
+    eps = 1e-12
+
+    return {
+        'accuracy': round(float(np.mean(predicted == actual)), 4),
+        'precision': round(float(true_positive / max(np.sum(predicted), 1)), 4),
+        'recall': round(float(true_positive / max(np.sum(actual), 1)), 4),
+        'log_loss': round(float(-np.mean(y * np.log(p + eps) + (1 - y) * np.log(1 - p + eps))), 4),
+    }
+
+
+def coefficients_to_weights(
+    model: str,
+    coef: np.ndarray,
+    informative: Optional[np.ndarray] = None
+) -> Dict[str, float]:
+    """
+    로지스틱 회귀 계수 → 점수 가중치
+
+    음수 계수는 0으로 자르고, 기본 가중치 합과 같도록 스케일을 맞춘다.
+    (ViewScore는 가중 평균이라 스케일 무관, SeniorScore는 임계값 5.0 유지 목적)
+    라벨 데이터에서 값이 변하지 않은 특징(예: 댓글 미수집)은 학습할 수 없으므로
+    기본 가중치를 그대로 둔다.
+    """
+    keys = MODEL_FEATURES[model]['keys']
+    default_weights = get_default_weights(model)
+    if informative is None:
+        informative = np.ones(len(keys), dtype=bool)
+
+    weights = {key: default_weights[key] for key in keys}
+    target_sum = sum(default_weights[key] for key, used in zip(keys, informative) if used)
+
+    clipped = np.clip(coef, 0.0, None) * informative
+    if clipped.sum() <= 0:
+        return weights
+
+    scaled = clipped / clipped.sum() * target_sum
+    for key, value, used in zip(keys, scaled, informative):
+        if used:
+            weights[key] = round(float(value), 2)
+
+    return weights
+
+
+def train(model: str, activate: bool = True, note: str = '') -> Dict[str, Any]:
+    """
+    라벨로 가중치 학습 후 새 버전 발행
+
+    Args:
+        model: 'view' 또는 'senior'
+        activate: 발행한 버전을 바로 활성화할지 여부
+        note: 메모
+
+    Returns:
+        {'version', 'model', 'weights', 'metrics', 'n_samples', 'n_positive'}
+    """
+    if model not in MODEL_FEATURES:
+        raise ValueError(f"알 수 없는 모델입니다: {model}")
+
+    X, y, _ = build_feature_matrix(model)
+    n_positive = int(y.sum())
+    n_negative = len(y) - n_positive
+
+    if n_positive < MIN_SAMPLES_PER_CLASS or n_negative < MIN_SAMPLES_PER_CLASS:
+        raise ValueError(
+            f"라벨이 부족합니다 (시니어 {n_positive}개, 비시니어 {n_negative}개, "
+            f"클래스별 최소 {MIN_SAMPLES_PER_CLASS}개 필요)"
+        )
+
+    coef, intercept = fit_logistic_regression(X, y)
+    weights = coefficients_to_weights(model, coef, informative=X.std(axis=0) > 0)
+    metrics = evaluate(X, y, coef, intercept)
+    metrics['coefficients'] = [round(float(c), 6) for c in coef]
+    metrics['intercept'] = round(intercept, 6)
+
+    conn = database.get_connection()
+    cursor = conn.cursor()
+
+    if activate:
+        cursor.execute("UPDATE weight_versions SET is_active = 0 WHERE model = ?", (model,))
+
+    cursor.execute("""
+        INSERT INTO weight_versions (model, weights, metrics, n_samples, n_positive, is_active, note)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, (
+        model,
+        json.dumps(weights),
+        json.dumps(metrics),
+        len(y),
+        n_positive,
+        1 if activate else 0,
+        note
+    ))
+    version = cursor.lastrowid
+
+    conn.commit()
+    conn.close()
+
+    # 결정 경계가 바뀌었으므로 라벨링 큐의 불확실도 갱신
+    if model == 'senior' and activate:
+        import labeling_queue
+        labeling_queue.rebuild()
+
+    print(f"[OK] {model} 가중치 v{version} 발행: {weights} (정확도 {metrics['accuracy']})")
+
+    return {
+        'version': version,
+        'model': model,
+        'weights': weights,
+        'metrics': metrics,
+        'n_samples': len(y),
+        'n_positive': n_positive,
+        'is_active': activate
+    }
+
+
+def get_active_version(model: str) -> Optional[Dict[str, Any]]:
+    """활성 가중치 버전 조회 (없으면 None)"""
+    conn = database.get_connection()
+    row = conn.execute("""
+        SELECT * FROM weight_versions
+        WHERE model = ? AND is_active = 1
+        ORDER BY version DESC LIMIT 1
+    """, (model,)).fetchone()
+    conn.close()
+
+    if not row:
+        return None
+
+    result = dict(row)
+    result['weights'] = json.loads(result['weights'])
+    result['metrics'] = json.loads(result['metrics'] or '{}')
+    return result
+
+
+def get_active_weights(model: str) -> Dict[str, float]:
+    """활성 가중치 (발행된 버전이 없으면 기본 가중치)"""
+    active = get_active_version(model)
+    if active:
+        return active['weights']
+    return get_default_weights(model)
+
+
+def list_versions(model: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    """발행된 가중치 버전 목록 (최신순)"""
+    conn = database.get_connection()
+
+    if model:
+        rows = conn.execute("""
+            SELECT * FROM weight_versions WHERE model = ?
+            ORDER BY version DESC LIMIT ?
+        """, (model, limit)).fetchall()
+    else:
+        rows = conn.execute("""
+            SELECT * FROM weight_versions ORDER BY version DESC LIMIT ?
+        """, (limit,)).fetchall()
+    conn.close()
+
+    versions = []
+    for row in rows:
+        version = dict(row)
+        version['weights'] = json.loads(version['weights'])
+        version['metrics'] = json.loads(version['metrics'] or '{}')
+        versions.append(version)
+    return versions
+
+
+def activate_version(version: int) -> bool:
+    """특정 버전을 활성화 (롤백용, senior 버전이면 라벨링 큐도 새 가중치로 재구성)"""
+    conn = database.get_connection()
+    cursor = conn.cursor()
+
+    row = cursor.execute("SELECT model FROM weight_versions WHERE version = ?", (version,)).fetchone()
+    if not row:
+        conn.close()
+        return False
+
+    cursor.execute("UPDATE weight_versions SET is_active = 0 WHERE model = ?", (row['model'],))
+    cursor.execute("UPDATE weight_versions SET is_active = 1 WHERE version = ?", (version,))
+
+    conn.commit()
+    conn.close()
+
+    # train()과 같이: 결정 경계가 바뀌었으므로 라벨링 큐의 불확실도 갱신
+    if row['model'] == 'senior':
+        import labeling_queue
+        labeling_queue.rebuild()
+
+    return True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='라벨 기반 가중치 학습')
+    parser.add_argument('--model', choices=['view', 'senior', 'all'], default='all')
+    parser.add_argument('--no-activate', action='store_true', help='발행만 하고 활성화하지 않음')
+    parser.add_argument('--note', default='', help='버전 메모')
+    args = parser.parse_args()
+
+    database.init_database()
+
+    models = ['view', 'senior'] if args.model == 'all' else [args.model]
+    for model_name in models:
+        try:
+            result = train(model_name, activate=not args.no_activate, note=args.note)
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        except ValueError as e:
+            print(f"⚠️  {model_name}: {e}")
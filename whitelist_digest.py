@@ -0,0 +1,172 @@
+"""
+화이트리스트 블룸 필터 다이제스트 (확장프로그램 로컬 멤버십 확인)
+
+채널 목록 전체 대신 채널 ID와 @핸들을 넣은 블룸 필터 비트열을 내려준다.
+확장프로그램은 O(1)로 로컬 확인하고, "있을 수도 있음"인 것만 서버(POST /api/channels/check)에 확인한다.
+- 없음 판정은 항상 정확 (거짓 음성 없음), 있음 판정은 DIGEST_FP_RATE 확률로 틀릴 수 있음
+- 해시: FNV-1a 32비트 두 개(오프셋 기저가 다름)로 이중 해싱, 비트 i = (h1 + i*h2) mod m
+  (chrome-extension/background.js의 digestMightContain과 같은 계산)
+- 비트 순서: 비트 i → 바이트 i >> 3, 마스크 1 << (i & 7)
+
+서버는 비트별 카운터(카운팅 블룸 필터)를 프로세스 안에 들고 있다가, whitelist_version이
+바뀌면 database.get_whitelist_changes(since)의 델타만 더하고 뺀다. 용량을 넘거나 전체 동기화가
+필요할 때(채널 행 삭제 등)만 처음부터 다시 만든다.
+"""
+import os
+import math
+import base64
+import threading
+from array import array
+from typing import Dict, Any, List, Optional, Iterable
+
+import database
+
+
+DIGEST_FP_RATE = float(os.getenv('WHITELIST_DIGEST_FP_RATE', '0.001'))
+MIN_CAPACITY = 1024
+
+FNV_PRIME = 16777619
+FNV_OFFSET_BASIS = 2166136261
+FNV_OFFSET_BASIS_2 = 0x5BD1E995  # 두 번째 해시용
+
+
+def fnv1a32(data: bytes, basis: int = FNV_OFFSET_BASIS) -> int:
+    h = basis
+    for byte in data:
+        h = ((h ^ byte) * FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+
+def optimal_parameters(capacity: int, fp_rate: float = DIGEST_FP_RATE):
+    """용량과 목표 오탐률 → (비트 수 m, 해시 수 k)"""
+    m = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+    m = (m + 7) // 8 * 8
+    k = max(1, round(m / capacity * math.log(2)))
+    return m, k
+
+
+def digest_keys(channel_id: str, handle: Optional[str]) -> List[str]:
+    """필터에 넣는 키: 채널 ID, 정규화한 @핸들"""
+    keys = [channel_id]
+    if handle:
+        keys.append(handle)
+    return keys
+
+
+class CountingBloomFilter:
+    """비트별 카운터를 가진 블룸 필터 (삭제 가능, 내보낼 때는 비트열)"""
+
+    def __init__(self, capacity: int, fp_rate: float = DIGEST_FP_RATE):
+        self.capacity = capacity
+        self.m, self.k = optimal_parameters(capacity, fp_rate)
+        self._counts = array('H', bytes(2 * self.m))
+        self._bits = bytearray(self.m // 8)
+
+    def _indexes(self, key: str) -> Iterable[int]:
+        data = key.encode('utf-8')
+        h1 = fnv1a32(data)
+        h2 = fnv1a32(data, FNV_OFFSET_BASIS_2) | 1
+        return ((h1 + i * h2) % self.m for i in range(self.k))
+
+    def add(self, key: str) -> None:
+        for index in self._indexes(key):
+            if self._counts[index] < 0xFFFF:
+                self._counts[index] += 1
+            self._bits[index >> 3] |= 1 << (index & 7)
+
+    def remove(self, key: str) -> None:
+        for index in self._indexes(key):
+            count = self._counts[index]
+            if count == 0xFFFF:  # 포화된 카운터는 줄이지 않음 (거짓 음성 방지)
+                continue
+            if count > 0:
+                self._counts[index] = count - 1
+                if count == 1:
+                    self._bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(key))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits)
+
+
+class WhitelistDigest:
+    """화이트리스트 버전에 맞춰 델타로 갱신되는 블룸 필터"""
+
+    def __init__(self, fp_rate: float = DIGEST_FP_RATE):
+        self.fp_rate = fp_rate
+        self.version = 0
+        self.members: Dict[str, Optional[str]] = {}  # channel_id → handle (삭제 시 뺄 키)
+        self.filter: Optional[CountingBloomFilter] = None
+        self._lock = threading.Lock()
+
+    def _key_count(self) -> int:
+        return sum(len(digest_keys(channel_id, handle)) for channel_id, handle in self.members.items())
+
+    def _rebuild(self) -> None:
+        # 여유를 두고 2배 용량으로 (넘치면 다시 만듦)
+        capacity = max(MIN_CAPACITY, 2 * self._key_count())
+        self.filter = CountingBloomFilter(capacity, self.fp_rate)
+        for channel_id, handle in self.members.items():
+            for key in digest_keys(channel_id, handle):
+                self.filter.add(key)
+
+    def refresh(self) -> None:
+        """DB의 whitelist_version까지 따라잡기 (바뀐 게 없으면 쿼리 1번)"""
+        with self._lock:
+            since = self.version if self.filter is not None else 0
+            changes = database.get_whitelist_changes(since)
+            if self.filter is not None and not changes['full'] and changes['version'] == self.version:
+                return
+
+            if changes['full']:
+                self.members = {ch['channel_id']: ch['handle'] for ch in changes['channels']}
+                self._rebuild()
+            else:
+                for channel_id in changes['removed']:
+                    if channel_id in self.members:
+                        for key in digest_keys(channel_id, self.members.pop(channel_id)):
+                            self.filter.remove(key)
+                for ch in changes['channels']:
+                    channel_id = ch['channel_id']
+                    if channel_id in self.members:
+                        if self.members[channel_id] == ch['handle']:
+                            continue  # 이름만 바뀜
+                        for key in digest_keys(channel_id, self.members[channel_id]):
+                            self.filter.remove(key)
+                    self.members[channel_id] = ch['handle']
+                    for key in digest_keys(channel_id, ch['handle']):
+                        self.filter.add(key)
+
+                if self._key_count() > self.filter.capacity:
+                    self._rebuild()
+
+            self.version = changes['version']
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API 응답 형식 (bits는 base64)"""
+        with self._lock:
+            return {
+                'version': self.version,
+                'count': len(self.members),
+                'm': self.filter.m,
+                'k': self.filter.k,
+                'hash': 'fnv1a32',
+                'fp_rate': self.fp_rate,
+                'bits': base64.b64encode(self.filter.to_bytes()).decode('ascii')
+            }
+
+
+_digest = WhitelistDigest()
+
+
+def refresh() -> None:
+    """채널 추가/삭제 커밋 직후 호출 (다른 워커는 다음 조회 때 따라잡음)"""
+    _digest.refresh()
+
+
+def get_digest() -> Dict[str, Any]:
+    """최신 버전으로 갱신한 다이제스트"""
+    _digest.refresh()
+    return _digest.to_dict()
@@ -0,0 +1,15 @@
+"""
+운영용 WSGI 진입점
+
+    gunicorn -c gunicorn.conf.py wsgi:application      # 리눅스/맥 (멀티 프로세스)
+    waitress-serve --port=5000 --threads=8 wsgi:application   # 윈도우 (단일 프로세스, 스레드)
+
+gunicorn.conf.py는 마스터에서 DB 초기화를 한 번 하고 워커에 APP_INIT_DB=0을 넘긴다.
+다른 서버로 띄우면 프로세스마다 create_app()이 한 번 초기화한다.
+"""
+import os
+
+from app import create_app
+
+
+application = create_app(init_db=os.getenv('APP_INIT_DB', '1') == '1')
@@ -2,8 +2,7 @@
 YouTube Data API v3 연동 모듈
 """
 import os
-from typing import List, Dict, Any, Optional
-from googleapiclient.discovery import build
+from typing import List, Dict, Any, Optional, Tuple
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 
@@ -11,13 +10,39 @@ from dotenv import load_dotenv
 load_dotenv()
 API_KEY = os.getenv('YOUTUBE_API_KEY')
 
-if not API_KEY:
-    raise ValueError("YOUTUBE_API_KEY가 .env 파일에 설정되지 않았습니다.")
+import youtube_transport
+import metrics
 
 
 def get_youtube_client():
-    """YouTube API 클라이언트 생성"""
-    return build('youtube', 'v3', developerKey=API_KEY)
+    """
+    YouTube API 클라이언트 생성
+
+    YOUTUBE_TRANSPORT 설정에 따라 실제 API 또는 기록/재생/합성 백엔드 (youtube_transport.py).
+    API 키는 실제 API를 호출할 때만 확인한다.
+    """
+    return youtube_transport.get_client(API_KEY)
+
+
+def _execute(request, method: str) -> Dict[str, Any]:
+    """
+    API 요청 실행 + 메트릭 기록 (호출 수, 지연, HTTP 상태별 에러)
+
+    Args:
+        request: youtube.<resource>().list(...) 요청 객체
+        method: 메트릭 라벨 (예: 'videos.list')
+    """
+    metrics.YOUTUBE_API_REQUESTS.inc(method=method)
+    try:
+        with metrics.YOUTUBE_API_LATENCY.time(method=method):
+            return request.execute()
+    except HttpError as e:
+        metrics.YOUTUBE_API_ERRORS.inc(method=method, status=str(e.resp.status))
+        raise
+    except Exception:
+        # 타임아웃/연결 끊김 등 HTTP 응답이 없는 실패
+        metrics.YOUTUBE_API_ERRORS.inc(method=method, status='network')
+        raise
 
 
 def get_video_categories(region_code: str = 'KR') -> List[Dict[str, Any]]:
@@ -36,7 +61,7 @@ def get_video_categories(region_code: str = 'KR') -> List[Dict[str, Any]]:
             part='snippet',
             regionCode=region_code
         )
-        response = request.execute()
+        response = _execute(request, 'videoCategories.list')
 
         categories = []
         for item in response.get('items', []):
@@ -73,7 +98,7 @@ def get_trending_videos(category_id: str, region_code: str = 'KR', max_results:
             videoCategoryId=category_id,
             maxResults=max_results
         )
-        response = request.execute()
+        response = _execute(request, 'videos.list')
 
         videos = []
         for idx, item in enumerate(response.get('items', []), start=1):
@@ -130,7 +155,7 @@ def get_video_details(video_ids: List[str]) -> List[Dict[str, Any]]:
                 part='snippet,statistics,contentDetails',
                 id=','.join(batch_ids)
             )
-            response = request.execute()
+            response = _execute(request, 'videos.list')
 
             for item in response.get('items', []):
                 snippet = item['snippet']
@@ -184,7 +209,7 @@ def get_channel_info(channel_ids: List[str]) -> List[Dict[str, Any]]:
                 part='snippet,statistics',
                 id=','.join(batch_ids)
             )
-            response = request.execute()
+            response = _execute(request, 'channels.list')
 
             for item in response.get('items', []):
                 snippet = item['snippet']
@@ -193,6 +218,7 @@ def get_channel_info(channel_ids: List[str]) -> List[Dict[str, Any]]:
                 all_channels.append({
                     'channel_id': item['id'],
                     'channel_title': snippet['title'],
+                    'handle': snippet.get('customUrl'),  # '@handle'
                     'subscriber_count': int(statistics.get('subscriberCount', 0)),
                     'view_count': int(statistics.get('viewCount', 0)),
                     'video_count': int(statistics.get('videoCount', 0))
@@ -225,7 +251,7 @@ def get_video_comments(video_id: str, max_results: int = 100) -> List[Dict[str,
             order='relevance',  # 관련성 높은 댓글 우선
             textFormat='plainText'
         )
-        response = request.execute()
+        response = _execute(request, 'commentThreads.list')
 
         comments = []
         for item in response.get('items', []):
@@ -253,25 +279,95 @@ def get_channel_id_from_url(url: str) -> Optional[str]:
         url: 채널 URL (https://www.youtube.com/channel/UCxxxx) 또는 채널 ID (UCxxxx)
 
     Returns:
-        채널 ID 또는 None
+        채널 ID 또는 None (/@handle, /c/ 등은 parse_channel_reference + resolve_channel_reference 사용)
+    """
+    reference = parse_channel_reference(url)
+    if reference and reference['type'] == 'id':
+        return reference['value']
+    return None
+
+
+def parse_channel_reference(text: str) -> Optional[Dict[str, str]]:
+    """
+    채널 URL/ID/핸들 파싱 (API 호출 없음)
+
+    Args:
+        text: UCxxxx, @handle, https://www.youtube.com/channel/UCxxxx,
+              https://www.youtube.com/@handle, /c/name, /user/name
+
+    Returns:
+        {'type': 'id'|'handle'|'username', 'value': ...} 또는 None
+        /c/name은 커스텀 URL을 조회하는 API가 없어 같은 이름의 핸들로 시도
     """
     import re
+    from urllib.parse import unquote
 
-    url = url.strip()
+    text = text.strip()
+    if not text:
+        return None
 
-    # 패턴 1: /channel/UCxxxxx 형식
-    match = re.search(r'/channel/(UC[\w-]+)', url)
+    match = re.search(r'/channel/(UC[\w-]+)', text)
     if match:
-        return match.group(1)
+        return {'type': 'id', 'value': match.group(1)}
 
-    # 패턴 2: UCxxxxx 채널 ID 직접 입력
-    if re.match(r'^UC[\w-]+$', url):
-        return url
+    if re.match(r'^UC[\w-]+$', text):
+        return {'type': 'id', 'value': text}
+
+    match = re.search(r'(?:^|/)(@[^/?#\s]+)', text)
+    if match:
+        return {'type': 'handle', 'value': unquote(match.group(1)).lower()}
+
+    match = re.search(r'/c/([^/?#\s]+)', text)
+    if match:
+        return {'type': 'handle', 'value': '@' + unquote(match.group(1)).lower()}
+
+    match = re.search(r'/user/([^/?#\s]+)', text)
+    if match:
+        return {'type': 'username', 'value': unquote(match.group(1))}
 
-    # 그 외에는 None 반환 (/@handle, /c/ 등은 지원 안함)
     return None
 
 
+# 핸들/사용자명 → 채널 ID 캐시 (프로세스 내, 없는 채널은 None으로 저장)
+_reference_cache: Dict[Tuple[str, str], Optional[str]] = {}
+_REFERENCE_CACHE_MAX = 10000
+
+
+def resolve_channel_reference(reference: Dict[str, str]) -> Optional[str]:
+    """
+    parse_channel_reference 결과 → 채널 ID
+
+    핸들은 channels.list(forHandle), 사용자명은 channels.list(forUsername)로 1건씩 조회 (쿼터 1).
+    결과는 캐시하고, API 에러는 캐시하지 않음.
+    """
+    if reference['type'] == 'id':
+        return reference['value']
+
+    key = (reference['type'], reference['value'])
+    if key in _reference_cache:
+        return _reference_cache[key]
+
+    try:
+        youtube = get_youtube_client()
+        if reference['type'] == 'handle':
+            request = youtube.channels().list(part='id', forHandle=reference['value'])
+        else:
+            request = youtube.channels().list(part='id', forUsername=reference['value'])
+        response = _execute(request, 'channels.list')
+
+    except HttpError as e:
+        print(f"YouTube API 에러 (채널 조회 {reference['value']}): {e}")
+        return None
+
+    items = response.get('items', [])
+    channel_id = items[0]['id'] if items else None
+
+    if len(_reference_cache) >= _REFERENCE_CACHE_MAX:
+        _reference_cache.clear()
+    _reference_cache[key] = channel_id
+    return channel_id
+
+
 def get_channel_recent_videos(channel_id: str, max_results: int = 50, days: int = 7) -> List[Dict[str, Any]]:
     """
     특정 채널의 최근 업로드 영상 가져오기
@@ -297,7 +393,7 @@ def get_channel_recent_videos(channel_id: str, max_results: int = 50, days: int
             part='contentDetails',
             id=channel_id
         )
-        channel_response = channel_request.execute()
+        channel_response = _execute(channel_request, 'channels.list')
 
         if not channel_response.get('items'):
             print(f"채널을 찾을 수 없습니다: {channel_id}")
@@ -312,7 +408,7 @@ def get_channel_recent_videos(channel_id: str, max_results: int = 50, days: int
             playlistId=uploads_playlist_id,
             maxResults=max_results
         )
-        playlist_response = playlist_request.execute()
+        playlist_response = _execute(playlist_request, 'playlistItems.list')
 
         video_ids = [item['contentDetails']['videoId'] for item in playlist_response.get('items', [])]
 
@@ -0,0 +1,511 @@
+"""
+YouTube API 전송 계층 (실제 API / 기록 / 재생 / 가짜 백엔드)
+
+youtube_api.py는 get_youtube_client()가 돌려준 클라이언트로
+client.videos().list(...).execute() 형태로 호출한다. 이 모듈은 같은 형태의
+가짜 클라이언트를 만들어 네트워크·API 키 없이 수집기를 돌릴 수 있게 한다.
+
+전송 방식 (환경 변수 YOUTUBE_TRANSPORT):
+- live: 실제 API (기본값). YOUTUBE_API_ENDPOINT를 주면 그 주소로 요청 (로컬 가짜 서버용)
+- record: 실제 API를 호출하고 응답을 픽스처 파일로 저장
+- replay: 저장된 픽스처만 사용 (없는 요청은 404)
+- fake: 합성 데이터 생성기 (채널 수천 개 × 영상 수만 개, 시드 고정으로 재현 가능)
+
+공통 옵션:
+- YOUTUBE_FIXTURE_DIR: 픽스처 폴더 (기본 fixtures/youtube)
+- YOUTUBE_FAKE_CHANNELS, YOUTUBE_FAKE_VIDEOS_PER_CHANNEL, YOUTUBE_FAKE_SEED: 합성 데이터 규모
+- YOUTUBE_FAKE_LATENCY_MS, YOUTUBE_FAKE_JITTER_MS: 요청당 지연 (record/replay/fake)
+- YOUTUBE_FAKE_ERROR_RATE, YOUTUBE_FAKE_ERROR_STATUS: 에러 주입 확률과 HTTP 상태 코드
+
+로컬 가짜 서버 (다른 프로세스의 수집기가 live 전송으로 붙을 수 있음):
+    python youtube_transport.py serve --port 8765 --backend fake
+    YOUTUBE_API_ENDPOINT=http://127.0.0.1:8765/youtube/v3/ python app.py
+"""
+import os
+import json
+import time
+import random
+import re
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+
+TRANSPORT = os.getenv('YOUTUBE_TRANSPORT', 'live')
+API_ENDPOINT = os.getenv('YOUTUBE_API_ENDPOINT')
+FIXTURE_DIR = os.getenv('YOUTUBE_FIXTURE_DIR', 'fixtures/youtube')
+
+FAKE_CHANNELS = int(os.getenv('YOUTUBE_FAKE_CHANNELS', '1000'))
+FAKE_VIDEOS_PER_CHANNEL = int(os.getenv('YOUTUBE_FAKE_VIDEOS_PER_CHANNEL', '20'))
+FAKE_SEED = int(os.getenv('YOUTUBE_FAKE_SEED', '42'))
+FAKE_LATENCY_MS = float(os.getenv('YOUTUBE_FAKE_LATENCY_MS', '0'))
+FAKE_JITTER_MS = float(os.getenv('YOUTUBE_FAKE_JITTER_MS', '0'))
+FAKE_ERROR_RATE = float(os.getenv('YOUTUBE_FAKE_ERROR_RATE', '0'))
+FAKE_ERROR_STATUS = int(os.getenv('YOUTUBE_FAKE_ERROR_STATUS', '503'))
+
+# 픽스처 키에서 제외할 파라미터 (인증/포맷 관련)
+IGNORED_PARAMS = {'key', 'alt', 'prettyPrint'}
+
+
+def make_http_error(status: int, reason: str) -> HttpError:
+    """실제 API 에러와 같은 타입의 HttpError 생성 (youtube_api의 except 분기를 그대로 탐)"""
+    resp = httplib2.Response({'status': status})
+    resp.reason = reason
+    content = json.dumps({'error': {'code': status, 'message': reason}}).encode('utf-8')
+    return HttpError(resp, content)
+
+
+# ============================================================
+# 가짜 클라이언트: client.<resource>().list(**params).execute()
+# ============================================================
+
+class _FakeRequest:
+    def __init__(self, backend, resource: str, params: Dict[str, Any]):
+        self._backend = backend
+        self._resource = resource
+        self._params = params
+
+    def execute(self) -> Dict[str, Any]:
+        return self._backend.handle(self._resource, self._params)
+
+
+class _FakeResource:
+    def __init__(self, backend, resource: str):
+        self._backend = backend
+        self._resource = resource
+
+    def list(self, **params) -> _FakeRequest:
+        return _FakeRequest(self._backend, self._resource, params)
+
+
+class FakeClient:
+    """googleapiclient 리소스 객체와 같은 호출 형태의 클라이언트"""
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def __getattr__(self, resource: str):
+        if resource.startswith('_'):
+            raise AttributeError(resource)
+        return lambda: _FakeResource(self._backend, resource)
+
+
+# ============================================================
+# 백엔드: handle(resource, params) → API 응답 JSON (dict)
+# ============================================================
+
+def _fixture_key(resource: str, params: Dict[str, Any]) -> str:
+    normalized = {k: str(v) for k, v in params.items() if k not in IGNORED_PARAMS}
+    raw = json.dumps({'resource': resource, 'params': normalized}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class LiveBackend:
+    """실제 YouTube API (record 모드의 내부 백엔드)"""
+
+    def __init__(self, api_key: str, api_endpoint: Optional[str] = None):
+        self.api_key = api_key
+        self.api_endpoint = api_endpoint
+
+    def client(self):
+        from googleapiclient.discovery import build
+
+        client_options = {'api_endpoint': self.api_endpoint} if self.api_endpoint else None
+        return build('youtube', 'v3', developerKey=self.api_key, client_options=client_options)
+
+    def handle(self, resource: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return getattr(self.client(), resource)().list(**params).execute()
+
+
+class RecordingBackend:
+    """내부 백엔드 응답을 픽스처 파일로 저장"""
+
+    def __init__(self, inner, fixture_dir: str = FIXTURE_DIR):
+        self.inner = inner
+        self.fixture_dir = fixture_dir
+
+    def handle(self, resource: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.inner.handle(resource, params)
+
+        os.makedirs(f'{self.fixture_dir}/{resource}', exist_ok=True)
+        path = f'{self.fixture_dir}/{resource}/{_fixture_key(resource, params)}.json'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'resource': resource,
+                'params': {k: v for k, v in params.items() if k not in IGNORED_PARAMS},
+                'response': response
+            }, f, ensure_ascii=False, indent=2)
+
+        return response
+
+
+class FixtureBackend:
+    """저장된 픽스처로 응답 (없는 요청은 404 HttpError)"""
+
+    def __init__(self, fixture_dir: str = FIXTURE_DIR):
+        self.fixture_dir = fixture_dir
+        self._cache: Dict[str, Dict[str, Any]] = {}
+
+    def handle(self, resource: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        key = _fixture_key(resource, params)
+        if key not in self._cache:
+            path = f'{self.fixture_dir}/{resource}/{key}.json'
+            if not os.path.exists(path):
+                raise make_http_error(404, f'fixture not found: {resource} {params}')
+            with open(path, 'r', encoding='utf-8') as f:
+                self._cache[key] = json.load(f)['response']
+        return self._cache[key]
+
+
+class FaultInjectingBackend:
+    """지연과 에러를 주입하는 래퍼"""
+
+    def __init__(
+        self,
+        inner,
+        latency_ms: float = FAKE_LATENCY_MS,
+        jitter_ms: float = FAKE_JITTER_MS,
+        error_rate: float = FAKE_ERROR_RATE,
+        error_status: int = FAKE_ERROR_STATUS,
+        seed: int = FAKE_SEED
+    ):
+        self.inner = inner
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def handle(self, resource: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        if fail:
+            raise make_http_error(self.error_status, 'injected error')
+
+        return self.inner.handle(resource, params)
+
+
+# 합성 데이터 단어 (SeniorScore 분기가 고루 나오도록 시니어/일반/Z세대 단어 혼합)
+SYNTHETIC_WORDS = [
+    '트로트', '임영웅', '건강', '체조', '효도', '노래교실', '전원일기', '등산', '약초', '부모님',
+    '게임', '먹방', '브이로그', '리뷰', '챌린지', '아이돌', '여행', '요리', '뉴스', '다큐',
+    'ㅋㅋ', '레전드', '실화냐', '개꿀',
+]
+
+SYNTHETIC_CATEGORIES = [
+    ('1', 'Film & Animation'), ('10', 'Music'), ('17', 'Sports'), ('22', 'People & Blogs'),
+    ('24', 'Entertainment'), ('25', 'News & Politics'), ('26', 'Howto & Style'), ('27', 'Education'),
+]
+
+
+class SyntheticBackend:
+    """
+    결정적 합성 데이터 생성기
+
+    채널 i의 영상 j는 (seed, i, j)로만 정해지므로 전체를 메모리에 올리지 않고
+    요청마다 생성한다. 인기 영상 순위용 인덱스만 처음 요청 때 1번 만든다.
+    advance(days)로 시간을 흘리면 조회수/구독자 수가 늘어난다 (Δviews 재현용).
+    """
+
+    def __init__(
+        self,
+        n_channels: int = FAKE_CHANNELS,
+        videos_per_channel: int = FAKE_VIDEOS_PER_CHANNEL,
+        seed: int = FAKE_SEED,
+        now: Optional[datetime] = None
+    ):
+        self.n_channels = n_channels
+        self.videos_per_channel = videos_per_channel
+        self.seed = seed
+        self.now = now or datetime.now(timezone.utc).replace(microsecond=0)
+        self.day = 0
+        self._trending_index: Optional[Dict[str, List[Tuple[int, int]]]] = None
+        self._lock = threading.Lock()
+
+    def advance(self, days: int = 1) -> None:
+        self.day += days
+
+    # --- ID 규칙 ---
+
+    def channel_id(self, c: int) -> str:
+        return f'UCsyn{c:07d}'
+
+    def video_id(self, c: int, j: int) -> str:
+        return f'v{c:07d}_{j:03d}'
+
+    def _parse_video_id(self, video_id: str) -> Optional[Tuple[int, int]]:
+        try:
+            c, j = video_id[1:].split('_')
+            c, j = int(c), int(j)
+        except ValueError:
+            return None
+        if 0 <= c < self.n_channels and 0 <= j < self.videos_per_channel:
+            return c, j
+        return None
+
+    def _parse_channel_id(self, channel_id: str) -> Optional[int]:
+        if not channel_id.startswith(('UCsyn', 'UUsyn')):
+            return None
+        try:
+            c = int(channel_id[5:])
+        except ValueError:
+            return None
+        return c if 0 <= c < self.n_channels else None
+
+    # --- 생성 ---
+
+    def _rng(self, *parts: int) -> random.Random:
+        value = self.seed
+        for part in parts:
+            value = value * 1_000_003 + part
+        return random.Random(value)
+
+    def _channel(self, c: int) -> Dict[str, Any]:
+        rng = self._rng(c)
+        subscribers = int(10 ** rng.uniform(2, 6.5))
+        return {
+            'id': self.channel_id(c),
+            'snippet': {'title': f'합성채널 {c}', 'customUrl': f'@synthetic{c}'},
+            'statistics': {
+                'subscriberCount': str(int(subscribers * (1 + 0.002 * self.day))),
+                'viewCount': str(subscribers * 150),
+                'videoCount': str(self.videos_per_channel),
+            },
+            'contentDetails': {'relatedPlaylists': {'uploads': 'UU' + self.channel_id(c)[2:]}},
+        }
+
+    def _base_views(self, c: int, j: int) -> Tuple[int, float]:
+        rng = self._rng(c, j, 1)
+        return int(10 ** rng.uniform(2, 7)), rng.uniform(0.01, 0.3)
+
+    def _video(self, c: int, j: int) -> Dict[str, Any]:
+        rng = self._rng(c, j)
+        words = rng.sample(SYNTHETIC_WORDS, 3)
+        category_id = SYNTHETIC_CATEGORIES[rng.randrange(len(SYNTHETIC_CATEGORIES))][0]
+        published_at = self.now - timedelta(hours=j * 12 + rng.randrange(12))
+        base_views, growth = self._base_views(c, j)
+        views = int(base_views * (1 + growth * self.day))
+        duration_seconds = rng.randrange(30, 3600)
+
+        return {
+            'id': self.video_id(c, j),
+            'snippet': {
+                'title': f"{' '.join(words)} #{j}",
+                'description': f"{words[0]} 관련 영상입니다. " * rng.randrange(1, 4),
+                'channelId': self.channel_id(c),
+                'channelTitle': f'합성채널 {c}',
+                'categoryId': category_id,
+                'publishedAt': published_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'thumbnails': {'high': {'url': f'https://i.ytimg.com/vi/{self.video_id(c, j)}/hqdefault.jpg'}},
+                'tags': words[:rng.randrange(0, 4)],
+            },
+            'statistics': {
+                'viewCount': str(views),
+                'likeCount': str(int(views * rng.uniform(0.005, 0.05))),
+                'commentCount': str(int(views * rng.uniform(0.0005, 0.005))),
+            },
+            'contentDetails': {'duration': f'PT{duration_seconds // 60}M{duration_seconds % 60}S'},
+        }
+
+    def build_trending_index(self) -> Dict[str, List[Tuple[int, int]]]:
+        """카테고리별 (c, j)를 기본 조회수 내림차순으로 (1회)"""
+        with self._lock:
+            if self._trending_index is None:
+                index: Dict[str, List[Tuple[int, int, int]]] = {}
+                for c in range(self.n_channels):
+                    for j in range(self.videos_per_channel):
+                        rng = self._rng(c, j)
+                        rng.sample(SYNTHETIC_WORDS, 3)
+                        category_id = SYNTHETIC_CATEGORIES[rng.randrange(len(SYNTHETIC_CATEGORIES))][0]
+                        index.setdefault(category_id, []).append((self._base_views(c, j)[0], c, j))
+                self._trending_index = {
+                    category_id: [(c, j) for _, c, j in sorted(items, reverse=True)]
+                    for category_id, items in index.items()
+                }
+        return self._trending_index
+
+    # --- 리소스별 응답 ---
+
+    def handle(self, resource: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        max_results = int(params.get('maxResults', 5))
+
+        if resource == 'videoCategories':
+            return {'items': [{'id': cid, 'snippet': {'title': title}} for cid, title in SYNTHETIC_CATEGORIES]}
+
+        if resource == 'videos':
+            if params.get('chart') == 'mostPopular':
+                ranked = self.build_trending_index().get(str(params.get('videoCategoryId', '')), [])
+                return {'items': [self._video(c, j) for c, j in ranked[:max_results]]}
+            ids = [self._parse_video_id(v) for v in str(params.get('id', '')).split(',') if v]
+            return {'items': [self._video(*cj) for cj in ids if cj]}
+
+        if resource == 'channels':
+            lookup = params.get('forHandle') or params.get('forUsername')
+            if lookup:
+                match = re.match(r'^@?synthetic(\d+)$', str(lookup).lower())
+                c = int(match.group(1)) if match else None
+                return {'items': [{'id': self.channel_id(c)}] if c is not None and c < self.n_channels else []}
+            ids = [self._parse_channel_id(c) for c in str(params.get('id', '')).split(',') if c]
+            return {'items': [self._channel(c) for c in ids if c is not None]}
+
+        if resource == 'playlistItems':
+            c = self._parse_channel_id(str(params.get('playlistId', '')))
+            if c is None:
+                raise make_http_error(404, 'playlistNotFound')
+            count = min(max_results, self.videos_per_channel)
+            return {'items': [{'contentDetails': {'videoId': self.video_id(c, j)}} for j in range(count)]}
+
+        if resource == 'commentThreads':
+            rng = random.Random(str(params.get('videoId')))
+            return {'items': [
+                {'snippet': {'topLevelComment': {'snippet': {
+                    'textDisplay': ' '.join(rng.sample(SYNTHETIC_WORDS, 2)),
+                    'authorDisplayName': f'user{k}',
+                    'likeCount': rng.randrange(100),
+                    'publishedAt': self.now.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                }}}}
+                for k in range(min(max_results, 20))
+            ]}
+
+        raise make_http_error(404, f'unsupported resource: {resource}')
+
+
+# ============================================================
+# 전송 선택
+# ============================================================
+
+_backend_override = None
+
+
+def set_backend(backend) -> None:
+    """프로세스 안에서 백엔드 직접 지정 (벤치마크/테스트용), None이면 환경 변수 설정으로 복귀"""
+    global _backend_override
+    _backend_override = backend
+
+
+_env_backend = None
+
+
+def _make_env_backend(api_key: Optional[str]):
+    """YOUTUBE_TRANSPORT 설정으로 백엔드 생성 (프로세스당 1번)"""
+    if TRANSPORT == 'fake':
+        inner = SyntheticBackend()
+    elif TRANSPORT == 'replay':
+        inner = FixtureBackend()
+    elif TRANSPORT == 'record':
+        if not api_key:
+            raise ValueError("YOUTUBE_API_KEY가 .env 파일에 설정되지 않았습니다.")
+        inner = RecordingBackend(LiveBackend(api_key, API_ENDPOINT))
+    else:
+        raise ValueError(f"알 수 없는 YOUTUBE_TRANSPORT입니다: {TRANSPORT}")
+
+    if FAKE_LATENCY_MS or FAKE_JITTER_MS or FAKE_ERROR_RATE:
+        inner = FaultInjectingBackend(inner)
+    return inner
+
+
+def get_client(api_key: Optional[str]):
+    """
+    설정된 전송 방식의 YouTube 클라이언트
+
+    live 전송이면 googleapiclient 클라이언트를, 그 외에는 FakeClient를 돌려준다.
+    """
+    global _env_backend
+
+    if _backend_override is not None:
+        return FakeClient(_backend_override)
+
+    if TRANSPORT == 'live':
+        if not api_key:
+            raise ValueError("YOUTUBE_API_KEY가 .env 파일에 설정되지 않았습니다.")
+        return LiveBackend(api_key, API_ENDPOINT).client()
+
+    if _env_backend is None:
+        _env_backend = _make_env_backend(api_key)
+    return FakeClient(_env_backend)
+
+
+# ============================================================
+# 로컬 가짜 서버
+# ============================================================
+
+def serve(backend, host: str = '127.0.0.1', port: int = 8765) -> None:
+    """
+    YouTube Data API 형태의 로컬 HTTP 서버 (GET /youtube/v3/<resource>?...)
+
+    다른 프로세스에서 YOUTUBE_API_ENDPOINT=http://host:port/youtube/v3/ 로 붙는다.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import urlparse, parse_qsl
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            resource = url.path.rstrip('/').split('/')[-1]
+            params = dict(parse_qsl(url.query))
+
+            try:
+                status, body = 200, backend.handle(resource, params)
+            except HttpError as e:
+                status, body = e.resp.status, json.loads(e.content)
+
+            payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=UTF-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"🧪 가짜 YouTube API 서버: http://{host}:{port}/youtube/v3/")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='YouTube API 가짜 백엔드')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='로컬 가짜 API 서버 실행')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--backend', choices=['fake', 'replay'], default='fake')
+    serve_parser.add_argument('--channels', type=int, default=FAKE_CHANNELS)
+    serve_parser.add_argument('--videos-per-channel', type=int, default=FAKE_VIDEOS_PER_CHANNEL)
+    serve_parser.add_argument('--seed', type=int, default=FAKE_SEED)
+    serve_parser.add_argument('--fixture-dir', default=FIXTURE_DIR)
+    serve_parser.add_argument('--latency-ms', type=float, default=FAKE_LATENCY_MS)
+    serve_parser.add_argument('--jitter-ms', type=float, default=FAKE_JITTER_MS)
+    serve_parser.add_argument('--error-rate', type=float, default=FAKE_ERROR_RATE)
+    serve_parser.add_argument('--error-status', type=int, default=FAKE_ERROR_STATUS)
+    args = parser.parse_args()
+
+    if args.backend == 'fake':
+        serve_backend = SyntheticBackend(args.channels, args.videos_per_channel, args.seed)
+    else:
+        serve_backend = FixtureBackend(args.fixture_dir)
+
+    if args.latency_ms or args.jitter_ms or args.error_rate:
+        serve_backend = FaultInjectingBackend(
+            serve_backend, args.latency_ms, args.jitter_ms,
+            args.error_rate, args.error_status, args.seed
+        )
+
+    serve(serve_backend, args.host, args.port)